@@ -1,28 +1,23 @@
 import streamlit as st
 from controllers import wizard_pages
+from utils.session_utils import init_main_state, restore_session, persist_session
+from utils.perf_utils import measure, start_metrics_server
+from utils.ui_utils import perf_panel_enabled, show_perf_panel
 
 # Configure the page
 st.set_page_config(page_title="Job Analysis Wizard", layout="wide")
+# Local Prometheus endpoint (http://127.0.0.1:$PERF_METRICS_PORT/metrics), started once per process
+start_metrics_server()
+# Resume a persisted wizard session (?sid=... in the URL) before initializing defaults
+restore_session()
 # Initialize session state variables to avoid KeyErrors
-if 'current_section' not in st.session_state:
-    st.session_state.current_section = 0
-if 'job_title' not in st.session_state:
-    st.session_state.job_title = ""
-# Text fields for wizard steps (store content as multi-line strings)
-if 'tasks_text' not in st.session_state:
-    st.session_state.tasks_text = ""
-if 'skills_text' not in st.session_state:
-    st.session_state.skills_text = ""
-if 'benefits_text' not in st.session_state:
-    st.session_state.benefits_text = ""
-if 'job_ad_text' not in st.session_state:
-    st.session_state.job_ad_text = ""
-if 'interview_questions_text' not in st.session_state:
-    st.session_state.interview_questions_text = ""
-# Fields for source inputs on analysis page
-for i in range(1, 4):
-    key = f"source{i}"
-    if key not in st.session_state:
-        st.session_state[key] = ""
+init_main_state()
 # Render the appropriate wizard page based on current section
-wizard_pages.render_current_page()
+try:
+    with measure("render_current_page", kind="rerun"):
+        wizard_pages.render_current_page()
+finally:
+    # Also runs when a page triggers a rerun, so no change is lost
+    persist_session()
+if perf_panel_enabled():
+    show_perf_panel()
@@ -0,0 +1,291 @@
+# cli.py
+"""
+Headless command-line entry point for offline processing of job ads.
+
+    python cli.py analyze ./job_ads -o results.jsonl
+    python cli.py analyze --jsonl inputs.jsonl --format parquet -o results.parquet
+    python cli.py generate profiles.jsonl -o ads.jsonl --locale de --format html
+    python cli.py generate --tenant acme -o ads.jsonl --polish --resume
+    python cli.py export --tenant acme -o exports.zip --formats docx pdf
+    python cli.py score --tenant acme -o scores.jsonl
+    python cli.py salary-index results.jsonl
+    python cli.py salary "Data Engineer" --location Berlin
+    python cli.py match-cvs ./cvs --profile profile.json --top 20 -o ranking.jsonl
+"""
+
+import argparse
+import os
+import sys
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, Optional, TextIO, Tuple
+
+@contextmanager
+def open_input(path: Optional[str]) -> Iterator[Optional[TextIO]]:
+    """Text stream of an input argument: '-' is stdin (left open), None yields None, files are closed on exit."""
+    if path is None:
+        yield None
+    elif path == "-":
+        yield sys.stdin
+    else:
+        with open(path, "r", encoding="utf-8") as stream:
+            yield stream
+
+@contextmanager
+def open_output(path: Optional[str]) -> Iterator[TextIO]:
+    """Text stream of an output argument: a file (closed on exit) or stdout when no path is given."""
+    if path is None:
+        yield sys.stdout
+    else:
+        with open(path, "w", encoding="utf-8") as stream:
+            yield stream
+
+@contextmanager
+def profile_input(args) -> Iterator[Optional[Iterator[Tuple[str, Dict]]]]:
+    """(id, profile fields) from --tenant/--query or the profiles JSONL argument; None if neither is given."""
+    from services.batch_generation import iter_profiles_jsonl, iter_repository_profiles
+
+    if args.tenant:
+        yield iter_repository_profiles(args.tenant, args.query or "")
+    elif args.profiles:
+        with open_input(args.profiles) as stream:
+            yield iter_profiles_jsonl(stream)
+    else:
+        yield None
+
+def cmd_analyze(args) -> int:
+    from services.batch_analysis import ThroughputStats, iter_directory, iter_jsonl, open_result_writer, run_batch
+
+    if not (args.jsonl or args.directory):
+        print("Provide a directory or --jsonl input.", file=sys.stderr)
+        return 2
+
+    stats = ThroughputStats("analyze")
+    with open_input(args.jsonl) as stream:
+        records = iter_jsonl(stream) if stream else iter_directory(Path(args.directory), recursive=not args.no_recursive)
+        writer = open_result_writer(Path(args.output) if args.output else None, args.format)
+        try:
+            for result in run_batch(records, workers=args.workers):
+                stats.add(result["bytes"], error=result["error"] is not None)
+                writer.write(result)
+        finally:
+            writer.close()
+    print(stats.summary(), file=sys.stderr)
+    return 1 if stats.errors and stats.errors == stats.items else 0
+
+def cmd_generate(args) -> int:
+    from services.batch_generation import run_generation
+
+    with profile_input(args) as profiles:
+        if profiles is None:
+            print("Provide a profiles JSONL file or --tenant.", file=sys.stderr)
+            return 2
+        llm = None
+        if args.polish:
+            from services.llm_service import LLMService, get_llm_service
+            api_key = os.getenv("OPENAI_API_KEY")
+            llm = LLMService(openai_api_key=api_key) if api_key else get_llm_service()
+        stats = run_generation(
+            profiles,
+            Path(args.output),
+            locale=args.locale,
+            fmt=args.format,
+            workers=args.workers,
+            chunk_size=args.chunk_size,
+            llm=llm,
+            polish_concurrency=args.concurrency,
+            use_cache=not args.no_cache,
+            resume=args.resume,
+        )
+    for stage in stats.values():
+        if stage.items:
+            print(stage.summary(), file=sys.stderr)
+    return 1 if stats["write"].errors and stats["write"].errors == stats["write"].items else 0
+
+def cmd_export(args) -> int:
+    from models.job_profile import JobProfile
+    from services.export_service import export_zip
+
+    with profile_input(args) as profiles:
+        if profiles is None:
+            print("Provide a profiles JSONL file or --tenant.", file=sys.stderr)
+            return 2
+        with open(args.output, "wb") as out:
+            counts = export_zip(
+                ((profile_id, JobProfile.from_dict(data)) for profile_id, data in profiles),
+                out,
+                formats=args.formats,
+                locale=args.locale,
+            )
+    print(f"export: {counts['files']} files, {counts['errors']} errors", file=sys.stderr)
+    return 1 if counts["errors"] and not counts["files"] else 0
+
+def cmd_score(args) -> int:
+    import json
+    from services.profile_scoring import score_in_batches
+
+    count = 0
+    total = 0.0
+    with profile_input(args) as profiles:
+        if profiles is None:
+            print("Provide a profiles JSONL file or --tenant.", file=sys.stderr)
+            return 2
+        with open_output(args.output) as out:
+            for profile_id, score in score_in_batches(profiles, args.batch_size, use_embeddings=not args.no_embeddings):
+                out.write(json.dumps({"id": profile_id, **score.to_dict()}, ensure_ascii=False) + "\n")
+                count += 1
+                total += score.overall
+    print(f"score: {count} profiles, mean overall {total / max(count, 1):.3f}", file=sys.stderr)
+    return 0
+
+def cmd_salary_index(args) -> int:
+    from services.salary_index import DEFAULT_INDEX_PATH, SalaryIndex, iter_salary_rows
+
+    index = SalaryIndex.build(iter_salary_rows(Path(p) for p in args.results))
+    output = Path(args.output) if args.output else DEFAULT_INDEX_PATH
+    index.save(output)
+    print(f"salary-index: {len(index)} ads, {len(index.titles)} titles -> {output}", file=sys.stderr)
+    return 0 if len(index) else 1
+
+def cmd_salary(args) -> int:
+    import json
+    from dataclasses import asdict
+    from services.salary_index import DEFAULT_INDEX_PATH, get_salary_index
+
+    index = get_salary_index(Path(args.index) if args.index else DEFAULT_INDEX_PATH)
+    if index is None:
+        print("No salary index found; build one with 'salary-index'.", file=sys.stderr)
+        return 2
+    benchmark = index.benchmark(args.title, args.location or "", args.currency)
+    if benchmark is None:
+        print(f"No salaries found for '{args.title}'.", file=sys.stderr)
+        return 1
+    print(json.dumps(asdict(benchmark), ensure_ascii=False))
+    return 0
+
+def cmd_match_cvs(args) -> int:
+    import json
+    from services.batch_analysis import ThroughputStats, iter_directory, iter_jsonl
+    from services.cv_matching import iter_cv_texts, match_cvs
+
+    if args.profile:
+        with open(args.profile, "r", encoding="utf-8") as file:
+            profile = json.load(file)
+    elif args.tenant and args.profile_id is not None:
+        from services.profile_repository import get_profile_repository
+        profile = get_profile_repository().get(args.profile_id, args.tenant)
+        if profile is None:
+            print(f"Profile {args.profile_id} not found for tenant '{args.tenant}'.", file=sys.stderr)
+            return 2
+    else:
+        print("Provide --profile or --tenant with --profile-id.", file=sys.stderr)
+        return 2
+    if not (args.jsonl or args.directory):
+        print("Provide a CV directory or --jsonl.", file=sys.stderr)
+        return 2
+
+    stats = ThroughputStats("match-cvs")
+
+    def cv_texts(records):
+        for cv in iter_cv_texts(records, workers=args.workers):
+            stats.add(len(cv["text"].encode("utf-8")), error=cv["error"] is not None)
+            if cv["error"]:
+                print(f"{cv['id']}: {cv['error']}", file=sys.stderr)
+            else:
+                yield cv["id"], cv["text"]
+
+    with open_input(args.jsonl) as stream:
+        records = iter_jsonl(stream) if stream else iter_directory(Path(args.directory))
+        try:
+            ranking = match_cvs(
+                profile, cv_texts(records), use_embeddings=not args.no_embeddings, batch_size=args.batch_size, top_k=args.top
+            )
+        except ValueError as e:
+            print(str(e), file=sys.stderr)
+            return 2
+    with open_output(args.output) as out:
+        for rank, match in enumerate(ranking, start=1):
+            out.write(json.dumps({"rank": rank, **match.to_dict()}, ensure_ascii=False) + "\n")
+    print(stats.summary(), file=sys.stderr)
+    return 0 if ranking else 1
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Vacalyser batch tools")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    analyze = sub.add_parser("analyze", help="Extract fields and tasks from a directory or JSONL stream of job ads")
+    analyze.add_argument("directory", nargs="?", help="Directory containing PDF/DOCX/TXT job ads")
+    analyze.add_argument("--jsonl", help="JSONL input with 'path' or 'text' per line ('-' for stdin)")
+    analyze.add_argument("-o", "--output", help="Output file (default: JSONL on stdout)")
+    analyze.add_argument("--format", choices=["jsonl", "parquet"], default="jsonl")
+    analyze.add_argument("-w", "--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    analyze.add_argument("--no-recursive", action="store_true", help="Only scan the top level of the directory")
+    analyze.set_defaults(func=cmd_analyze)
+
+    generate = sub.add_parser("generate", help="Render job ads for many profiles, optionally polished by the LLM")
+    generate.add_argument("profiles", nargs="?", help="JSONL file with one profile per line ('-' for stdin)")
+    generate.add_argument("--tenant", help="Use the saved profiles of this tenant instead of a file")
+    generate.add_argument("--query", help="Only saved profiles matching this search (with --tenant)")
+    generate.add_argument("-o", "--output", required=True, help="JSONL output file (failed profiles go to <name>.errors.jsonl)")
+    generate.add_argument("--locale", default="en", help="Template language (default: en)")
+    generate.add_argument("--format", choices=["markdown", "html"], default="markdown")
+    generate.add_argument("-w", "--workers", type=int, default=None, help="Render processes (default: CPU count, 0: in-process)")
+    generate.add_argument("--chunk-size", type=int, default=200, help="Profiles per render task")
+    generate.add_argument("--polish", action="store_true", help="Let the LLM improve the wording of each ad")
+    generate.add_argument("--concurrency", type=int, default=4, help="Concurrent LLM requests when polishing")
+    generate.add_argument("--no-cache", action="store_true", help="Don't reuse cached LLM answers")
+    generate.add_argument("--resume", action="store_true", help="Skip profiles already in the output and append; failed ones are retried")
+    generate.set_defaults(func=cmd_generate)
+
+    export = sub.add_parser("export", help="Export the job ad and interview guide of many profiles into a zip archive")
+    export.add_argument("profiles", nargs="?", help="JSONL file with one profile per line ('-' for stdin)")
+    export.add_argument("--tenant", help="Use the saved profiles of this tenant instead of a file")
+    export.add_argument("--query", help="Only saved profiles matching this search (with --tenant)")
+    export.add_argument("-o", "--output", required=True, help="Zip output file")
+    export.add_argument("--locale", default="en", help="Template language (default: en)")
+    export.add_argument(
+        "--formats", nargs="+", choices=["docx", "pdf", "html", "json"], default=["docx", "pdf", "html", "json"]
+    )
+    export.set_defaults(func=cmd_export)
+
+    score = sub.add_parser("score", help="Score the completeness, specificity and consistency of many profiles")
+    score.add_argument("profiles", nargs="?", help="JSONL file with one profile per line ('-' for stdin)")
+    score.add_argument("--tenant", help="Use the saved profiles of this tenant instead of a file")
+    score.add_argument("--query", help="Only saved profiles matching this search (with --tenant)")
+    score.add_argument("-o", "--output", help="JSONL output file (default: stdout)")
+    score.add_argument("--batch-size", type=int, default=1000, help="Profiles scored per vectorized batch")
+    score.add_argument("--no-embeddings", action="store_true", help="Match skills to tasks by name only")
+    score.set_defaults(func=cmd_score)
+
+    salary_index = sub.add_parser("salary-index", help="Build the salary benchmark index from analyze results")
+    salary_index.add_argument("results", nargs="+", help="Result files of 'analyze' (JSONL or Parquet)")
+    salary_index.add_argument("-o", "--output", help="Index file (default: SALARY_INDEX_PATH)")
+    salary_index.set_defaults(func=cmd_salary_index)
+
+    salary = sub.add_parser("salary", help="Salary percentiles for a job title from the salary index")
+    salary.add_argument("title", help="Job title")
+    salary.add_argument("--location", help="Narrow to a location when it has enough ads")
+    salary.add_argument("--currency", default="EUR")
+    salary.add_argument("--index", help="Index file (default: SALARY_INDEX_PATH)")
+    salary.set_defaults(func=cmd_salary)
+
+    match = sub.add_parser("match-cvs", help="Rank CVs against the tasks and skills of a job profile")
+    match.add_argument("directory", nargs="?", help="Directory containing PDF/DOCX/TXT CVs")
+    match.add_argument("--jsonl", help="JSONL input with 'path' or 'text' per line ('-' for stdin)")
+    match.add_argument("--profile", help="JSON file with the job profile fields")
+    match.add_argument("--tenant", help="Use a saved profile of this tenant (with --profile-id)")
+    match.add_argument("--profile-id", type=int, help="Id of the saved profile")
+    match.add_argument("-o", "--output", help="JSONL output file, best candidate first (default: stdout)")
+    match.add_argument("--top", type=int, default=None, help="Only output the best N candidates")
+    match.add_argument("--batch-size", type=int, default=256, help="CVs compared per vectorized batch")
+    match.add_argument("-w", "--workers", type=int, default=None, help="CV parsing processes (default: CPU count, 0: in-process)")
+    match.add_argument("--no-embeddings", action="store_true", help="Match requirements by text only")
+    match.set_defaults(func=cmd_match_cvs)
+    return parser
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,8 +1,14 @@
 # controllers/evaluation_controller.property
 
 import streamlit as st
+from services.salary_extraction import extract_salary
+from services.skill_taxonomy import get_skill_taxonomy
+from services.web_fetcher import get_web_fetcher
+from utils.misc_utils import extract_bullet_points
 from utils.session_utils import get_from_session_state, store_in_state
 
+MISSION_HINTS = ("mission", "vision", "purpose", "our values", "leitbild", "unsere werte", "wofür wir stehen")
+
 def analyze_uploaded_sources():
     """
     Merge the uploaded file content (if any) with the provided URL content (if any),
@@ -10,29 +16,41 @@ def analyze_uploaded_sources():
     """
     # Retrieve uploaded file text and input URL from session
     file_text = get_from_session_state("uploaded_file", "")
-    input_url = get_from_session_state("input_url", "")
+    input_url = (get_from_session_state("input_url", "") or "").strip()
     combined_text = file_text
-    if input_url and input_url.lower().startswith("http"):
-        # (Optional) In a real scenario, fetch URL content. Here, just note the URL.
-        combined_text += f"\nAdditional context from URL: {input_url}\n"
+    if input_url:
+        try:
+            url_text = get_web_fetcher().fetch_text(input_url)
+            combined_text += f"\n{url_text}\n"
+        except ValueError as e:
+            st.warning(f"Invalid URL: {e}")
+        except Exception as e:
+            st.warning(f"Could not fetch {input_url}: {e}")
     # Store combined content in session for reference
     store_in_state("analyzed_job_content", combined_text)
     # Auto-extract tasks (bullet points) from combined content as a demonstration
     if combined_text.strip():
-        tasks_found = []
-        for line in combined_text.splitlines():
-            line = line.strip()
-            if not line:
-                continue
-            if line[0] in ("-", "*", "•", "–") or line[:1].isdigit():
-                # Treat lines starting with bullet or number as potential tasks
-                cleaned = line.lstrip("-*•–0123456789. \t").strip()
-                if cleaned:
-                    tasks_found.append(cleaned)
-        if tasks_found:
-            # Remove duplicates while preserving order
-            unique_tasks = list(dict.fromkeys(tasks_found))
+        unique_tasks = extract_bullet_points(combined_text)
+        if unique_tasks:
             store_in_state("tasks", unique_tasks)
+        salary = extract_salary(combined_text)
+        if salary and salary["currency"] == "EUR":
+            store_in_state("min_salary", int(salary["min"]))
+            store_in_state("max_salary", int(salary["max"]))
+            store_in_state("salary_range", f"{int(salary['min'])}-{int(salary['max'])}")
+        skills = [match.skill.name for match in get_skill_taxonomy().extract(combined_text)]
+        if skills:
+            store_in_state("skills", skills)
         st.success("Sources analyzed. Relevant fields auto-filled where possible.")
     else:
         st.warning("No content found to analyze from file or URL.")
+
+def scrape_company_mission(url: str, max_lines: int = 3) -> str:
+    """
+    Fetch a company website and return the lines that read like a mission or vision statement.
+    Falls back to the first substantial paragraph if no line mentions mission/vision.
+    """
+    text = get_web_fetcher().fetch_text(url)
+    lines = [line for line in text.splitlines() if len(line) > 30]
+    hits = [line for line in lines if any(hint in line.lower() for hint in MISSION_HINTS)]
+    return "\n".join((hits or lines)[:max_lines])
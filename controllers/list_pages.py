@@ -0,0 +1,76 @@
+# controllers/list_pages.py
+
+import streamlit as st
+
+from services.llm_service import get_llm_service
+from utils.session_utils import init_main_state, get_from_session_state, store_in_state
+from utils.ui_utils import apply_base_styling, display_suggestions, list_field_editor
+
+def _store_job_title():
+    """on_change callback of the job title input."""
+    store_in_state("job_title", st.session_state.get("list_page_job_title", "").strip())
+
+def _page_link(label: str, page: str):
+    """Button switching to another page, falling back to a plain link when the target isn't a page of the running app."""
+    if st.button(label):
+        try:
+            st.switch_page(page)
+        except Exception:
+            st.markdown(f'<a href="/{page}" target="_self">{label}</a>', unsafe_allow_html=True)
+
+def render_list_page(
+    category: str,
+    title: str,
+    header: str,
+    description: str,
+    input_label: str,
+    add_label: str,
+    suggest_label: str,
+    back: tuple = None,
+    next: tuple = None,
+):
+    """
+    Standalone page editing one list field of the job profile (tasks, skills or benefits)
+    with AI suggestions from the shared LLM service.
+    :param category: Profile list field, also the suggestion category ("tasks", "skills", "benefits").
+    :param title: Page title.
+    :param header: Section header; "{job_title}" is replaced with the job title.
+    :param description: Intro text.
+    :param input_label: Label of the input for new items.
+    :param add_label: Label of the add button.
+    :param suggest_label: Label of the AI suggestion button.
+    :param back: Optional (label, page) of the previous page.
+    :param next: Optional (label, page) of the next page.
+    """
+    init_main_state()
+    apply_base_styling()
+    st.title(title)
+
+    # Ensure job title is provided
+    job_title = get_from_session_state("job_title")
+    if not job_title:
+        st.text_input("Job Title", key="list_page_job_title", placeholder="Enter the job title", on_change=_store_job_title)
+        st.warning("Please enter a job title to proceed.")
+        st.stop()
+
+    st.header(header.format(job_title=job_title))
+    st.write(description)
+
+    list_field_editor(category, input_label, add_label, "**Current list:**", removable=True)
+
+    suggestions_key = f"suggestions_{category}"
+    if st.button(suggest_label):
+        try:
+            st.session_state[suggestions_key] = get_llm_service().generate_suggestions(job_title, category=category, count=15)
+        except Exception as e:
+            st.error(f"Failed to get AI suggestions: {e}")
+    display_suggestions(suggestions_key, store_key=category)
+
+    # Navigation buttons
+    prev_col, next_col = st.columns([1, 1])
+    if back:
+        with prev_col:
+            _page_link(*back)
+    if next:
+        with next_col:
+            _page_link(*next)
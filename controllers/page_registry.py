@@ -0,0 +1,162 @@
+# controllers/page_registry.py
+
+import os
+import threading
+from concurrent.futures import CancelledError, Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import streamlit as st
+
+from models.job_profile import JobProfile
+
+PREFETCH_WORKERS = int(os.getenv("PREFETCH_WORKERS", "8"))
+PREFETCH_STATE_KEY = "prefetch_jobs"
+
+@dataclass(frozen=True)
+class PrefetchTask:
+    """
+    Expensive data a page needs, computed in the background from profile fields.
+    func is called as func(*[profile.<field> for field in inputs], **kwargs).
+    """
+    key: str
+    func: Callable[..., Any]
+    inputs: Tuple[str, ...]
+    kwargs: Dict[str, Any] = field(default_factory=dict)
+
+@dataclass(frozen=True)
+class PageSpec:
+    """
+    One wizard step.
+    :param step: 1-based position in the wizard.
+    :param title: Short title (sidebar progress).
+    :param render: Page function.
+    :param fields: Profile fields collected on this page.
+    :param requires: Fields from earlier steps this page depends on.
+    :param prefetch: Background tasks started while the user is on the previous step.
+    """
+    step: int
+    title: str
+    render: Callable[[], None]
+    fields: Tuple[str, ...] = ()
+    requires: Tuple[str, ...] = ()
+    prefetch: Tuple[PrefetchTask, ...] = ()
+
+    def missing(self, profile: JobProfile) -> List[str]:
+        """Required fields that are still empty."""
+        return [name for name in self.requires if not getattr(profile, name)]
+
+_prefetch_executor: Optional[ThreadPoolExecutor] = None
+_prefetch_executor_lock = threading.Lock()
+
+def get_prefetch_executor() -> ThreadPoolExecutor:
+    """Return the process-wide thread pool for prefetch work (I/O-bound LLM calls)."""
+    global _prefetch_executor
+    if _prefetch_executor is None:
+        with _prefetch_executor_lock:
+            if _prefetch_executor is None:
+                _prefetch_executor = ThreadPoolExecutor(max_workers=PREFETCH_WORKERS, thread_name_prefix="prefetch")
+    return _prefetch_executor
+
+def _task_inputs(task: PrefetchTask, profile: JobProfile) -> Optional[Tuple]:
+    values = tuple(getattr(profile, name) for name in task.inputs)
+    if not all(values):
+        return None
+    # Lists aren't hashable and may change after submission
+    return tuple(tuple(v) if isinstance(v, list) else v for v in values)
+
+def _run_task(task: PrefetchTask, args: List, cancel: threading.Event):
+    if cancel.is_set():
+        raise CancelledError()
+    return task.func(*args, **task.kwargs)
+
+def _forward(source: Future, target: Future):
+    try:
+        target.set_result(source.result())
+    except BaseException as e:
+        target.set_exception(e)
+
+def _submit(task: PrefetchTask, args: List, cancel: threading.Event, delay: float) -> Future:
+    """
+    Submit a task to the prefetch pool, after `delay` seconds if given.
+    The debounce waits on the cancel event in its own lightweight thread, not in a pool worker,
+    so superseded submissions never occupy the pool; the returned future is pending until then.
+    """
+    if not delay:
+        return get_prefetch_executor().submit(_run_task, task, args, cancel)
+    future: Future = Future()
+
+    def submit_when_settled():
+        if cancel.wait(delay) or not future.set_running_or_notify_cancel():
+            return
+        try:
+            job = get_prefetch_executor().submit(_run_task, task, args, cancel)
+        except RuntimeError as e:  # interpreter shutting down
+            future.set_exception(e)
+            return
+        job.add_done_callback(lambda done: _forward(done, future))
+
+    threading.Thread(target=submit_when_settled, name="prefetch-debounce", daemon=True).start()
+    return future
+
+def start_prefetch(tasks: Tuple[PrefetchTask, ...], profile: JobProfile, delay: float = 0.0):
+    """
+    Submit the tasks whose inputs are filled and not already being computed for this session.
+    A task is resubmitted only when its inputs change, so calling this on every rerun is cheap;
+    the superseded job is cancelled (a call already in progress finishes, but its result is ignored).
+    :param delay: Debounce in seconds before the work starts; a newer submission within it cancels this one.
+    """
+    jobs: Dict[str, Tuple[Tuple, Future, threading.Event]] = st.session_state.setdefault(PREFETCH_STATE_KEY, {})
+    for task in tasks:
+        inputs = _task_inputs(task, profile)
+        current = jobs.get(task.key)
+        if inputs is None:
+            # An input was cleared: whatever is running is stale now
+            if current is not None:
+                cancel_prefetch((task.key,))
+            continue
+        if current is not None and current[0] == inputs:
+            continue
+        if current is not None:
+            current[2].set()
+            current[1].cancel()
+        args = [list(v) if isinstance(v, tuple) else v for v in inputs]
+        cancel = threading.Event()
+        jobs[task.key] = (inputs, _submit(task, args, cancel, delay), cancel)
+
+def cancel_prefetch(keys: Optional[Tuple[str, ...]] = None):
+    """Cancel this session's prefetch jobs (all, or the given keys)."""
+    jobs = st.session_state.get(PREFETCH_STATE_KEY, {})
+    for key in list(jobs if keys is None else keys):
+        job = jobs.pop(key, None)
+        if job is not None:
+            job[2].set()
+            job[1].cancel()
+
+def get_prefetched(key: str, inputs: Tuple, wait: bool = False, timeout: Optional[float] = None):
+    """
+    Result of a prefetch task for exactly these inputs.
+    :param wait: Block until a running task finishes (up to timeout seconds).
+    :return: The result, or None if there is no matching task, it isn't done yet or it failed.
+    """
+    job = st.session_state.get(PREFETCH_STATE_KEY, {}).get(key)
+    if job is None or job[0] != inputs:
+        return None
+    future = job[1]
+    if not future.done() and not wait:
+        return None
+    try:
+        return future.result(timeout=timeout)
+    except Exception:
+        return None
+
+def is_prefetching(key: str, inputs: Tuple) -> bool:
+    job = st.session_state.get(PREFETCH_STATE_KEY, {}).get(key)
+    return job is not None and job[0] == inputs and not job[1].done()
+
+def prefetch_for_step(pages: Dict[int, PageSpec], step: int, profile: JobProfile):
+    """Start the background work of the given step and of the step after it."""
+    for target in (step, step + 1):
+        spec = pages.get(target)
+        if spec is not None and spec.prefetch:
+            start_prefetch(spec.prefetch, profile)
@@ -1,20 +1,30 @@
 # controllers/wizard_pages.py
 
+import os
 import streamlit as st
-import openai
 
-from controllers.evaluation_controller import analyze_uploaded_sources
+from controllers.evaluation_controller import analyze_uploaded_sources, scrape_company_mission
+from controllers.page_registry import PageSpec, PrefetchTask, get_prefetched, is_prefetching, prefetch_for_step, start_prefetch
 
 from services.file_parser  import parse_file, match_and_store_keys, SESSION_KEYS
-from services.rag_service import RAGService, build_index, search
-from services.llm_service import complete, generate_suggestions, _parse_suggestions_from_text, create_llm_service
+from services.profile_repository import get_profile_repository
 from services.generation_service import generate_job_ad, generate_interview_guide
-from services.ai_generator import generate_key_tasks, generate_skills, generate_benefits, generate_job_ad, generate_interview_questions
-
-from utils.session_utils import store_in_state, init_main_state, get_from_session_state
-from utils.ui_utils import apply_base_styling, show_sidebar_links, display_suggestions
+from services.ad_writer import write_ad
+from services.export_service import EXPORT_FORMATS, export_filename, export_key, export_profile
+from services.profile_scoring import score_profile
+from services.salary_index import get_salary_index
+from services.skill_taxonomy import canonicalize_skills, get_skill_taxonomy
+from services.template_engine import available_locales
+from services.ai_generator import generate_key_tasks, generate_responsibilities, generate_skills, generate_benefits
+
+from utils.session_utils import store_in_state, init_main_state, get_from_session_state, get_profile, current_tenant_id, PROFILE_KEY
+from utils.ui_utils import (
+    apply_base_styling, show_sidebar_links, display_suggestions, fragment, rerun,
+    nav_buttons, go_to_section, list_field_editor, load_static_bytes, show_flash_message,
+)
 from utils.misc_utils import safe_int, format_list_as_bullets, sanitize_text 
 from utils.error_utils import handle_error
+from utils.perf_utils import profiled
 
 
 
@@ -24,53 +34,53 @@ from utils.error_utils import handle_error
 
 def render_current_page():
     """
-    Determine and render the current page based on st.session_state["current_section"].
+    Render the page registered for st.session_state["current_section"] (see PAGES), then start
+    background prefetching for the step after it.
     Make sure init_main_state() is called in app.py before calling this function.
     """
     current_step = st.session_state["current_section"]
-
-    # Adjust if you want 1-based steps. Here, we assume 1..9:
-    if current_step == 1:
-        start_discovery_page()
-    elif current_step == 2:
-        company_information_page()
-    elif current_step == 3:
-        department_information_page()
-    elif current_step == 4:
-        role_description_page()
-    elif current_step == 5:
-        task_scope_page()
-    elif current_step == 6:
-        skills_competencies_page()
-    elif current_step == 7:
-        benefits_compensation_page()
-    elif current_step == 8:
-        recruitment_process_page()
-    elif current_step == 9:
-        summary_outputs_page()
-    else:
-        # If somehow out of range, reset to the first page:
-        st.session_state["current_section"] = 1
-        st.experimental_rerun()
+    if current_step not in PAGES:
+        # If somehow out of range, clamp to the nearest step
+        current_step = min(max(current_step, 1), len(PAGES))
+        st.session_state["current_section"] = current_step
+    spec = PAGES[current_step]
+    profile = get_profile()
+
+    show_step_progress(current_step, profile)
+    missing = spec.missing(profile)
+    if missing:
+        st.info(f"This step works best once these are filled in: {', '.join(m.replace('_', ' ') for m in missing)}.")
+    try:
+        spec.render()
+    finally:
+        # Also after a rerun/stop raised by the page; the job title may have just been entered
+        prefetch_for_step(PAGES, current_step, get_profile())
+
+def show_step_progress(current_step: int, profile):
+    """Sidebar list of the wizard steps: filled (✅), empty (▫️) or missing a required field (⚠️)."""
+    lines = []
+    for spec in PAGES.values():
+        if spec.step == current_step:
+            marker = "👉"
+        elif spec.missing(profile):
+            marker = "⚠️"
+        else:
+            marker = "✅" if any(getattr(profile, name) for name in spec.fields) else "▫️"
+        lines.append(f"{marker} {spec.step}. {spec.title}")
+    st.sidebar.markdown("  \n".join(lines))
 
 ###############################################################################
 # PAGE 1: Start Discovery
 ###############################################################################
 
+@profiled(kind="page")
 def start_discovery_page():
     """ Wizard Page 1: Start Discovery. """
     apply_base_styling()
     show_sidebar_links()
 
-    st.image("images/sthree.png", width=80)
+    st.image(load_static_bytes("images/sthree.png"), width=80)
     st.title("Vacalyser")
-
-    response = openai.ChatCompletion.create(
-        model="gpt-3.5-turbo",
-        messages=[{"role": "user", "content": "Hello, world!"}]
-    )
-
-    print(response.choices[0].message.content)
     st.markdown(
         "**Enhancing hiring workflows** with intelligent suggestions and automations. "
         "We help teams fine-tune job postings and CVs efficiently for better hiring outcomes."
@@ -88,59 +98,130 @@ def start_discovery_page():
         job_title_val = get_from_session_state("job_title", "")
         job_title = st.text_input("Enter a **Job Title**", value=job_title_val)
         store_in_state("job_title", job_title)
+        # Start suggestions for pages 4-7 once the title has settled; a newer title cancels stale work
+        start_prefetch(SUGGESTION_TASKS, get_profile(), delay=SUGGESTION_DEBOUNCE)
 
-        default_url = get_from_session_state("input_url", "http://www.")
-        input_url = st.text_input("🔗 Link to a Job Ad / Company Website", value=default_url)
+        default_url = get_from_session_state("input_url", "")
+        input_url = st.text_input(
+            "🔗 Link to a Job Ad / Company Website", value=default_url, placeholder="https://www.example.com/jobs/123"
+        )
         store_in_state("input_url", input_url)
 
     with col2:
         # File upload
         uploaded_file = st.file_uploader("Upload Job Ad (PDF, DOCX, TXT)", type=["pdf", "docx", "txt"])
         if uploaded_file:
-            try:
-                content = parse_file(uploaded_file, file_name=uploaded_file.name)  # returns raw text
-                store_in_state("uploaded_file", content)
+            # Parse each upload once; reruns while the file stays attached reuse the stored text
+            upload_id = (uploaded_file.name, uploaded_file.size)
+            if get_from_session_state("uploaded_file_id") != upload_id:
+                try:
+                    content = parse_file(uploaded_file, file_name=uploaded_file.name)  # returns raw text
+                    store_in_state("uploaded_file", content)
+                    store_in_state("uploaded_file_id", upload_id)
+                except Exception as e:
+                    st.error(f"Error parsing file: {e}")
+            if get_from_session_state("uploaded_file_id") == upload_id:
                 st.success("File uploaded and parsed successfully.")
-            except Exception as e:
-                st.error(f"Error parsing file: {e}")
 
     # Buttons row
     c1, c2 = st.columns([1, 1])
     with c1:
-        # "Analyse Sources" button
-        if st.button("Analyse Sources"):
-            try:
-                # 1) Retrieve the text from session
-                raw_text = get_from_session_state("uploaded_file", "")
-                if not raw_text.strip():
-                    st.warning("No file content found. Please upload a file first.")
-                else:
-                    # 2) Use match_and_store_keys to extract relevant fields (company_name, job_title, etc.)
-                    match_and_store_keys(raw_text, SESSION_KEYS)
-                    st.success("Keys extracted successfully from the uploaded file.")
-            except Exception as err:
-                st.error(f"Analysis failed: {err}")
-            else:
-                # Optional: remain on this page or navigate
-                st.experimental_rerun()
+        # Runs as a callback, so the extracted fields show up without an extra rerun
+        st.button("Analyse Sources", on_click=_analyse_uploaded_file)
+        show_flash_message("analysis_message")
 
     with c2:
-        if st.button("Next ➡"):
-            st.session_state["current_section"] += 1
-            st.experimental_rerun()
+        st.button("Next ➡", key="nav_next", on_click=go_to_section, args=(1,))
+
+    past_profiles_section()
+
+
+PAST_PROFILES_PAGE_SIZE = 10
+
+@fragment
+def past_profiles_section():
+    """Search the tenant's saved profiles and clone one as the starting point."""
+    if st.session_state.pop("profile_cloned", False):
+        rerun()  # the clone changes fields outside this fragment
+    with st.expander("📂 Start from a past profile"):
+        tenant = current_tenant_id()
+        query = st.text_input("Search saved profiles (title, company, skills, ...)", key="past_profiles_query")
+        try:
+            repo = get_profile_repository()
+            industries = repo.facets(tenant, "industry")
+        except Exception as e:
+            st.warning(f"Saved profiles are unavailable: {e}")
+            return
+        industry = st.selectbox("Industry", [""] + industries, key="past_profiles_industry")
+
+        # Reset to the first page whenever the search changes
+        search_key = (query, industry)
+        if st.session_state.get("past_profiles_search") != search_key:
+            st.session_state["past_profiles_search"] = search_key
+            st.session_state["past_profiles_page"] = 1
+        page = st.session_state["past_profiles_page"]
+
+        rows, total = repo.search(tenant, query, industry=industry or None, page=page, page_size=PAST_PROFILES_PAGE_SIZE)
+        if not total:
+            st.caption("No saved profiles found.")
+            return
+        for row in rows:
+            c1, c2 = st.columns([4, 1])
+            c1.write(f"**{row['job_title'] or 'Untitled'}** — {row['company_name']} · {row['location']} · {row['industry']}")
+            c2.button("Clone", key=f"clone_profile_{row['id']}", on_click=_clone_profile, args=(row["id"],))
+
+        pages = -(-total // PAST_PROFILES_PAGE_SIZE)
+        p1, p2, p3 = st.columns([1, 2, 1])
+        p1.button("◀", key="past_profiles_prev", disabled=page <= 1, on_click=_set_past_profiles_page, args=(page - 1,))
+        p2.caption(f"Page {page} of {pages} ({total} profiles)")
+        p3.button("▶", key="past_profiles_next", disabled=page >= pages, on_click=_set_past_profiles_page, args=(page + 1,))
+
+
+def _set_past_profiles_page(page: int):
+    st.session_state["past_profiles_page"] = page
+
+
+def _clone_profile(profile_id: int):
+    """on_click callback: replace the current profile with a copy of a saved one."""
+    profile = get_profile_repository().get(profile_id, current_tenant_id())
+    if profile is None:
+        store_in_state("analysis_message", ("warning", "That profile no longer exists."))
+        return
+    st.session_state[PROFILE_KEY] = profile
+    st.session_state.pop("saved_profile_id", None)
+    # Force the clone into the session store on this run
+    st.session_state.pop("persisted_section", None)
+    st.session_state["profile_cloned"] = True
+    store_in_state("analysis_message", ("success", f"Cloned '{profile.job_title or 'profile'}'. Review and adjust the fields."))
+
+
+def _analyse_uploaded_file():
+    """on_click callback for "Analyse Sources": extract fields from the uploaded file."""
+    try:
+        # 1) Retrieve the text from session
+        raw_text = get_from_session_state("uploaded_file", "")
+        if not raw_text.strip():
+            store_in_state("analysis_message", ("warning", "No file content found. Please upload a file first."))
+        else:
+            # 2) Use match_and_store_keys to extract relevant fields (company_name, job_title, etc.)
+            match_and_store_keys(raw_text, SESSION_KEYS)
+            store_in_state("analysis_message", ("success", "Keys extracted successfully from the uploaded file."))
+    except Exception as err:
+        store_in_state("analysis_message", ("error", f"Analysis failed: {err}"))
 
 
 ###############################################################################
 # PAGE 2: Company Information
 ###############################################################################
 
+@profiled(kind="page")
 def company_information_page():
     """ Wizard Page 2: Company Information """
     apply_base_styling()
     show_sidebar_links()
 
     st.header("2) Information about")
-    st.write("Company:", st.session_state.get("company_name"))
+    st.write("Company:", get_from_session_state("company_name"))
 
 
     company_name = st.text_input("Company Name", get_from_session_state("company_name", ""))
@@ -167,10 +248,15 @@ def company_information_page():
     store_in_state("company_website", website)
 
     if st.button("Scrape Website for Mission & Vision"):
-        # placeholder scraping logic
-        found_mission = "(Demo) Discovered mission statement from website scraping."
-        store_in_state("company_mission", found_mission)
-        st.info("Mission & Vision updated from website scraping (demo).")
+        try:
+            found_mission = scrape_company_mission(website)
+            if found_mission:
+                store_in_state("company_mission", found_mission)
+                st.info("Mission & Vision updated from website scraping.")
+            else:
+                st.warning("No mission or vision statement found on the website.")
+        except Exception as e:
+            st.error(f"Failed to scrape website: {e}")
 
     # Industry + Company Size
     top10_inds = [
@@ -197,21 +283,14 @@ def company_information_page():
     store_in_state("company_mission", mission_txt)
 
     # Back/Next
-    cA, cB = st.columns([1, 1])
-    with cA:
-        if st.button("⬅ Back (Start)"):
-            st.session_state["current_section"] -= 1
-            st.experimental_rerun()
-    with cB:
-        if st.button("Next ➡"):
-            st.session_state["current_section"] += 1
-            st.experimental_rerun()
+    nav_buttons(back_label="⬅ Back (Start)")
 
 
 ###############################################################################
 # PAGE 3: Department Information
 ###############################################################################
 
+@profiled(kind="page")
 def department_information_page():
     """ Wizard Page 3: Department Information """
     apply_base_styling()
@@ -251,21 +330,7 @@ def department_information_page():
         "Azure", "Docker", "Kubernetes", "Salesforce", "SAP", "Tableau", "PowerBI"
     ]
     st.caption("Click any that apply; you can also add your own below.")
-    stored_techs = set(get_from_session_state("technologies_used", []))
-    col_techs = st.columns(5)
-    for i, tech in enumerate(recommended_techs):
-        cidx = i % 5
-        if col_techs[cidx].button(tech):
-            stored_techs.add(tech)
-
-    manual_tech = st.text_input("Add Another Technology:")
-    if st.button("Add Technology"):
-        if manual_tech.strip():
-            stored_techs.add(manual_tech.strip())
-
-    store_in_state("technologies_used", list(stored_techs))
-    if stored_techs:
-        st.write("**Currently Selected Technologies:**", ", ".join(stored_techs))
+    technologies_section(recommended_techs)
 
     # Culture / Collaborations
     c_opts = ["Agile", "Hierarchical", "Cross-functional", "Startup Mindset", "Other"]
@@ -281,21 +346,38 @@ def department_information_page():
     store_in_state("department_collaborations", chosen_collabs)
 
     # Next/Back
-    cA, cB = st.columns([1, 1])
-    with cA:
-        if st.button("⬅ Back"):
-            st.session_state["current_section"] -= 1
-            st.experimental_rerun()
-    with cB:
-        if st.button("Next ➡"):
-            st.session_state["current_section"] += 1
-            st.experimental_rerun()
+    nav_buttons()
+
+
+@fragment
+def technologies_section(recommended_techs):
+    """Technology picker; clicks only rerun this section."""
+    profile = get_profile()
+    col_techs = st.columns(5)
+    for i, tech in enumerate(recommended_techs):
+        cidx = i % 5
+        col_techs[cidx].button(tech, on_click=_add_technology, args=(tech,))
+
+    st.text_input("Add Another Technology:", key="new_technologies_used")
+    st.button("Add Technology", on_click=_add_technology)
+
+    stored_techs = profile.technologies_used
+    if stored_techs:
+        st.write("**Currently Selected Technologies:**", ", ".join(stored_techs))
+
+def _add_technology(tech: str = None):
+    """on_click callback: add a recommended technology, or the manually entered one."""
+    if tech is None:
+        tech = st.session_state.get("new_technologies_used", "")
+        st.session_state["new_technologies_used"] = ""
+    get_profile().add_items("technologies_used", [tech])
 
 
 ###############################################################################
 # PAGE 4: Role Description
 ###############################################################################
 
+@profiled(kind="page")
 def role_description_page():
     """ Wizard Page 4: Role Description """
     apply_base_styling()
@@ -306,7 +388,7 @@ def role_description_page():
     # Reason for Hiring
     st.write("**Reason for Hiring** (check all that apply):")
     reason_opts = ["New Role", "Growth", "Replacement", "Project-based"]
-    current_reason = set(get_from_session_state("job_reason", []))
+    current_reason = get_from_session_state("job_reason", [])
     new_set = []
     for r in reason_opts:
         checked = (r in current_reason)
@@ -317,78 +399,23 @@ def role_description_page():
 
     # Responsibilities
     st.subheader("Key Responsibilities / Accountabilities")
-    existing_resps = set(get_from_session_state("responsibility_distribution", []))
-
-    if st.button("AI: Generate Responsibilities"):
-        if st.session_state["job_title"].strip():
-            try:
-                # Use generate_key_tasks (or a dedicated function) if you want separate responsibilities
-                suggestions = generate_key_tasks(st.session_state["job_title"], count=8)
-                # Add to existing, remove duplicates
-                for item in suggestions:
-                    existing_resps.add(item)
-                store_in_state("responsibility_distribution", list(existing_resps))
-            except Exception as e:
-                st.error(f"Failed to generate responsibilities: {e}")
-        else:
-            st.warning("Please provide a job title first.")
-
-    new_resp = st.text_input("Add a Responsibility/Accountability:")
-    if st.button("Add Responsibility"):
-        if new_resp.strip():
-            existing_resps.add(new_resp.strip())
-            store_in_state("responsibility_distribution", list(existing_resps))
-            st.experimental_rerun()
-
-    if existing_resps:
-        st.write("**Currently Selected Responsibilities:**")
-        for r in existing_resps:
-            st.markdown(f"- {r}")
+    generated_list_section(
+        "responsibility_distribution", "AI: Generate Responsibilities", generate_responsibilities, 8,
+        "Add a Responsibility/Accountability:", "Add Responsibility",
+        "**Currently Selected Responsibilities:**",
+    )
 
     # Core Tasks
     st.subheader("Core Tasks or Duties")
-    existing_tasks = set(get_from_session_state("tasks", []))
-
-    if st.button("AI: Generate Tasks"):
-        if st.session_state["job_title"].strip():
-            try:
-                tasks_found = generate_key_tasks(st.session_state["job_title"], count=8)
-                for tsk in tasks_found:
-                    existing_tasks.add(tsk)
-                store_in_state("tasks", list(existing_tasks))
-            except Exception as e:
-                st.error(f"Failed to generate tasks: {e}")
-        else:
-            st.warning("Please provide a job title first.")
-
-    new_task = st.text_input("Add a Task/Duty:")
-    if st.button("Add Task"):
-        if new_task.strip():
-            existing_tasks.add(new_task.strip())
-            store_in_state("tasks", list(existing_tasks))
-            st.experimental_rerun()
-
-    if existing_tasks:
-        st.write("**Currently Selected Tasks:**")
-        for t in existing_tasks:
-            st.markdown(f"- {t}")
+    generated_list_section(
+        "tasks", "AI: Generate Tasks", generate_key_tasks, 8,
+        "Add a Task/Duty:", "Add Task", "**Currently Selected Tasks:**",
+    )
 
     # Challenges
     st.subheader("Typical Challenges in This Role")
-    existing_challenges = set(get_from_session_state("job_challenges", []))
-
     # If you want AI for challenges, call a relevant generator or handle differently.
-    new_chal = st.text_input("Add a Challenge:")
-    if st.button("Add Challenge"):
-        if new_chal.strip():
-            existing_challenges.add(new_chal.strip())
-            store_in_state("job_challenges", list(existing_challenges))
-            st.experimental_rerun()
-
-    if existing_challenges:
-        st.write("**Currently Selected Challenges:**")
-        for c in existing_challenges:
-            st.markdown(f"- {c}")
+    list_section("job_challenges", "Add a Challenge:", "Add Challenge", "**Currently Selected Challenges:**")
 
     st.markdown("---")
     st.subheader("Travel & Remote Requirements")
@@ -421,21 +448,62 @@ def role_description_page():
     store_in_state("remote_policy", chosen_remote)
 
     # Navigation
-    cA, cB = st.columns([1, 1])
-    with cA:
-        if st.button("⬅ Back"):
-            st.session_state["current_section"] -= 1
-            st.experimental_rerun()
-    with cB:
-        if st.button("Next ➡"):
-            st.session_state["current_section"] += 1
-            st.experimental_rerun()
+    nav_buttons()
+
+
+@fragment
+def list_section(store_key, input_label, add_label, current_label, removable=False, normalizer=None):
+    """Editable list field rendered as its own fragment."""
+    list_field_editor(store_key, input_label, add_label, current_label, removable=removable, normalizer=normalizer)
+
+@fragment
+def generated_list_section(store_key, generate_label, generator, count, input_label, add_label, current_label, removable=False):
+    """List field with AI suggestions; generation and edits only rerun this fragment."""
+    ai_suggestions(store_key, f"{store_key}_suggestions", generate_label, generator, count)
+    list_field_editor(store_key, input_label, add_label, current_label, removable=removable)
+
+def _publish_suggestions(suggestions_key: str, store_key: str, suggestions, job_title: str):
+    """Offer suggestions that aren't in the target list yet, remembering which title they were made for."""
+    existing = set(get_from_session_state(store_key, []))
+    st.session_state[suggestions_key] = [s for s in suggestions if s not in existing]
+    st.session_state[f"{suggestions_key}_for"] = job_title
+
+def ai_suggestions(store_key, suggestions_key, generate_label, generator, count):
+    """
+    "AI: Generate ..." button plus the suggestions to accept into store_key.
+    Suggestions prefetched in the background (see PAGES) are shown as soon as they are ready;
+    the button reuses a pending prefetch for the current title instead of starting a second call.
+    """
+    prefetch_key = f"suggestions.{store_key}"
+    job_title = get_profile().job_title or ""
+    shown = st.session_state.get(f"{suggestions_key}_for") == job_title
+    if job_title and not shown:
+        ready = get_prefetched(prefetch_key, (job_title,))
+        if ready is not None:
+            _publish_suggestions(suggestions_key, store_key, ready, job_title)
+            shown = True
+
+    if st.button(generate_label, key=f"generate_{store_key}"):
+        if job_title.strip():
+            try:
+                result = None if shown else get_prefetched(prefetch_key, (job_title,), wait=True, timeout=120)
+                if result is None:
+                    result = generator(job_title, count=count)
+                _publish_suggestions(suggestions_key, store_key, result, job_title)
+            except Exception as e:
+                st.error(f"Failed to generate {store_key.replace('_', ' ')}: {e}")
+        else:
+            st.warning("Please provide a job title first.")
+    elif not shown and is_prefetching(prefetch_key, (job_title,)):
+        st.caption("⏳ Preparing AI suggestions in the background...")
+    display_suggestions(suggestions_key, store_key=store_key)
 
 
 ###############################################################################
 # PAGE 5: Task Scope
 ###############################################################################
 
+@profiled(kind="page")
 def task_scope_page():
     """ Wizard Page 5: Task Scope """
     apply_base_styling()
@@ -447,26 +515,7 @@ def task_scope_page():
         "You can edit them, remove them, or add new ones."
     )
 
-    current_tasks = get_from_session_state("tasks", [])
-    updated_tasks = set(current_tasks)
-
-    st.write("**Current Tasks:**")
-    for t in current_tasks:
-        colT1, colT2 = st.columns([4, 1])
-        with colT1:
-            st.write("- ", t)
-        with colT2:
-            if st.button(f"Remove {t}"):
-                updated_tasks.discard(t)
-                store_in_state("tasks", list(updated_tasks))
-                st.experimental_rerun()
-
-    new_task_val = st.text_input("Add Another Task:")
-    if st.button("Add This Task"):
-        if new_task_val.strip():
-            updated_tasks.add(new_task_val.strip())
-            store_in_state("tasks", list(updated_tasks))
-            st.experimental_rerun()
+    list_section("tasks", "Add Another Task:", "Add This Task", "**Current Tasks:**", removable=True)
 
     st.markdown("---")
     st.subheader("Autonomy Level")
@@ -478,21 +527,14 @@ def task_scope_page():
     store_in_state("autonomy_level", chosen_auto)
 
     # Navigation
-    cA, cB = st.columns([1, 1])
-    with cA:
-        if st.button("⬅ Back"):
-            st.session_state["current_section"] -= 1
-            st.experimental_rerun()
-    with cB:
-        if st.button("Next ➡"):
-            st.session_state["current_section"] += 1
-            st.experimental_rerun()
+    nav_buttons()
 
 
 ###############################################################################
 # PAGE 6: Skills & Competencies
 ###############################################################################
 
+@profiled(kind="page")
 def skills_competencies_page():
     """ Wizard Page 6: Required Skills & Competencies """
     apply_base_styling()
@@ -504,105 +546,69 @@ def skills_competencies_page():
         "You can separate them into Must-Have vs. Nice-to-Have, Hard vs. Soft, etc."
     )
 
-    must_hard_raw = set(
-        s.strip() for s in get_from_session_state("must_have_hard", "").split(",") if s.strip()
-    )
-    must_soft_raw = set(
-        s.strip() for s in get_from_session_state("must_have_soft", "").split(",") if s.strip()
-    )
-    nice_hard_raw = set(
-        s.strip() for s in get_from_session_state("nice_have_hard", "").split(",") if s.strip()
-    )
-    nice_soft_raw = set(
-        s.strip() for s in get_from_session_state("nice_have_soft", "").split(",") if s.strip()
-    )
-
-    st.write("**AI-Generated Skills**")
-    if st.button("Generate Skills via AI"):
-        job_title = st.session_state.get("job_title", "")
-        if not job_title:
-            st.warning("Please specify the Job Title first.")
-        else:
-            try:
-                # generate_skills can take job_title and an optional count
-                suggestions = generate_skills(job_title, count=10)
-                st.info("Click below to add them to Must-Have Hard Skills. You can reclassify them later.")
-                for idx, skill in enumerate(suggestions):
-                    if st.button(f"Add '{skill}' to Must-Have Hard", key=f"ai_skill_{idx}"):
-                        must_hard_raw.add(skill.strip())
-                        store_in_state("must_have_hard", ", ".join(must_hard_raw))
-                        st.experimental_rerun()
-            except Exception as e:
-                st.error(f"Failed to generate skills: {e}")
+    skill_suggestions_section()
 
     st.markdown("---")
+    detected = get_profile().skills
+    if detected:
+        st.caption("Skills mentioned in the job ad: " + ", ".join(detected))
+    st.button(
+        "Normalize Skill Lists", key="normalize_skills", on_click=_normalize_skill_lists,
+        help='Map spelling variants ("Py", "Python3") to one canonical skill name and drop duplicates.',
+    )
     # Must-Have Hard
     st.subheader("Must-Have Hard Skills")
-    show_skill_list(must_hard_raw, "must_have_hard", "Remove from Must-Have Hard")
-    new_mhh = st.text_input("Add Hard Skill to Must-Have:")
-    if st.button("Add Must-Have Hard"):
-        if new_mhh.strip():
-            must_hard_raw.add(new_mhh.strip())
-            store_in_state("must_have_hard", ", ".join(must_hard_raw))
-            st.experimental_rerun()
+    list_section("must_have_hard", "Add Hard Skill to Must-Have:", "Add Must-Have Hard", "**Current list:**", removable=True, normalizer=canonicalize_skills)
 
     # Must-Have Soft
     st.subheader("Must-Have Soft Skills")
-    show_skill_list(must_soft_raw, "must_have_soft", "Remove from Must-Have Soft")
-    new_mhs = st.text_input("Add Soft Skill to Must-Have:")
-    if st.button("Add Must-Have Soft"):
-        if new_mhs.strip():
-            must_soft_raw.add(new_mhs.strip())
-            store_in_state("must_have_soft", ", ".join(must_soft_raw))
-            st.experimental_rerun()
+    list_section("must_have_soft", "Add Soft Skill to Must-Have:", "Add Must-Have Soft", "**Current list:**", removable=True, normalizer=canonicalize_skills)
 
     # Nice-to-Have Hard
     st.subheader("Nice-to-Have Hard Skills")
-    show_skill_list(nice_hard_raw, "nice_have_hard", "Remove from Nice-to-Have Hard")
-    new_nhh = st.text_input("Add Hard Skill to Nice-to-Have:")
-    if st.button("Add Nice-to-Have Hard"):
-        if new_nhh.strip():
-            nice_hard_raw.add(new_nhh.strip())
-            store_in_state("nice_have_hard", ", ".join(nice_hard_raw))
-            st.experimental_rerun()
+    list_section("nice_have_hard", "Add Hard Skill to Nice-to-Have:", "Add Nice-to-Have Hard", "**Current list:**", removable=True, normalizer=canonicalize_skills)
 
     # Nice-to-Have Soft
     st.subheader("Nice-to-Have Soft Skills")
-    show_skill_list(nice_soft_raw, "nice_have_soft", "Remove from Nice-to-Have Soft")
-    new_nhs = st.text_input("Add Soft Skill to Nice-to-Have:")
-    if st.button("Add Nice-to-Have Soft"):
-        if new_nhs.strip():
-            nice_soft_raw.add(new_nhs.strip())
-            store_in_state("nice_have_soft", ", ".join(nice_soft_raw))
-            st.experimental_rerun()
+    list_section("nice_have_soft", "Add Soft Skill to Nice-to-Have:", "Add Nice-to-Have Soft", "**Current list:**", removable=True, normalizer=canonicalize_skills)
+
+    skill_spelling_hints()
 
     # Back/Next
-    colA, colB = st.columns([1, 1])
-    with colA:
-        if st.button("⬅ Back"):
-            st.session_state["current_section"] -= 1
-            st.experimental_rerun()
-    with colB:
-        if st.button("Next ➡"):
-            st.session_state["current_section"] += 1
-            st.experimental_rerun()
-
-def show_skill_list(skill_set, store_key, remove_label):
-    """Helper to display each skill as a removable button."""
-    if skill_set:
-        st.caption(f"Click to remove from {store_key}")
-        for skill in list(skill_set):
-            if st.button(f"Remove '{skill}'", key=f"remove_{skill}_{store_key}"):
-                skill_set.discard(skill)
-                store_in_state(store_key, ", ".join(skill_set))
-                st.experimental_rerun()
-        st.write("**Current list:**", ", ".join(skill_set))
+    nav_buttons()
+
+SKILL_FIELDS = ("must_have_hard", "must_have_soft", "nice_have_hard", "nice_have_soft")
+
+def _normalize_skill_lists():
+    """on_click callback: canonicalize all skill lists of page 6."""
+    for key in SKILL_FIELDS:
+        store_in_state(key, canonicalize_skills(get_from_session_state(key, [])))
+
+def skill_spelling_hints():
+    """Point out likely misspelled skills; the suggestion is only shown, never applied to the list."""
+    taxonomy = get_skill_taxonomy()
+    hints = []
+    for key in SKILL_FIELDS:
+        for term in get_from_session_state(key, []):
+            match = taxonomy.suggest(term)
+            if match is not None:
+                hints.append(f'"{term}" → {match.skill.name}?')
+    if hints:
+        st.caption("Did you mean: " + ", ".join(dict.fromkeys(hints)))
+
+@fragment
+def skill_suggestions_section():
+    """AI skill suggestions; accepted skills go to Must-Have Hard."""
+    st.write("**AI-Generated Skills**")
+    st.caption("Accepted skills are added to Must-Have Hard Skills. You can reclassify them later.")
+    ai_suggestions("must_have_hard", "skill_suggestions", "Generate Skills via AI", generate_skills, 10)
 
 
 ###############################################################################
 # PAGE 7: Benefits & Compensation
 ###############################################################################
 
+@profiled(kind="page")
 def benefits_compensation_page():
     """ Wizard Page 7: Benefits & Compensation """
     apply_base_styling()
@@ -611,8 +617,15 @@ def benefits_compensation_page():
     st.header("7) Benefits & Compensation")
 
     st.subheader("Salary Range")
-    min_sal = get_from_session_state("min_salary", 50000)
-    max_sal = get_from_session_state("max_salary", 70000)
+    benchmark = salary_benchmark()
+    if benchmark:
+        # Until the user sets a range, start from what comparable ads pay
+        default_min = int(round(benchmark.suggested_min, -3))
+        default_max = int(round(benchmark.suggested_max, -3))
+    else:
+        default_min, default_max = 50000, 70000
+    min_sal = get_from_session_state("min_salary", default_min)
+    max_sal = get_from_session_state("max_salary", default_max)
     c1, c2 = st.columns(2)
     with c1:
         updated_min = c1.number_input("Minimum Salary (€)", value=min_sal, step=1000)
@@ -621,52 +634,42 @@ def benefits_compensation_page():
     store_in_state("min_salary", updated_min)
     store_in_state("max_salary", updated_max)
     store_in_state("salary_range", f"{updated_min}-{updated_max}")
+    if benchmark:
+        p = benchmark.percentiles
+        st.caption(
+            f"Market ({benchmark.count} ads, {benchmark.scope}): median €{p[50]:,.0f}, "
+            f"middle half €{p[25]:,.0f} - €{p[75]:,.0f}"
+        )
 
     st.subheader("Key Benefits")
-    benefits_list = set(get_from_session_state("benefits", []))
-
-    if st.button("AI: Generate Benefits"):
-        job_title = st.session_state.get("job_title", "")
-        if not job_title:
-            st.warning("Please provide Job Title to generate relevant benefits.")
-        else:
-            try:
-                suggestions = generate_benefits(job_title, count=10)
-                for s in suggestions:
-                    benefits_list.add(s)
-                store_in_state("benefits", list(benefits_list))
-                st.experimental_rerun()
-            except Exception as e:
-                st.error(f"Failed to generate benefits: {e}")
-
-    new_ben = st.text_input("Add a Benefit:")
-    if st.button("Add Benefit"):
-        if new_ben.strip():
-            benefits_list.add(new_ben.strip())
-            store_in_state("benefits", list(benefits_list))
-            st.experimental_rerun()
-
-    if benefits_list:
-        st.write("**Selected Benefits:**", ", ".join(benefits_list))
+    generated_list_section(
+        "benefits", "AI: Generate Benefits", generate_benefits, 10,
+        "Add a Benefit:", "Add Benefit", "**Selected Benefits:**",
+    )
 
     # Additional categories can be placed here (Health, L&D, etc.)
 
     # Next/Back
-    colA, colB = st.columns([1, 1])
-    with colA:
-        if st.button("⬅ Back"):
-            st.session_state["current_section"] -= 1
-            st.experimental_rerun()
-    with colB:
-        if st.button("Next ➡"):
-            st.session_state["current_section"] += 1
-            st.experimental_rerun()
+    nav_buttons()
+
+
+def salary_benchmark():
+    """Salary benchmark for the profile's job title and location from the salary index, if one was built."""
+    title = get_from_session_state("job_title", "")
+    if not title:
+        return None
+    try:
+        index = get_salary_index()
+        return index.benchmark(title, get_from_session_state("location", "")) if index else None
+    except Exception:
+        return None
 
 
 ###############################################################################
 # PAGE 8: Recruitment Process
 ###############################################################################
 
+@profiled(kind="page")
 def recruitment_process_page():
     """ Wizard Page 8: Recruitment Process """
     apply_base_styling()
@@ -720,21 +723,14 @@ def recruitment_process_page():
     store_in_state("application_timeline", updated_timeline)
 
     # Next/Back
-    cA, cB = st.columns([1, 1])
-    with cA:
-        if st.button("⬅ Back"):
-            st.session_state["current_section"] -= 1
-            st.experimental_rerun()
-    with cB:
-        if st.button("Next ➡"):
-            st.session_state["current_section"] += 1
-            st.experimental_rerun()
+    nav_buttons()
 
 
 ###############################################################################
 # PAGE 9: Summary & Outputs
 ###############################################################################
 
+@profiled(kind="page")
 def summary_outputs_page():
     """ Wizard Page 9: Summary & Outputs """
     apply_base_styling()
@@ -771,15 +767,25 @@ def summary_outputs_page():
         st.write("**Interview Rounds**:", get_from_session_state("interview_stages", 0))
         st.write("**Timeline**:", get_from_session_state("application_timeline", ""))
 
+    profile_quality_section()
+
     st.markdown("---")
     st.markdown("### Generate Outputs")
 
-    colGen1, colGen2 = st.columns(2)
+    locales = available_locales("job_ad") or ["en"]
+    locale = st.selectbox("Output language", locales, index=locales.index("en") if "en" in locales else 0)
+    guide_use_llm = st.checkbox(
+        "Let AI write interview questions for skills without vetted questions",
+        key="guide_use_llm",
+        help="Other questions come from the curated question bank.",
+    )
+
+    colGen1, colGen2, colGen3 = st.columns(3)
     with colGen1:
         if st.button("🎯 Generate Job Ad"):
-            job_details = dict(st.session_state)
             try:
-                job_ad = generate_job_ad(job_details)
+                # The template reads only the fields it needs straight from the profile
+                job_ad = generate_job_ad(get_profile(), locale=locale)
                 st.subheader("Generated Job Ad")
                 st.write(job_ad)
             except Exception as e:
@@ -787,16 +793,147 @@ def summary_outputs_page():
 
     with colGen2:
         if st.button("📝 Generate Interview Guide"):
-            job_details = dict(st.session_state)
             try:
-                guide = generate_interview_questions(job_details, audience="HR")
+                guide = generate_interview_guide(get_profile(), audience="HR", locale=locale, use_llm=guide_use_llm)
                 st.subheader("Interview Preparation Guide")
                 st.write(guide)
             except Exception as e:
                 st.error(f"Failed to generate interview questions: {e}")
 
+    with colGen3:
+        if st.button("✍️ Write Job Ad with AI"):
+            try:
+                # Only sections whose input fields changed since the last run are sent to the LLM
+                draft = write_ad(get_profile(), locale=locale)
+                st.subheader("AI-Written Job Ad")
+                st.write(draft.text)
+                reused = len(draft.sections) - len(draft.regenerated)
+                st.caption(
+                    f"Regenerated: {', '.join(draft.regenerated) or 'nothing'} · {reused} of {len(draft.sections)} sections reused"
+                )
+            except Exception as e:
+                st.error(f"Failed to write job ad: {e}")
+
+    downloads_section(locale, guide_use_llm)
+
+    st.button("💾 Save Profile", on_click=_save_profile, help="Store this profile so it can be searched and cloned later.")
+    show_flash_message("save_message")
+
     st.info("You can always return to previous sections to refine details.")
 
-    if st.button("⬅ Back"):
-        st.session_state["current_section"] -= 1
-        st.experimental_rerun()
\ No newline at end of file
+    nav_buttons(show_next=False)
+
+
+def profile_quality_section():
+    """Completeness, specificity and consistency scores with the concrete findings behind them."""
+    st.markdown("### Profile Quality")
+    try:
+        score = score_profile(get_profile())
+    except Exception as e:
+        st.caption(f"Scoring unavailable: {e}")
+        return
+    cols = st.columns(4)
+    cols[0].metric("Overall", f"{score.overall:.0%}")
+    cols[1].metric("Completeness", f"{score.completeness:.0%}")
+    cols[2].metric("Specificity", f"{score.specificity:.0%}")
+    cols[3].metric("Consistency", f"{score.consistency:.0%}")
+    if score.missing_fields:
+        st.caption("Missing: " + ", ".join(name.replace("_", " ") for name in score.missing_fields))
+    for issue in score.salary_issues:
+        st.warning(f"Salary: {issue}")
+    if score.vague_tasks:
+        st.warning("Vague tasks: " + "; ".join(score.vague_tasks))
+    if score.uncovered_skills:
+        st.info("Skills not reflected in any task: " + ", ".join(score.uncovered_skills))
+
+
+@fragment
+def downloads_section(locale: str, use_llm: bool = False):
+    """
+    Download buttons for the job ad and interview guide. A format is only exported when its
+    "Prepare" button is clicked; unchanged profiles are then served from the export cache.
+    :param use_llm: Same as the on-screen guide: AI-written questions for skills without vetted ones.
+    """
+    st.markdown("### Downloads")
+    profile = get_profile()
+    columns = st.columns(len(EXPORT_FORMATS))
+    for column, (fmt, (_, mime, _)) in zip(columns, EXPORT_FORMATS.items()):
+        with column:
+            state_key = f"export_ready_{fmt}"
+            version = export_key(profile, fmt, locale, use_llm)
+            if st.session_state.get(state_key) != version:
+                if not st.button(f"Prepare {fmt.upper()}", key=f"prepare_{fmt}"):
+                    continue
+                st.session_state[state_key] = version
+            try:
+                path = export_profile(profile, fmt, locale, use_llm)
+            except Exception as e:
+                st.session_state.pop(state_key, None)
+                st.caption(f"{fmt.upper()} unavailable: {e}")
+                continue
+            # The button streams the cached file instead of a copy held in session state
+            with open(path, "rb") as file:
+                st.download_button(
+                    f"⬇️ {fmt.upper()}", data=file, file_name=export_filename(profile, fmt), mime=mime,
+                    key=f"download_{fmt}",
+                )
+
+
+def _save_profile():
+    """on_click callback: store the profile; saving again updates the same record."""
+    try:
+        profile_id = get_profile_repository().save(
+            get_profile(), current_tenant_id(), st.session_state.get("saved_profile_id")
+        )
+        st.session_state["saved_profile_id"] = profile_id
+        store_in_state("save_message", ("success", "Profile saved."))
+    except Exception as e:
+        store_in_state("save_message", ("error", f"Saving the profile failed: {e}"))
+
+
+###############################################################################
+# PAGE REGISTRY
+###############################################################################
+
+PAGES = {spec.step: spec for spec in (
+    PageSpec(1, "Start Discovery", start_discovery_page, fields=("job_title", "input_url")),
+    PageSpec(
+        2, "Company", company_information_page,
+        fields=("company_name", "location", "company_website", "company_mission", "industry", "company_size"),
+    ),
+    PageSpec(
+        3, "Department", department_information_page,
+        fields=("department", "team_size", "direct_supervisor", "technologies_used", "department_culture"),
+    ),
+    PageSpec(
+        4, "Role Description", role_description_page,
+        fields=("job_reason", "responsibility_distribution", "tasks", "job_challenges", "remote_policy"),
+        requires=("job_title",),
+        prefetch=(
+            PrefetchTask("suggestions.responsibility_distribution", generate_responsibilities, ("job_title",), {"count": 8}),
+            PrefetchTask("suggestions.tasks", generate_key_tasks, ("job_title",), {"count": 8}),
+        ),
+    ),
+    PageSpec(5, "Task Scope", task_scope_page, fields=("tasks", "autonomy_level")),
+    PageSpec(
+        6, "Skills", skills_competencies_page,
+        fields=SKILL_FIELDS,
+        requires=("job_title",),
+        prefetch=(PrefetchTask("suggestions.must_have_hard", generate_skills, ("job_title",), {"count": 10}),),
+    ),
+    PageSpec(
+        7, "Benefits & Compensation", benefits_compensation_page,
+        fields=("min_salary", "max_salary", "salary_range", "benefits"),
+        requires=("job_title",),
+        prefetch=(PrefetchTask("suggestions.benefits", generate_benefits, ("job_title",), {"count": 10}),),
+    ),
+    PageSpec(
+        8, "Recruitment Process", recruitment_process_page,
+        fields=("interview_stages", "application_timeline", "required_documents", "approval_flow"),
+    ),
+    PageSpec(9, "Summary & Outputs", summary_outputs_page, requires=("job_title",)),
+)}
+
+# Background suggestion work triggered by job-title changes on page 1 (same jobs as the page prefetch)
+SUGGESTION_TASKS = tuple(task for spec in PAGES.values() for task in spec.prefetch if task.key.startswith("suggestions."))
+SUGGESTION_DEBOUNCE = float(os.getenv("SUGGESTION_DEBOUNCE", "1.5"))
@@ -0,0 +1,184 @@
+# models/job_profile.py
+
+import json
+import re
+from dataclasses import dataclass, field, fields
+from typing import Dict, Iterable, List, Optional, Set
+
+_SPLIT_ITEMS = re.compile(r"[,\n]")
+_UNSET = object()
+
+def _as_list(value) -> List[str]:
+    """Coerce strings (comma/newline separated), sets and other iterables to a de-duplicated list."""
+    if value is None:
+        return []
+    if isinstance(value, str):
+        value = _SPLIT_ITEMS.split(value)
+    items = []
+    for item in value:
+        item = str(item).strip()
+        if item and item not in items:
+            items.append(item)
+    return items
+
+@dataclass(slots=True)
+class JobProfile:
+    """
+    Typed job profile collected by the wizard; the single source for pages and generators.
+    Scalar fields default to None ("not provided yet"), list fields to an empty list.
+    Every assignment that changes a value is recorded in dirty_fields, so persistence can
+    skip unchanged profiles and only pages depending on changed fields need recomputation.
+    """
+    _dirty: Set[str] = field(default_factory=set, init=False, repr=False, compare=False)
+
+    # Start discovery
+    job_title: Optional[str] = None
+    input_url: Optional[str] = None
+    # Company
+    company_name: Optional[str] = None
+    location: Optional[str] = None
+    place_of_work_confirmed: Optional[bool] = None
+    fully_remote: Optional[bool] = None
+    alternate_work_address: Optional[str] = None
+    company_website: Optional[str] = None
+    company_mission: Optional[str] = None
+    industry: Optional[str] = None
+    company_size: Optional[str] = None
+    # Department
+    department: Optional[str] = None
+    team_size: Optional[int] = None
+    direct_supervisor: Optional[str] = None
+    supervisor_email: Optional[str] = None
+    department_strategy: Optional[str] = None
+    department_challenges: Optional[str] = None
+    technologies_used: List[str] = field(default_factory=list)
+    department_culture: Optional[str] = None
+    department_collaborations: List[str] = field(default_factory=list)
+    # Role
+    job_reason: List[str] = field(default_factory=list)
+    responsibility_distribution: List[str] = field(default_factory=list)
+    responsibilities: List[str] = field(default_factory=list)
+    tasks: List[str] = field(default_factory=list)
+    job_challenges: List[str] = field(default_factory=list)
+    travel_required_flag: Optional[str] = None
+    travel_required: Optional[str] = None
+    remote_policy: Optional[str] = None
+    autonomy_level: Optional[str] = None
+    # Skills
+    skills: List[str] = field(default_factory=list)
+    must_have_hard: List[str] = field(default_factory=list)
+    must_have_soft: List[str] = field(default_factory=list)
+    nice_have_hard: List[str] = field(default_factory=list)
+    nice_have_soft: List[str] = field(default_factory=list)
+    # Compensation
+    min_salary: Optional[int] = None
+    max_salary: Optional[int] = None
+    salary_range: Optional[str] = None
+    benefits: List[str] = field(default_factory=list)
+    # Recruitment process
+    need_name: Optional[str] = None
+    need_email: Optional[str] = None
+    authority_name: Optional[str] = None
+    authority_email: Optional[str] = None
+    money_name: Optional[str] = None
+    money_email: Optional[str] = None
+    required_documents: Optional[str] = None
+    approval_flow: Optional[str] = None
+    interview_stages: Optional[int] = None
+    application_timeline: Optional[str] = None
+    application_process: Optional[str] = None
+
+    def __post_init__(self):
+        self._dirty.clear()
+
+    def __setattr__(self, name: str, value):
+        if name in LIST_FIELDS:
+            value = _as_list(value)
+        try:
+            dirty = object.__getattribute__(self, "_dirty")
+        except AttributeError:
+            dirty = None  # still inside __init__
+        if dirty is not None and name in _PROFILE_FIELD_SET and getattr(self, name, _UNSET) != value:
+            dirty.add(name)
+        object.__setattr__(self, name, value)
+
+    @property
+    def dirty_fields(self) -> Set[str]:
+        """Names of the fields changed since the last mark_clean()."""
+        return set(self._dirty)
+
+    @property
+    def is_dirty(self) -> bool:
+        return bool(self._dirty)
+
+    def mark_clean(self):
+        self._dirty.clear()
+
+    def add_items(self, name: str, items: Iterable[str]) -> bool:
+        """
+        Append items to a list field, skipping blanks and duplicates.
+        :return: True if the field changed.
+        """
+        current = getattr(self, name)
+        added = [item for item in _as_list(items) if item not in current]
+        if added:
+            current.extend(added)
+            self._dirty.add(name)
+        return bool(added)
+
+    def remove_items(self, name: str, items: Iterable[str]) -> bool:
+        """
+        Remove items from a list field.
+        :return: True if the field changed.
+        """
+        drop = set(items)
+        current = getattr(self, name)
+        kept = [item for item in current if item not in drop]
+        changed = len(kept) != len(current)
+        if changed:
+            current[:] = kept
+            self._dirty.add(name)
+        return changed
+
+    def to_dict(self, names: Optional[Iterable[str]] = None) -> Dict:
+        """
+        Return the provided (non-None) fields as a plain dict.
+        :param names: Optional subset of field names to include.
+        """
+        out = {}
+        for name in (PROFILE_FIELDS if names is None else names):
+            value = getattr(self, name)
+            if value is not None:
+                out[name] = list(value) if name in LIST_FIELDS else value
+        return out
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "JobProfile":
+        """Build a profile from a dict, ignoring unknown keys."""
+        return cls(**{k: v for k, v in data.items() if k in _PROFILE_FIELD_SET})
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), ensure_ascii=False, separators=(",", ":"))
+
+    @classmethod
+    def from_json(cls, raw) -> "JobProfile":
+        return cls.from_dict(json.loads(raw))
+
+    def to_msgpack(self) -> bytes:
+        try:
+            import msgpack
+        except ImportError:
+            raise ImportError("Please install 'msgpack' to use msgpack serialization.")
+        return msgpack.packb(self.to_dict(), use_bin_type=True)
+
+    @classmethod
+    def from_msgpack(cls, raw: bytes) -> "JobProfile":
+        try:
+            import msgpack
+        except ImportError:
+            raise ImportError("Please install 'msgpack' to use msgpack serialization.")
+        return cls.from_dict(msgpack.unpackb(raw, raw=False))
+
+PROFILE_FIELDS = tuple(f.name for f in fields(JobProfile) if not f.name.startswith("_"))
+LIST_FIELDS = frozenset(f.name for f in fields(JobProfile) if f.type == List[str])
+_PROFILE_FIELD_SET = frozenset(PROFILE_FIELDS)
@@ -1,5 +1,5 @@
 import streamlit as st
-from src.utils.ui import apply_base_styling
+from utils.ui_utils import apply_base_styling
 
 st.set_page_config(page_title="How It Works - Vacalyser", layout="wide")
 apply_base_styling()
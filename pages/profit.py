@@ -1,5 +1,5 @@
 import streamlit as st
-from src.utils.ui import apply_base_styling
+from utils.ui_utils import apply_base_styling
 import matplotlib.pyplot as plt
 import math
 
@@ -0,0 +1,141 @@
+# services/ad_writer.py
+
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from services.llm_cache import LLMCache, get_llm_cache
+
+# Bump when prompts change, so cached sections written with old prompts aren't reused
+PROMPT_VERSION = 1
+LANGUAGES = {"en": "English", "de": "German"}
+SYSTEM_MESSAGE = (
+    "You are an expert recruitment copywriter. You write one section of a job ad at a time. "
+    "Use only the facts given, write in markdown, and return the section text only."
+)
+
+@dataclass(frozen=True)
+class AdSection:
+    """
+    One independently generated part of a job ad.
+    :param name: Section id.
+    :param fields: Profile fields the section is written from; the cache key is a hash of their values.
+    :param instruction: What to write; formatted with the field values.
+    :param required: Fields that must be non-empty for the section to appear.
+    :param max_tokens: Length limit for the section.
+    """
+    name: str
+    fields: Tuple[str, ...]
+    instruction: str
+    required: Tuple[str, ...] = ()
+    max_tokens: int = 200
+
+SECTIONS: Tuple[AdSection, ...] = (
+    AdSection(
+        "intro", ("job_title", "company_name", "location", "remote_policy"),
+        "Write an engaging 2-3 sentence opening inviting candidates to join {company_name} as {job_title} "
+        "(location: {location}; remote policy: {remote_policy}).",
+        required=("job_title",),
+    ),
+    AdSection(
+        "mission", ("company_name", "company_mission"),
+        "Write a short paragraph titled 'Our Mission' about {company_name}'s mission: {company_mission}",
+        required=("company_mission",),
+    ),
+    AdSection(
+        "responsibilities", ("job_title", "responsibility_distribution"),
+        "Write a 'Key Responsibilities' section (heading plus bullet list) for a {job_title} from these points:\n"
+        "{responsibility_distribution}",
+        required=("responsibility_distribution",), max_tokens=300,
+    ),
+    AdSection(
+        "tasks", ("job_title", "tasks"),
+        "Write a 'Core Tasks' section (heading plus bullet list) for a {job_title} from these tasks:\n{tasks}",
+        required=("tasks",), max_tokens=300,
+    ),
+    AdSection(
+        "benefits", ("company_name", "benefits"),
+        "Write a 'Benefits & Perks' section (heading plus bullet list) presenting what {company_name} offers:\n{benefits}",
+        required=("benefits",), max_tokens=300,
+    ),
+    AdSection(
+        "salary", ("salary_range",),
+        "Write one sentence stating the salary range {salary_range} and inviting candidates to apply.",
+        required=("salary_range",), max_tokens=80,
+    ),
+)
+
+@dataclass
+class AdDraft:
+    """An LLM-written job ad, section by section."""
+    sections: Dict[str, str] = field(default_factory=dict)
+    regenerated: List[str] = field(default_factory=list)  # sections not served from the cache
+
+    @property
+    def text(self) -> str:
+        return "\n\n".join(text for text in self.sections.values() if text)
+
+def _value_text(value) -> str:
+    if isinstance(value, (list, tuple)):
+        return "\n".join(f"- {item}" for item in value)
+    return "" if value is None else str(value)
+
+def _section_inputs(section: AdSection, profile) -> Dict:
+    get = profile.get if isinstance(profile, dict) else (lambda name: getattr(profile, name, None))
+    return {name: get(name) for name in section.fields}
+
+def section_key(section: AdSection, inputs: Dict, locale: str, model: str) -> str:
+    """Cache key of a section: hash of its input field values (plus prompt version, language and model)."""
+    return LLMCache.make_key("ad_section", PROMPT_VERSION, section.name, locale, model, inputs)
+
+def write_ad(profile, locale: str = "en", llm=None, cache: Optional[LLMCache] = None, force: Tuple[str, ...] = ()) -> AdDraft:
+    """
+    Write a job ad with the LLM, one section at a time. Each section is cached under a hash of only
+    the fields it uses, so after editing one benefit just the benefits section is regenerated.
+    Missing sections are generated concurrently.
+    :param profile: JobProfile or dict of profile fields.
+    :param locale: Output language ("en", "de").
+    :param llm: LLMService (default: the shared service).
+    :param cache: LLMCache (default: the shared on-disk cache).
+    :param force: Section names to regenerate even if cached.
+    """
+    if llm is None:
+        from services.llm_service import get_llm_service
+        llm = get_llm_service()
+    cache = cache or get_llm_cache()
+    model = llm.openai_model if llm.provider == "openai" else llm.provider
+    language = LANGUAGES.get(locale, locale)
+
+    draft = AdDraft()
+    todo = []
+    for section in SECTIONS:
+        inputs = _section_inputs(section, profile)
+        if any(not inputs.get(name) for name in section.required):
+            continue
+        key = section_key(section, inputs, locale, model)
+        cached = None if section.name in force else cache.get(key)
+        draft.sections[section.name] = cached
+        if cached is None:
+            todo.append((section, inputs, key))
+
+    def generate(section: AdSection, inputs: Dict, key: str) -> str:
+        prompt = section.instruction.format(**{name: _value_text(value) for name, value in inputs.items()})
+        text = llm.complete(
+            prompt=f"{prompt}\nWrite in {language}.",
+            system_message=SYSTEM_MESSAGE,
+            temperature=0.7,
+            max_tokens=section.max_tokens,
+        ).strip()
+        cache.put(key, text)
+        return text
+
+    if todo:
+        with ThreadPoolExecutor(max_workers=len(todo), thread_name_prefix="ad-writer") as pool:
+            futures = [(section.name, pool.submit(generate, section, inputs, key)) for section, inputs, key in todo]
+            for name, future in futures:
+                try:
+                    draft.sections[name] = future.result()
+                except Exception as e:
+                    raise RuntimeError(f"Writing the '{name}' section failed: {e}")
+                draft.regenerated.append(name)
+    return draft
@@ -0,0 +1,195 @@
+# services/batch_analysis.py
+
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from services.file_parser import SESSION_KEYS, extract_keys, parse_file
+from services.salary_extraction import extract_salary
+from services.skill_taxonomy import get_skill_taxonomy
+from utils.misc_utils import extract_bullet_points
+
+SUPPORTED_EXTENSIONS = (".pdf", ".docx", ".txt")
+
+class ThroughputStats:
+    """Counts processed items and bytes for a batch run and reports rates at the end."""
+
+    def __init__(self, label: str = "batch"):
+        self.label = label
+        self.items = 0
+        self.errors = 0
+        self.bytes = 0
+        self.started = time.perf_counter()
+
+    def add(self, nbytes: int = 0, error: bool = False):
+        self.items += 1
+        self.bytes += nbytes
+        if error:
+            self.errors += 1
+
+    @property
+    def elapsed(self) -> float:
+        return max(time.perf_counter() - self.started, 1e-9)
+
+    def summary(self) -> str:
+        return (
+            f"[{self.label}] {self.items} items ({self.errors} errors) in {self.elapsed:.2f}s — "
+            f"{self.items / self.elapsed:.1f} items/s, {self.bytes / self.elapsed / 1e6:.2f} MB/s"
+        )
+
+def analyze_text(text: str) -> Dict:
+    """
+    Run the wizard's source analysis on a text without touching st.session_state.
+    :param text: Parsed job-ad text.
+    :return: Dict with the matched session keys ("fields"), extracted bullet points ("tasks")
+             the advertised salary ("salary", see extract_salary) and the canonical ids of the
+             skills mentioned ("skills", see SkillTaxonomy.extract).
+    """
+    return {
+        "fields": extract_keys(text, SESSION_KEYS),
+        "tasks": extract_bullet_points(text),
+        "salary": extract_salary(text),
+        "skills": [match.skill.id for match in get_skill_taxonomy().extract(text)],
+    }
+
+def _record_size(record: Dict) -> int:
+    if "text" in record:
+        return len((record["text"] or "").encode("utf-8"))
+    try:
+        return os.path.getsize(record["path"])
+    except (KeyError, OSError):
+        return 0
+
+def analyze_record(record: Dict) -> Dict:
+    """
+    Analyze one input record. Records carry either a "path" to a job-ad file or inline "text".
+    Errors are reported in the result instead of raised, so one bad file doesn't stop a batch.
+    """
+    result = {
+        "id": record.get("id"),
+        "source": record.get("path", "<inline>"),
+        "bytes": _record_size(record),
+        "chars": 0,
+        "error": None,
+    }
+    try:
+        if "text" in record:
+            text = record["text"] or ""
+        elif "path" in record:
+            text = parse_file(record["path"])
+        else:
+            raise ValueError("Record needs a 'path' or 'text' field.")
+        result["chars"] = len(text)
+        result.update(analyze_text(text))
+    except Exception as e:
+        result["error"] = f"{type(e).__name__}: {e}"
+        result.update({"fields": {}, "tasks": [], "salary": None, "skills": []})
+    return result
+
+def iter_directory(directory: Path, recursive: bool = True) -> Iterator[Dict]:
+    """Yield one input record per supported job-ad file in a directory."""
+    pattern = "**/*" if recursive else "*"
+    for path in sorted(Path(directory).glob(pattern)):
+        if path.is_file() and path.suffix.lower() in SUPPORTED_EXTENSIONS:
+            yield {"id": str(path.relative_to(directory)), "path": str(path)}
+
+def iter_jsonl(stream) -> Iterator[Dict]:
+    """Yield input records from a JSONL stream (one object per line with "path" or "text")."""
+    for line_no, line in enumerate(stream, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        record = json.loads(line)
+        record.setdefault("id", str(line_no))
+        yield record
+
+def run_batch(records: Iterable[Dict], workers: Optional[int] = None, max_in_flight: Optional[int] = None) -> Iterator[Dict]:
+    """
+    Analyze records in parallel worker processes, yielding results as they complete.
+    Submission is bounded so arbitrarily long input streams are never fully materialized.
+    :param records: Input records (see analyze_record).
+    :param workers: Number of worker processes (default: CPU count).
+    :param max_in_flight: Maximum submitted but unfinished records (default: 4 per worker).
+    """
+    workers = workers or os.cpu_count() or 1
+    max_in_flight = max_in_flight or workers * 4
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        in_flight = set()
+        for record in records:
+            in_flight.add(executor.submit(analyze_record, record))
+            if len(in_flight) >= max_in_flight:
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+        for future in in_flight:
+            yield future.result()
+
+class JsonlResultWriter:
+    def __init__(self, path: Optional[Path]):
+        """Write results as JSON lines to a file, or to stdout if path is None."""
+        self._file = open(path, "w", encoding="utf-8") if path else sys.stdout
+        self._owns_file = path is not None
+
+    def write(self, result: Dict):
+        self._file.write(json.dumps(result, ensure_ascii=False) + "\n")
+
+    def close(self):
+        if self._owns_file:
+            self._file.close()
+        else:
+            self._file.flush()
+
+class ParquetResultWriter:
+    def __init__(self, path: Path, batch_size: int = 1000):
+        """
+        Write results to a Parquet file in row groups of batch_size, flattening the matched fields
+        into one column per session key.
+        """
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("Please install 'pyarrow' to write Parquet output.")
+        self._pa = pa
+        self._schema = pa.schema(
+            [("id", pa.string()), ("source", pa.string()), ("bytes", pa.int64()), ("chars", pa.int64()), ("error", pa.string())]
+            + [(key, pa.string()) for key in SESSION_KEYS]
+            + [("tasks", pa.list_(pa.string())), ("skills", pa.list_(pa.string()))]
+            + [("salary_min", pa.float64()), ("salary_max", pa.float64()), ("salary_currency", pa.string())]
+        )
+        self._writer = pq.ParquetWriter(str(path), self._schema)
+        self._batch_size = batch_size
+        self._rows: List[Dict] = []
+
+    def write(self, result: Dict):
+        row = {k: result.get(k) for k in ("id", "source", "bytes", "chars", "error", "tasks", "skills")}
+        for key in SESSION_KEYS:
+            row[key] = result.get("fields", {}).get(key)
+        salary = result.get("salary") or {}
+        row["salary_min"], row["salary_max"], row["salary_currency"] = salary.get("min"), salary.get("max"), salary.get("currency")
+        self._rows.append(row)
+        if len(self._rows) >= self._batch_size:
+            self._flush()
+
+    def _flush(self):
+        if self._rows:
+            self._writer.write_table(self._pa.Table.from_pylist(self._rows, schema=self._schema))
+            self._rows = []
+
+    def close(self):
+        self._flush()
+        self._writer.close()
+
+def open_result_writer(path: Optional[Path], fmt: str = "jsonl"):
+    """Return a writer for the requested output format ("jsonl" or "parquet")."""
+    if fmt == "parquet":
+        if path is None:
+            raise ValueError("Parquet output requires an output file.")
+        return ParquetResultWriter(path)
+    if fmt == "jsonl":
+        return JsonlResultWriter(path)
+    raise ValueError(f"Unsupported output format: {fmt}")
@@ -0,0 +1,216 @@
+# services/batch_generation.py
+
+import json
+import os
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from models.job_profile import JobProfile
+from services.batch_analysis import ThroughputStats
+from services.llm_cache import LLMCache, get_llm_cache
+from services.template_engine import DEFAULT_LOCALE, get_template
+
+POLISH_SYSTEM_MESSAGE = (
+    "You are an expert recruitment copywriter. Improve the wording of job ads while keeping every fact, "
+    "the language and the formatting (markdown or HTML) of the input."
+)
+POLISH_PROMPT = "Polish this job ad. Return only the improved ad.\n\n{ad}"
+
+def iter_profiles_jsonl(stream) -> Iterator[Tuple[str, Dict]]:
+    """Yield (id, profile fields) from a JSONL stream of profiles; ids default to the line number."""
+    for line_no, line in enumerate(stream, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        data = json.loads(line)
+        profile = data.get("profile", data)
+        yield str(data.get("id", line_no)), profile
+
+def iter_repository_profiles(tenant_id: str, query: str = "", page_size: int = 500) -> Iterator[Tuple[str, Dict]]:
+    """Yield (id, profile fields) of a tenant's saved profiles, optionally filtered by a search query."""
+    from services.profile_repository import get_profile_repository
+
+    repo = get_profile_repository()
+    page = 1
+    while True:
+        rows, total = repo.search(tenant_id, query, page=page, page_size=page_size, include_payload=True)
+        for row in rows:
+            yield str(row["id"]), JobProfile.from_json(row["payload"]).to_dict()
+        if page * page_size >= total or not rows:
+            break
+        page += 1
+
+def render_chunk(chunk: List[Tuple[str, Dict]], locale: str = DEFAULT_LOCALE, fmt: str = "markdown") -> List[Dict]:
+    """
+    Render the job ad template for a chunk of profiles (runs in worker processes).
+    Errors are reported per profile instead of raised.
+    """
+    template = get_template("job_ad", locale, fmt)
+    results = []
+    for profile_id, data in chunk:
+        result = {"id": profile_id, "locale": locale, "format": fmt, "ad": None, "error": None}
+        try:
+            result["ad"] = template.render(JobProfile.from_dict(data))
+        except Exception as e:
+            result["error"] = f"{type(e).__name__}: {e}"
+        results.append(result)
+    return results
+
+def polish_ad(llm, cache: Optional[LLMCache], ad: str, max_tokens: int = 800) -> str:
+    """Let the LLM improve the wording of a rendered ad; identical ads are only sent once."""
+    prompt = POLISH_PROMPT.format(ad=ad)
+    if cache is None:
+        return llm.complete(prompt=prompt, system_message=POLISH_SYSTEM_MESSAGE, temperature=0.4, max_tokens=max_tokens)
+    return cache.complete(llm, prompt, system_message=POLISH_SYSTEM_MESSAGE, temperature=0.4, max_tokens=max_tokens)
+
+def completed_ids(path: Path) -> Set[str]:
+    """
+    Ids successfully written to a JSONL output file (the checkpoint of a previous run); rows with
+    an error are not counted, so a resumed run retries them.
+    A trailing partial line from an interrupted run is cut off so appending continues cleanly.
+    """
+    path = Path(path)
+    if not path.exists():
+        return set()
+    done = set()
+    valid_size = 0
+    with open(path, "rb") as file:
+        for line in file:
+            if not line.endswith(b"\n"):
+                break
+            try:
+                row = json.loads(line)
+                if not row.get("error"):
+                    done.add(str(row["id"]))
+            except (ValueError, KeyError):
+                break
+            valid_size += len(line)
+    if valid_size != path.stat().st_size:
+        with open(path, "r+b") as file:
+            file.truncate(valid_size)
+    return done
+
+def error_output_path(output: Path) -> Path:
+    """Where run_generation writes failed profiles: next to the output, e.g. ads.errors.jsonl."""
+    output = Path(output)
+    return output.with_name(f"{output.stem}.errors{output.suffix or '.jsonl'}")
+
+def _chunks(profiles: Iterable[Tuple[str, Dict]], size: int, skip: Set[str], stats: ThroughputStats) -> Iterator[List]:
+    chunk = []
+    for profile_id, data in profiles:
+        stats.add()
+        if profile_id in skip:
+            continue
+        chunk.append((profile_id, data))
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def run_generation(
+    profiles: Iterable[Tuple[str, Dict]],
+    output: Path,
+    locale: str = DEFAULT_LOCALE,
+    fmt: str = "markdown",
+    workers: Optional[int] = None,
+    chunk_size: int = 200,
+    llm=None,
+    polish_concurrency: int = 4,
+    use_cache: bool = True,
+    resume: bool = False,
+) -> Dict[str, ThroughputStats]:
+    """
+    Render job ads for a stream of profiles and write them to a JSONL file as they complete.
+
+    Stages: read -> render (chunks in worker processes) -> polish (optional LLM rewrite through
+    a bounded thread pool and the on-disk LLM cache) -> write (one flushed line per ad).
+    Failed profiles are written to a separate error file (see error_output_path) instead of the
+    output, so the output only holds finished ads and a resumed run retries the failures.
+    At most a few chunks and polish calls are in flight, so memory stays flat for any input size.
+    :param profiles: (id, profile fields) pairs, e.g. from iter_profiles_jsonl.
+    :param output: JSONL output file; with resume, ids already in it are skipped and new results appended.
+                   The error file is rewritten on every run.
+    :param locale: Template language.
+    :param fmt: Template format ("markdown", "html").
+    :param workers: Render processes (default: CPU count; 0 renders in this process).
+    :param chunk_size: Profiles per render task.
+    :param llm: LLMService for polishing; None skips the polish stage.
+    :param polish_concurrency: Concurrent LLM requests.
+    :param use_cache: Reuse cached LLM answers for identical ads.
+    :param resume: Continue a previous run instead of overwriting the output.
+    :return: Per-stage ThroughputStats ("read", "render", "polish", "write").
+    """
+    output = Path(output)
+    skip = completed_ids(output) if resume else set()
+    stats = {name: ThroughputStats(name) for name in ("read", "render", "polish", "write")}
+    cache = get_llm_cache() if llm is not None and use_cache else None
+    workers = (os.cpu_count() or 1) if workers is None else workers
+    max_render_in_flight = max(workers, 1) * 2
+    max_polish_in_flight = polish_concurrency * 2
+
+    render_pool = ProcessPoolExecutor(max_workers=workers) if workers > 0 else None
+    polish_pool = ThreadPoolExecutor(max_workers=polish_concurrency, thread_name_prefix="polish") if llm is not None else None
+    pending_render: Set[Future] = set()
+    pending_polish: Dict[Future, Dict] = {}
+
+    with open(output, "a" if resume else "w", encoding="utf-8") as out, \
+            open(error_output_path(output), "w", encoding="utf-8") as errors:
+        def write(result: Dict):
+            line = json.dumps(result, ensure_ascii=False) + "\n"
+            target = errors if result["error"] else out
+            target.write(line)
+            target.flush()  # every written line is a checkpoint
+            stats["write"].add(len(line.encode("utf-8")), error=result["error"] is not None)
+
+        def finish_polish(block: bool):
+            if not pending_polish:
+                return
+            done, _ = wait(list(pending_polish), timeout=None if block else 0, return_when=FIRST_COMPLETED)
+            for future in done:
+                result = pending_polish.pop(future)
+                try:
+                    result["ad"] = future.result()
+                    result["polished"] = True
+                except Exception as e:
+                    result["polished"] = False
+                    result["error"] = f"Polishing failed: {e}"
+                stats["polish"].add(len(result["ad"].encode("utf-8")), error=not result["polished"])
+                write(result)
+
+        def handle_rendered(results: List[Dict]):
+            for result in results:
+                stats["render"].add(len((result["ad"] or "").encode("utf-8")), error=result["error"] is not None)
+                if polish_pool is None or result["error"]:
+                    write(result)
+                    continue
+                while len(pending_polish) >= max_polish_in_flight:
+                    finish_polish(block=True)
+                pending_polish[polish_pool.submit(polish_ad, llm, cache, result["ad"])] = result
+            finish_polish(block=False)
+
+        def finish_render(block: bool):
+            done, _ = wait(pending_render, timeout=None if block else 0, return_when=FIRST_COMPLETED)
+            for future in done:
+                pending_render.discard(future)
+                handle_rendered(future.result())
+
+        try:
+            for chunk in _chunks(profiles, chunk_size, skip, stats["read"]):
+                if render_pool is None:
+                    handle_rendered(render_chunk(chunk, locale, fmt))
+                    continue
+                pending_render.add(render_pool.submit(render_chunk, chunk, locale, fmt))
+                if len(pending_render) >= max_render_in_flight:
+                    finish_render(block=True)
+            while pending_render:
+                finish_render(block=True)
+            while pending_polish:
+                finish_polish(block=True)
+        finally:
+            if render_pool is not None:
+                render_pool.shutdown(cancel_futures=True)
+            if polish_pool is not None:
+                polish_pool.shutdown(cancel_futures=True)
+    return stats
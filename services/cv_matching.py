@@ -0,0 +1,282 @@
+# services/cv_matching.py
+
+import heapq
+import re
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from models.job_profile import JobProfile
+from services.file_parser import parse_file
+from services.skill_taxonomy import get_skill_taxonomy
+
+# Requirement field -> weight in the match score
+REQUIREMENT_WEIGHTS: Dict[str, float] = {
+    "must_have_hard": 3.0,
+    "must_have_soft": 1.5,
+    "tasks": 1.0,
+    "nice_have_hard": 1.0,
+    "nice_have_soft": 0.5,
+}
+MUST_HAVE_FIELDS = ("must_have_hard", "must_have_soft")
+# Cosine similarity from which a CV passage counts as evidence for a requirement
+MATCH_THRESHOLD = 0.5
+# Similarities below the floor add nothing to the score; unrelated texts rarely score much lower
+SIMILARITY_FLOOR = 0.2
+# A CV is split into passages of at most this many words; longer CVs keep their first MAX_PASSAGES
+PASSAGE_WORDS = 60
+MIN_PASSAGE_WORDS = 3
+MAX_PASSAGES = 200
+EVIDENCE_CHARS = 240
+
+_SENTENCE_END = re.compile(r"(?<=[.!?;])\s+")
+
+@dataclass
+class Requirement:
+    text: str
+    kind: str
+    weight: float
+    skill_id: Optional[str] = None
+
+@dataclass
+class RequirementEvidence:
+    """
+    How well a CV meets one requirement.
+    :param similarity: Best cosine similarity of a CV passage (1.0 if the CV names the canonical skill).
+    :param evidence: The best-matching CV passage.
+    """
+    requirement: str
+    kind: str
+    similarity: float
+    met: bool
+    evidence: str
+
+@dataclass
+class CandidateMatch:
+    """
+    A CV ranked against a job profile.
+    :param score: Weighted requirement similarity between 0 and 1.
+    :param must_have_coverage: Share of must-have requirements met; None without must-haves.
+    """
+    cv_id: str
+    score: float
+    must_have_coverage: Optional[float]
+    requirements_met: int
+    requirements: List[RequirementEvidence] = field(default_factory=list)
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+def split_passages(text: str) -> List[str]:
+    """
+    Split a CV into passages for embedding: lines, further split into sentences when longer than
+    PASSAGE_WORDS, with consecutive short lines (e.g. a job title and its dates) merged.
+    """
+    passages: List[str] = []
+    pending: List[str] = []
+    for line in (text or "").splitlines():
+        words = line.split()
+        if not words:
+            continue
+        if len(words) > PASSAGE_WORDS:
+            for sentence in _SENTENCE_END.split(" ".join(words)):
+                sentence_words = sentence.split()
+                for i in range(0, len(sentence_words), PASSAGE_WORDS):
+                    passages.append(" ".join(sentence_words[i:i + PASSAGE_WORDS]))
+            continue
+        pending.extend(words)
+        if len(pending) >= MIN_PASSAGE_WORDS:
+            passages.append(" ".join(pending))
+            pending = []
+    if pending:
+        passages.append(" ".join(pending))
+    return list(dict.fromkeys(p for p in passages if len(p.split()) >= MIN_PASSAGE_WORDS))[:MAX_PASSAGES]
+
+def job_requirements(profile) -> List[Requirement]:
+    """The tasks and skills of a job profile as weighted requirements (skills resolved to the taxonomy)."""
+    profile = profile if isinstance(profile, JobProfile) else JobProfile.from_dict(profile)
+    taxonomy = get_skill_taxonomy()
+    requirements: List[Requirement] = []
+    seen = set()
+    for kind, weight in REQUIREMENT_WEIGHTS.items():
+        for text in getattr(profile, kind):
+            text = text.strip()
+            if not text or text.lower() in seen:
+                continue
+            seen.add(text.lower())
+            skill_id = None
+            if kind != "tasks":
+                matches = taxonomy.lookup(text)
+                skill_id = matches[0].skill.id if len(matches) == 1 else None
+            requirements.append(Requirement(text, kind, weight, skill_id))
+    return requirements
+
+def parse_cv(record: Dict) -> Dict:
+    """
+    Read one CV record ({"id", "path"} or {"id", "text"}) into {"id", "text", "error"}.
+    Errors are reported instead of raised, so one unreadable file doesn't stop a batch.
+    """
+    try:
+        text = record["text"] if "text" in record else parse_file(record["path"])
+        return {"id": record.get("id") or record.get("path"), "text": text or "", "error": None}
+    except Exception as e:
+        return {"id": record.get("id") or record.get("path"), "text": "", "error": f"{type(e).__name__}: {e}"}
+
+def iter_cv_texts(records: Iterable[Dict], workers: Optional[int] = None, chunk_size: int = 16) -> Iterator[Dict]:
+    """
+    Parse CV records in worker processes (workers=0: in-process), in input order.
+    :param records: Records as produced by batch_analysis.iter_directory or iter_jsonl.
+    """
+    if workers == 0:
+        yield from map(parse_cv, records)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        yield from executor.map(parse_cv, records, chunksize=chunk_size)
+
+def _mentions(texts: Sequence[str], requirements: List[Requirement]) -> Tuple[np.ndarray, List[Dict[str, str]]]:
+    """
+    CVs x requirements: True where the CV names the requirement's canonical skill,
+    plus the mentioned skills of each CV (skill id -> text as written).
+    """
+    taxonomy = get_skill_taxonomy()
+    columns: Dict[str, List[int]] = {}
+    for j, requirement in enumerate(requirements):
+        if requirement.skill_id:
+            columns.setdefault(requirement.skill_id, []).append(j)
+    mentioned = np.zeros((len(texts), len(requirements)), dtype=bool)
+    terms: List[Dict[str, str]] = [{} for _ in texts]
+    if columns:
+        for i, text in enumerate(texts):
+            for match in taxonomy.extract(text):
+                if match.skill.id in columns:
+                    mentioned[i, columns[match.skill.id]] = True
+                    terms[i][match.skill.id] = match.term
+    return mentioned, terms
+
+def _embedding_similarity(passages: List[List[str]], requirement_vectors: np.ndarray, rag) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Best passage similarity per (CV, requirement) and the index of that passage.
+    All passages of the batch are embedded in one call and compared with all requirements in one
+    matrix product; the rows are then laid out as CVs x passages x requirements (padded to the
+    longest CV) so the best passage per CV is a single argmax.
+    """
+    n, r = len(passages), len(requirement_vectors)
+    longest = max((len(p) for p in passages), default=0)
+    if not longest:
+        return np.zeros((n, r), dtype=np.float32), np.zeros((n, r), dtype=np.int64)
+    vectors = rag.embed([passage for cv in passages for passage in cv])
+    lengths = np.fromiter((len(p) for p in passages), dtype=np.int64, count=n)
+    mask = np.arange(longest) < lengths[:, None]
+    similarity = np.full((n, longest, r), -1.0, dtype=np.float32)
+    similarity[mask] = vectors @ requirement_vectors.T
+    best = similarity.argmax(axis=1)
+    return np.take_along_axis(similarity, best[:, None, :], axis=1)[:, 0, :], best
+
+def _lexical_similarity(passages: List[List[str]], requirements: List[Requirement]) -> Tuple[np.ndarray, np.ndarray]:
+    """Fallback without an embedding model: 1.0 where a passage contains the requirement text."""
+    similarity = np.zeros((len(passages), len(requirements)), dtype=np.float32)
+    best = np.zeros((len(passages), len(requirements)), dtype=np.int64)
+    needles = [requirement.text.lower() for requirement in requirements]
+    for i, cv in enumerate(passages):
+        lowered = [passage.lower() for passage in cv]
+        for j, needle in enumerate(needles):
+            hit = next((k for k, passage in enumerate(lowered) if needle in passage), None)
+            if hit is not None:
+                similarity[i, j], best[i, j] = 1.0, hit
+    return similarity, best
+
+def _match_batch(
+    cvs: List[Tuple[str, str]], requirements: List[Requirement], requirement_vectors: Optional[np.ndarray], rag
+) -> List[CandidateMatch]:
+    texts = [text for _, text in cvs]
+    passages = [split_passages(text) for text in texts]
+    if requirement_vectors is not None:
+        similarity, best = _embedding_similarity(passages, requirement_vectors, rag)
+    else:
+        similarity, best = _lexical_similarity(passages, requirements)
+    mentioned, mention_terms = _mentions(texts, requirements)
+    similarity = np.where(mentioned, 1.0, np.clip(similarity, 0.0, 1.0))
+
+    weights = np.array([requirement.weight for requirement in requirements])
+    must = np.array([requirement.kind in MUST_HAVE_FIELDS for requirement in requirements])
+    met = similarity >= MATCH_THRESHOLD
+    relevance = np.clip((similarity - SIMILARITY_FLOOR) / (1.0 - SIMILARITY_FLOOR), 0.0, 1.0)
+    scores = relevance @ weights / weights.sum()
+    must_coverage = met[:, must].mean(axis=1) if must.any() else None
+
+    results = []
+    for i, (cv_id, _) in enumerate(cvs):
+        evidence = []
+        for j, requirement in enumerate(requirements):
+            if mentioned[i, j]:
+                passage = mention_terms[i][requirement.skill_id]
+            else:
+                passage = passages[i][best[i, j]] if passages[i] and similarity[i, j] > 0 else ""
+            evidence.append(RequirementEvidence(
+                requirement=requirement.text,
+                kind=requirement.kind,
+                similarity=round(float(similarity[i, j]), 3),
+                met=bool(met[i, j]),
+                evidence=passage[:EVIDENCE_CHARS],
+            ))
+        results.append(CandidateMatch(
+            cv_id=cv_id,
+            score=round(float(scores[i]), 4),
+            must_have_coverage=round(float(must_coverage[i]), 3) if must_coverage is not None else None,
+            requirements_met=int(met[i].sum()),
+            requirements=evidence,
+        ))
+    return results
+
+def _default_rag():
+    try:
+        from services.rag_service import get_optional_rag_service
+    except ImportError:
+        return None
+    return get_optional_rag_service()
+
+def match_cvs(
+    profile, cvs: Iterable[Tuple[str, str]], rag=None, use_embeddings: bool = True,
+    batch_size: int = 256, top_k: Optional[int] = None,
+) -> List[CandidateMatch]:
+    """
+    Rank CVs against the tasks and skills of a job profile.
+    CVs are processed batch by batch: each batch is split into passages, embedded in one call
+    (through the embedding cache, so re-ranking the same CVs for another job embeds nothing) and
+    compared with all requirements as one CVs x passages x requirements similarity tensor.
+    A CV naming a requirement's canonical skill always meets it.
+    :param profile: JobProfile or dict of profile fields.
+    :param cvs: Stream of (CV id, CV text).
+    :param rag: RAGService (default: the shared service if the embedding model can be loaded,
+                otherwise requirements are matched by text).
+    :param use_embeddings: False always matches requirements by text.
+    :param batch_size: CVs compared per vectorized batch.
+    :param top_k: Return only the best k candidates.
+    :return: Candidates ordered by score, best first.
+    """
+    requirements = job_requirements(profile)
+    if not requirements:
+        raise ValueError("The job profile has no tasks or skills to match CVs against.")
+    if use_embeddings and rag is None:
+        rag = _default_rag()
+    requirement_vectors = rag.embed([r.text for r in requirements]) if use_embeddings and rag is not None else None
+
+    results: List[CandidateMatch] = []
+    batch: List[Tuple[str, str]] = []
+
+    def flush():
+        results.extend(_match_batch(batch, requirements, requirement_vectors, rag))
+        if top_k and len(results) > top_k:
+            results[:] = heapq.nlargest(top_k, results, key=lambda match: match.score)
+
+    for item in cvs:
+        batch.append(item)
+        if len(batch) >= batch_size:
+            flush()
+            batch = []
+    if batch:
+        flush()
+    results.sort(key=lambda match: match.score, reverse=True)
+    return results
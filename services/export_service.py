@@ -0,0 +1,285 @@
+# services/export_service.py
+
+import hashlib
+import html
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+import zipfile
+from pathlib import Path
+from typing import BinaryIO, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from models.job_profile import JobProfile
+from services.generation_service import generate_interview_guide, generate_job_ad
+from services.question_bank import DEFAULT_BANK_PATH
+from services.template_engine import DEFAULT_LOCALE, template_path
+
+EXPORT_CACHE_DIR = Path(os.getenv("EXPORT_CACHE_DIR", Path.home() / ".cache" / "vacalyser" / "exports"))
+# Cached exports not used for this long are removed; beyond the size limit the least recently used go first
+EXPORT_CACHE_MAX_AGE_DAYS = float(os.getenv("EXPORT_CACHE_MAX_AGE_DAYS", "30"))
+EXPORT_CACHE_MAX_MB = float(os.getenv("EXPORT_CACHE_MAX_MB", "500"))
+# The cache is pruned at most this often per process, and never removes files used more recently
+PRUNE_INTERVAL = 600.0
+PRUNE_GRACE = 300.0
+# Bump when the writers change, so cached exports are rebuilt
+EXPORT_VERSION = 1
+EXPORT_TEMPLATES = ("job_ad", "interview_guide")
+# template -> render function (profile, locale=..., fmt=...); the interview guide also takes use_llm
+_RENDERERS: Dict[str, Callable] = {"job_ad": generate_job_ad, "interview_guide": generate_interview_guide}
+
+_HTML_CSS = """
+body { font-family: Helvetica, Arial, sans-serif; font-size: 11pt; line-height: 1.4; color: #222; }
+h2 { font-size: 16pt; color: #2e7d32; }
+h3 { font-size: 13pt; margin-bottom: 4pt; }
+article { margin-bottom: 24pt; }
+"""
+
+def _render(name: str, profile: JobProfile, locale: str, fmt: str, use_llm: bool = False) -> str:
+    options = {"use_llm": use_llm} if name == "interview_guide" else {}
+    return _RENDERERS[name](profile, locale=locale, fmt=fmt, **options)
+
+def _html_body(profile: JobProfile, locale: str, use_llm: bool = False) -> str:
+    return "\n".join(_render(name, profile, locale, "html", use_llm) for name in EXPORT_TEMPLATES)
+
+def _html_document(profile: JobProfile, locale: str, use_llm: bool = False) -> str:
+    body = _html_body(profile, locale, use_llm)
+    title = html.escape(profile.job_title or "Job Profile")
+    return (
+        f'<!DOCTYPE html>\n<html lang="{locale}">\n<head>\n<meta charset="utf-8">\n'
+        f"<title>{title}</title>\n<style>{_HTML_CSS}</style>\n</head>\n<body>\n{body}\n</body>\n</html>\n"
+    )
+
+def write_json(profile: JobProfile, locale: str, out: BinaryIO, use_llm: bool = False):
+    """Structured profile (all provided fields) as UTF-8 JSON."""
+    out.write(json.dumps(profile.to_dict(), ensure_ascii=False, indent=2).encode("utf-8"))
+
+def write_html(profile: JobProfile, locale: str, out: BinaryIO, use_llm: bool = False):
+    """Standalone HTML page with the job ad and the interview guide."""
+    out.write(_html_document(profile, locale, use_llm).encode("utf-8"))
+
+_BULLET = re.compile(r"^\s*(?:[-*•])\s+(.*)$")
+_NUMBERED = re.compile(r"^\s*\d+[.)]\s+(.*)$")
+_BOLD_LINE = re.compile(r"^\*\*(.+?)\*\*:?$")
+_BOLD_SPLIT = re.compile(r"\*\*(.+?)\*\*")
+
+def _markdown_blocks(text: str) -> Iterator[Tuple[str, str]]:
+    """Classify the lines of a rendered markdown template as heading/bullet/numbered/paragraph blocks."""
+    for line in text.splitlines():
+        stripped = line.strip()
+        if not stripped:
+            continue
+        match = _BOLD_LINE.match(stripped)
+        if match:
+            yield "heading", match.group(1).rstrip(":")
+            continue
+        match = _BULLET.match(line)
+        if match:
+            yield ("bullet2" if line.startswith("  ") else "bullet"), match.group(1)
+            continue
+        match = _NUMBERED.match(line)
+        if match:
+            yield "numbered", match.group(1)
+            continue
+        yield "paragraph", stripped
+
+def _add_runs(paragraph, text: str):
+    # "**bold**" spans become bold runs
+    for i, part in enumerate(_BOLD_SPLIT.split(text)):
+        if part:
+            paragraph.add_run(part).bold = i % 2 == 1
+
+def write_docx(profile: JobProfile, locale: str, out: BinaryIO, use_llm: bool = False):
+    """Word document with the job ad and the interview guide."""
+    try:
+        from docx import Document
+    except ImportError:
+        raise ImportError("Please install 'python-docx' to export DOCX files.")
+    document = Document()
+    styles = {"bullet": "List Bullet", "bullet2": "List Bullet 2", "numbered": "List Number"}
+    for index, name in enumerate(EXPORT_TEMPLATES):
+        if index:
+            document.add_page_break()
+        first_heading = True
+        for kind, text in _markdown_blocks(_render(name, profile, locale, "markdown", use_llm)):
+            if kind == "heading":
+                document.add_heading(text, level=1 if first_heading else 2)
+                first_heading = False
+            else:
+                _add_runs(document.add_paragraph(style=styles.get(kind)), text)
+    document.save(out)
+
+def write_pdf(profile: JobProfile, locale: str, out: BinaryIO, use_llm: bool = False):
+    """A4 PDF laid out from the HTML export with PyMuPDF's Story engine."""
+    try:
+        import fitz
+    except ImportError:
+        raise ImportError("Please install 'pymupdf' to export PDF files.")
+    story = fitz.Story(html=_html_body(profile, locale, use_llm), user_css=_HTML_CSS)
+    # DocumentWriter writes to out.name when it has one; other streams (BytesIO) are written to directly
+    name = getattr(out, "name", None)
+    writer = fitz.DocumentWriter(name if isinstance(name, str) else out)
+    mediabox = fitz.paper_rect("a4")
+    where = mediabox + (50, 50, -50, -50)
+    more = True
+    while more:
+        device = writer.begin_page(mediabox)
+        more, _ = story.place(where)
+        story.draw(device)
+        writer.end_page()
+    writer.close()
+
+# format -> (file extension, MIME type, writer(profile, locale, out, use_llm=...))
+EXPORT_FORMATS: Dict[str, Tuple[str, str, Callable]] = {
+    "docx": (".docx", "application/vnd.openxmlformats-officedocument.wordprocessingml.document", write_docx),
+    "pdf": (".pdf", "application/pdf", write_pdf),
+    "html": (".html", "text/html", write_html),
+    "json": (".json", "application/json", write_json),
+}
+
+def export_key(profile: JobProfile, fmt: str, locale: str = DEFAULT_LOCALE, use_llm: bool = False) -> str:
+    """
+    Content hash of an export: profile content, format, locale, whether interview questions were
+    generated by the LLM, writer version, template and question bank versions.
+    """
+    template_versions = []
+    for name in EXPORT_TEMPLATES:
+        for template_fmt in ("markdown", "html"):
+            path = template_path(name, locale, template_fmt)
+            template_versions.append(path.stat().st_mtime if path.exists() else None)
+    # Interview guides embed questions from the question bank
+    template_versions.append(DEFAULT_BANK_PATH.stat().st_mtime if DEFAULT_BANK_PATH.exists() else None)
+    raw = json.dumps([EXPORT_VERSION, fmt, locale, use_llm, template_versions, profile.to_dict()], ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+_last_prune: Optional[float] = None
+_prune_lock = threading.Lock()
+
+def prune_export_cache(
+    cache_dir: Path = EXPORT_CACHE_DIR,
+    max_age_days: float = EXPORT_CACHE_MAX_AGE_DAYS,
+    max_mb: float = EXPORT_CACHE_MAX_MB,
+) -> int:
+    """
+    Remove cached exports unused for max_age_days, then the least recently used ones until the
+    cache fits into max_mb. Cache hits refresh a file's mtime, so mtime is its last use. Files used
+    within the last PRUNE_GRACE seconds (e.g. a download in progress) are always kept.
+    :return: Number of files removed.
+    """
+    cache_dir = Path(cache_dir)
+    if not cache_dir.is_dir():
+        return 0
+    now = time.time()
+    entries = []
+    for entry in os.scandir(cache_dir):
+        try:
+            stat = entry.stat()
+        except OSError:
+            continue
+        if entry.is_file():
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+    entries.sort()  # least recently used first
+    total = sum(size for _, size, _ in entries)
+    limit = max_mb * 1024 * 1024
+    removed = 0
+    for mtime, size, path in entries:
+        if now - mtime < PRUNE_GRACE:
+            break
+        if now - mtime < max_age_days * 86400 and total <= limit:
+            break
+        try:
+            os.remove(path)
+        except OSError:
+            continue
+        total -= size
+        removed += 1
+    return removed
+
+def _maybe_prune(cache_dir: Path):
+    global _last_prune
+    with _prune_lock:
+        if _last_prune is not None and time.monotonic() - _last_prune < PRUNE_INTERVAL:
+            return
+        _last_prune = time.monotonic()
+    prune_export_cache(cache_dir)
+
+def export_profile(
+    profile: JobProfile, fmt: str, locale: str = DEFAULT_LOCALE, use_llm: bool = False, cache_dir: Path = EXPORT_CACHE_DIR
+) -> Path:
+    """
+    Export a profile and return the path of the cached file. An unchanged profile is served from
+    the cache without rendering again. Writers stream straight into a temporary file in the cache
+    directory, which is then renamed into place, so nothing is held in memory and readers never
+    see a partial file. Writing a new file occasionally prunes the cache (see prune_export_cache).
+    :param profile: Job profile to export.
+    :param fmt: One of EXPORT_FORMATS.
+    :param locale: Template language.
+    :param use_llm: Let the LLM write interview questions for skills the question bank doesn't cover
+                    (as in generate_interview_guide).
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported export format: {fmt}")
+    ext, _, writer = EXPORT_FORMATS[fmt]
+    cache_dir = Path(cache_dir)
+    target = cache_dir / f"{export_key(profile, fmt, locale, use_llm)}{ext}"
+    try:
+        os.utime(target)  # mark as recently used for pruning
+        return target
+    except FileNotFoundError:
+        pass
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    _maybe_prune(cache_dir)
+    fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+    os.close(fd)
+    try:
+        # Opened by path, not os.fdopen: writers like PyMuPDF's DocumentWriter use out.name, which must be a path
+        with open(tmp_path, "wb") as out:
+            writer(profile, locale, out, use_llm=use_llm)
+        os.replace(tmp_path, target)
+    except Exception as e:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        if isinstance(e, ImportError):
+            raise
+        raise RuntimeError(f"{fmt.upper()} export failed: {e}")
+    return target
+
+def export_filename(profile: JobProfile, fmt: str) -> str:
+    """Download file name like 'data-engineer.pdf'."""
+    slug = re.sub(r"[^\w]+", "-", (profile.job_title or "job-profile").lower()).strip("-") or "job-profile"
+    return f"{slug}{EXPORT_FORMATS[fmt][0]}"
+
+def export_zip(
+    profiles: Iterable[Tuple[str, JobProfile]],
+    out: BinaryIO,
+    formats: Iterable[str] = ("docx", "pdf", "html", "json"),
+    locale: str = DEFAULT_LOCALE,
+    use_llm: bool = False,
+    cache_dir: Path = EXPORT_CACHE_DIR,
+) -> Dict[str, int]:
+    """
+    Stream exports of many profiles into a zip archive (<id>/<file> per format).
+    Each file is exported to the cache and copied into the archive in chunks, so memory use does
+    not grow with the number of profiles.
+    :return: Counts of "files" written and "errors" (listed in errors.txt inside the archive).
+    """
+    formats = list(formats)
+    errors: List[str] = []
+    files = 0
+    with zipfile.ZipFile(out, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for profile_id, profile in profiles:
+            for fmt in formats:
+                try:
+                    path = export_profile(profile, fmt, locale, use_llm, cache_dir)
+                except Exception as e:
+                    errors.append(f"{profile_id} ({fmt}): {e}")
+                    continue
+                archive.write(path, f"{profile_id}/{export_filename(profile, fmt)}")
+                files += 1
+        if errors:
+            archive.writestr("errors.txt", "\n".join(errors) + "\n")
+    return {"files": files, "errors": len(errors)}
@@ -1,13 +1,17 @@
 # services/fileparser.py
 
 import io
+import mmap
+import shutil
+import tempfile
+import zipfile
+import xml.etree.ElementTree as ET
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Union
-import streamlit as st
+from typing import Dict, Iterator, List, Union
 import PyPDF2
-from sklearn.feature_extraction.text import TfidfVectorizer
 import re
-from docx import Document
+from utils.perf_utils import profiled
 # Simulated session state key categories (trimmed down for demo)
 SESSION_KEYS = {
     "company_name": ["company", "about us", "who we are", "our company"],
@@ -19,22 +23,182 @@ SESSION_KEYS = {
     "application_process": ["how to apply", "recruitment process", "next steps"],
 }
 
-def extract_text_from_pdf(pdf_file):
-    """Extract raw text from uploaded PDF."""
-    reader = PyPDF2.PdfReader(pdf_file)
-    text = " ".join(page.extract_text() or "" for page in reader.pages)
+# Uploads read from a non-buffered stream are spilled to a memory-mapped temp file above this size
+SPILL_THRESHOLD = 8 * 1024 * 1024
+_COPY_CHUNK_SIZE = 1024 * 1024
+
+FileSource = Union[str, Path, bytes, bytearray, memoryview, io.IOBase]
+
+
+class BufferReader(io.RawIOBase):
+    """
+    Read-only, seekable stream over any buffer-protocol object (bytes, memoryview, mmap).
+    Lets stream-based readers (PyPDF2, zipfile) consume an upload without copying it first.
+    """
+
+    def __init__(self, buffer):
+        self._view = memoryview(buffer).cast("B")
+        self._pos = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._pos
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_SET:
+            pos = offset
+        elif whence == io.SEEK_CUR:
+            pos = self._pos + offset
+        elif whence == io.SEEK_END:
+            pos = len(self._view) + offset
+        else:
+            raise ValueError(f"Invalid whence: {whence}")
+        if pos < 0:
+            raise ValueError("Negative seek position")
+        self._pos = pos
+        return pos
+
+    def readinto(self, b) -> int:
+        n = max(0, min(len(b), len(self._view) - self._pos))
+        b[:n] = self._view[self._pos:self._pos + n]
+        self._pos += n
+        return n
+
+    def read(self, size: int = -1) -> bytes:
+        end = len(self._view) if size is None or size < 0 else min(len(self._view), self._pos + size)
+        data = self._view[self._pos:end].tobytes() if end > self._pos else b""
+        self._pos = max(self._pos, end)
+        return data
+
+    def close(self):
+        if not self.closed:
+            self._view.release()
+        super().close()
+
+
+@contextmanager
+def open_buffer(file: FileSource) -> Iterator[memoryview]:
+    """
+    Expose an upload as a read-only memoryview without intermediate copies.
+    - Buffer-protocol objects (bytes, bytearray, memoryview, mmap) are viewed directly.
+    - In-memory streams with getbuffer() (io.BytesIO, Streamlit's UploadedFile) share their buffer.
+    - Other streams are read once; above SPILL_THRESHOLD they are spilled to a memory-mapped temp file.
+    :param file: Bytes-like object or file-like object (not a path).
+    """
+    try:
+        view = memoryview(file)
+    except TypeError:
+        view = None
+    if view is not None:
+        try:
+            yield view
+        finally:
+            view.release()
+        return
+
+    if not hasattr(file, "read"):
+        raise TypeError(f"Unsupported file source: {type(file).__name__}")
+
+    if hasattr(file, "getbuffer"):
+        view = file.getbuffer()
+        try:
+            yield view
+        finally:
+            view.release()
+        return
+
+    size = None
+    try:
+        if file.seekable():
+            start = file.tell()
+            size = file.seek(0, io.SEEK_END) - start
+            file.seek(start)
+    except (AttributeError, OSError):
+        size = None
+
+    if size is not None and size <= SPILL_THRESHOLD:
+        try:
+            content = file.read()
+        except Exception as e:
+            raise RuntimeError(f"Failed to read file-like object: {e}")
+        view = memoryview(content)
+        try:
+            yield view
+        finally:
+            view.release()
+        return
+
+    with tempfile.TemporaryFile() as spill:
+        try:
+            shutil.copyfileobj(file, spill, _COPY_CHUNK_SIZE)
+        except Exception as e:
+            raise RuntimeError(f"Failed to read file-like object: {e}")
+        spill.flush()
+        if spill.tell() == 0:
+            yield memoryview(b"")
+            return
+        with mmap.mmap(spill.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            view = memoryview(mapped)
+            try:
+                yield view
+            finally:
+                view.release()
+
+
+@contextmanager
+def _as_stream(source: FileSource):
+    """Yield paths and file-like objects unchanged; wrap buffers in a zero-copy BufferReader."""
+    if isinstance(source, (str, Path)) or hasattr(source, "read"):
+        yield source
+        return
+    # The reader must be closed before open_buffer releases the underlying mmap
+    with BufferReader(source) as reader:
+        yield reader
+
+def _as_text(data, encoding: str) -> str:
+    return data if isinstance(data, str) else str(data, encoding, errors='ignore')
+
+def extract_text_from_pdf(pdf_file: FileSource, ocr: bool = True):
+    """
+    Extract raw text from uploaded PDF (path, file-like object or buffer).
+    Pages without a text layer (scanned ads) are passed to the local OCR fallback if it is available.
+    """
+    with _as_stream(pdf_file) as stream:
+        reader = PyPDF2.PdfReader(stream)
+        pages = [page.extract_text() or "" for page in reader.pages]
+    missing = [i for i, page_text in enumerate(pages) if not page_text.strip()]
+    if ocr and missing:
+        from services.ocr_service import get_ocr_service
+        ocr_service = get_ocr_service()
+        if ocr_service.available:
+            for i, page_text in ocr_service.ocr_pages(pdf_file, missing).items():
+                pages[i] = page_text
+    text = " ".join(pages)
     return text.lower()
 
-def match_and_store_keys(text, session_keys):
-    """Match content against session keys and store them."""
+def extract_keys(text: str, session_keys: Dict[str, List[str]] = SESSION_KEYS) -> Dict[str, str]:
+    """Match content against session keys and return the found values (no Streamlit dependency)."""
+    found = {}
     for key, patterns in session_keys.items():
         # Search using pattern hints
         for pattern in patterns:
             match = re.search(rf"{pattern}[:\-]?\s*(.+?)(?=\n|\.|$)", text)
             if match:
-                value = match.group(1).strip()
-                st.session_state[key] = value
+                found[key] = match.group(1).strip()
                 break  # stop on first match
+    return found
+
+def match_and_store_keys(text, session_keys):
+    """Match content against session keys and store them."""
+    from utils.session_utils import store_in_state  # Streamlit only where the wizard needs it
+
+    for key, value in extract_keys(text, session_keys).items():
+        store_in_state(key, value)
 
 def analyse_pdf_and_store_keys(pdf_file):
     """Full process: extract text → match patterns → store in session_state."""
@@ -43,77 +207,143 @@ def analyse_pdf_and_store_keys(pdf_file):
     return raw_text  # for optional inspection or GPT post-processing
 
 
-def extract_text_from_docx(file_path_or_bytes: Union[str, bytes]) -> str:
+_W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+_W_P, _W_T, _W_TAB, _W_BR, _W_CR = _W + "p", _W + "t", _W + "tab", _W + "br", _W + "cr"
+_W_TBL, _W_TR, _W_TC, _W_NUMPR, _W_BODY = _W + "tbl", _W + "tr", _W + "tc", _W + "numPr", _W + "body"
+_DOCX_HEADER_PART = re.compile(r"word/header\d*\.xml$")
+_DOCX_FOOTER_PART = re.compile(r"word/footer\d*\.xml$")
+
+def iter_docx_blocks(file_path_or_bytes: FileSource) -> Iterator[str]:
+    """
+    Stream the text blocks of a DOCX file in document order: headers, body, footers.
+    Paragraphs become one block each, list items are prefixed with "- " and table rows are
+    emitted as " | "-joined cells. Parts are read with iterparse and processed elements are
+    cleared, so memory stays bounded regardless of document size.
+    """
+    with _as_stream(file_path_or_bytes) as stream, zipfile.ZipFile(stream) as archive:
+        names = archive.namelist()
+        parts = (
+            sorted(n for n in names if _DOCX_HEADER_PART.match(n))
+            + ["word/document.xml"]
+            + sorted(n for n in names if _DOCX_FOOTER_PART.match(n))
+        )
+        for part in parts:
+            with archive.open(part) as xml_stream:
+                yield from _iter_wordml_blocks(xml_stream)
+
+def _iter_wordml_blocks(xml_stream) -> Iterator[str]:
+    """Iteratively parse one WordprocessingML part and yield its text blocks."""
+    rows: List[List[str]] = []    # open table rows (nested tables stack up)
+    cells: List[List[str]] = []   # paragraphs of the open table cells
+    parents = []
+    for event, elem in ET.iterparse(xml_stream, events=("start", "end")):
+        tag = elem.tag
+        if event == "start":
+            parents.append(elem)
+            if tag == _W_TR:
+                rows.append([])
+            elif tag == _W_TC:
+                cells.append([])
+            continue
+        parents.pop()
+        if tag == _W_P:
+            text = "".join(_run_text(node) for node in elem.iter()).strip()
+            if text:
+                if cells:
+                    cells[-1].append(text)
+                elif elem.find(f"{_W}pPr/{_W_NUMPR}") is not None:
+                    yield f"- {text}"
+                else:
+                    yield text
+        elif tag == _W_TC:
+            cell_text = " ".join(cells.pop())
+            if rows:
+                rows[-1].append(cell_text)
+        elif tag == _W_TR:
+            row_text = " | ".join(c for c in rows.pop() if c)
+            if row_text:
+                if cells:
+                    cells[-1].append(row_text)  # nested table row stays inside its cell
+                else:
+                    yield row_text
+        elif tag != _W_TBL:
+            continue
+        # Drop the processed subtree; top-level blocks are also detached from <w:body>
+        elem.clear()
+        if parents and not cells and parents[-1].tag == _W_BODY:
+            parents[-1].remove(elem)
+
+def _run_text(node) -> str:
+    tag = node.tag
+    if tag == _W_T:
+        return node.text or ""
+    if tag == _W_TAB:
+        return "\t"
+    if tag in (_W_BR, _W_CR):
+        return "\n"
+    return ""
+
+def extract_text_from_docx(file_path_or_bytes: FileSource) -> str:
     """
-    Extract text from a DOCX file given a file path or bytes.
+    Extract text from a DOCX file given a file path, file-like object or buffer.
+    Includes headers, footers, list items and table cells (see iter_docx_blocks).
     """
     try:
-        if isinstance(file_path_or_bytes, (str, Path)):
-            doc = Document(file_path_or_bytes)
-        else:
-            doc = Document(io.BytesIO(file_path_or_bytes))
-        text = "\n".join(para.text for para in doc.paragraphs)
+        text = "\n".join(iter_docx_blocks(file_path_or_bytes))
     except Exception as e:
         raise RuntimeError(f"Failed to read DOCX file: {e}")
     return text
 
-def extract_text_from_txt(file_path_or_bytes: Union[str, bytes], encoding: str = "utf-8") -> str:
+def extract_text_from_txt(file_path_or_bytes: FileSource, encoding: str = "utf-8") -> str:
     """
-    Read text from a plain text file given a file path or bytes.
+    Read text from a plain text file given a file path, file-like object or buffer.
     """
     try:
         if isinstance(file_path_or_bytes, (str, Path)):
             with open(file_path_or_bytes, 'r', encoding=encoding) as f:
                 text = f.read()
+        elif hasattr(file_path_or_bytes, "read"):
+            text = _as_text(file_path_or_bytes.read(), encoding)
         else:
-            text = file_path_or_bytes.decode(encoding, errors='ignore')
+            # str() decodes straight from the buffer, no intermediate bytes copy
+            text = _as_text(file_path_or_bytes, encoding)
     except Exception as e:
         raise RuntimeError(f"Failed to read text file: {e}")
     return text
 
-def parse_file(file: Union[str, bytes, io.IOBase], file_name: str = None) -> str:
+@profiled(kind="service")
+def parse_file(file: FileSource, file_name: str = None) -> str:
     """
     Determine file type and extract text accordingly.
-    :param file: File path, bytes, or a file-like object (e.g., an uploaded file).
+    Non-path inputs are handled as a single memoryview (see open_buffer), so the upload
+    is never copied between sniffing and extraction.
+    :param file: File path, bytes-like object, or a file-like object (e.g., an uploaded file).
     :param file_name: Optional file name to help determine file type if file is not a path.
     :return: Extracted text content as a string.
     """
-    # If a file-like object is provided, read its content first
-    if hasattr(file, 'read') and not isinstance(file, (str, Path, bytes, bytearray)):
-        try:
-            content = file.read()
-        except Exception as e:
-            raise RuntimeError(f"Failed to read file-like object: {e}")
-        if file_name is None and hasattr(file, 'name'):
-            file_name = file.name
-        return parse_file(content, file_name)
-    # Determine file extension
-    ext = None
-    if file_name:
-        ext = Path(file_name).suffix.lower()
-    elif isinstance(file, (str, Path)):
-        ext = Path(file).suffix.lower()
-    # If no extension is found and we have bytes, attempt to detect PDF signature
-    if not ext:
-        head_bytes = b''
-        if isinstance(file, (bytes, bytearray)):
-            head_bytes = file[:5]
-        elif hasattr(file, '__iter__') and not isinstance(file, (str, Path)):
-            try:
-                iterator = iter(file)
-                head_bytes = bytes([next(iterator) for _ in range(5)])
-            except Exception:
-                head_bytes = b''
-        if head_bytes.startswith(b'%PDF'):
-            ext = '.pdf'
-        else:
-            ext = '.txt'
-    # Dispatch to appropriate extractor based on extension
+    if isinstance(file, (str, Path)):
+        ext = Path(file_name or file).suffix.lower()
+        if not ext:
+            # Same detection as for buffers: PDF signature, otherwise plain text
+            with open(file, "rb") as f:
+                ext = '.pdf' if f.read(4) == b'%PDF' else '.txt'
+        return _extract_by_extension(file, ext)
+    if file_name is None and hasattr(file, 'name'):
+        file_name = file.name
+    with open_buffer(file) as buffer:
+        ext = Path(file_name).suffix.lower() if file_name else None
+        # If no extension is found, attempt to detect PDF signature
+        if not ext:
+            ext = '.pdf' if buffer[:4] == b'%PDF' else '.txt'
+        return _extract_by_extension(buffer, ext)
+
+def _extract_by_extension(source: FileSource, ext: str) -> str:
+    """Dispatch to appropriate extractor based on extension."""
     if ext == '.pdf':
-        return extract_text_from_pdf(file)
+        return extract_text_from_pdf(source)
     elif ext == '.docx':
-        return extract_text_from_docx(file)
+        return extract_text_from_docx(source)
     elif ext == '.txt':
-        return extract_text_from_txt(file)
+        return extract_text_from_txt(source)
     else:
         raise ValueError(f"Unsupported file type: {ext}")
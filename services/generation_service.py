@@ -1,59 +1,51 @@
 # services/generation_service.py
 
-def generate_job_ad(job_details: dict) -> str:
+from typing import List
+
+from services.question_bank import QuestionSet, build_question_set
+from services.template_engine import DEFAULT_LOCALE, render_template
+
+def generate_job_ad(job_details, locale: str = DEFAULT_LOCALE, fmt: str = "markdown") -> str:
     """
-    Generate a job ad text from the dictionary of details in session.
-    You can also pass this to an LLM for a more dynamic generation.
+    Render a job ad from the job details with the compiled "job_ad" template.
+    Only the fields the template uses are read, so a JobProfile can be passed as is.
+    You can also pass the result to an LLM for a more dynamic generation.
+    :param job_details: JobProfile or dict of profile fields.
+    :param locale: Template language (e.g., "en", "de").
+    :param fmt: Output format ("markdown", "html").
     """
-    title = job_details.get("job_title", "Unknown Role")
-    company = job_details.get("company_name", "Unknown Company")
-    location = job_details.get("location", "")
-    mission = job_details.get("company_mission", "")
-    responsibilities = job_details.get("responsibility_distribution", [])
-    tasks = job_details.get("tasks", [])
-    benefits = job_details.get("benefits", [])
-    salary = job_details.get("salary_range", "N/A")
+    return render_template("job_ad", job_details, locale, fmt)
+
+def _question_fields(questions: QuestionSet) -> dict:
+    """Template fields of a question set: skill questions are prefixed with their skill."""
+    return {
+        "general_questions": [q.text for q in questions.general],
+        "skill_questions": [f"{q.topic}: {q.text}" for q in questions.skills],
+        "task_questions": [q.text for q in questions.tasks],
+    }
 
-    ad_text = f"**Join us at {company} as a {title} in {location}!**\n\n"
-    if mission:
-        ad_text += f"**Our Mission**: {mission}\n\n"
-    if responsibilities:
-        ad_text += "**Key Responsibilities:**\n"
-        for r in responsibilities:
-            ad_text += f"- {r}\n"
-        ad_text += "\n"
-    if tasks:
-        ad_text += "**Core Tasks:**\n"
-        for t in tasks:
-            ad_text += f"- {t}\n"
-        ad_text += "\n"
-    if benefits:
-        ad_text += "**Benefits & Perks:**\n"
-        for b in benefits:
-            ad_text += f"- {b}\n"
-        ad_text += "\n"
-    ad_text += f"**Salary Range**: {salary}\n\n"
-    ad_text += "Apply now and be part of our team!"
-    return ad_text
+def generate_interview_questions(job_details, locale: str = DEFAULT_LOCALE, use_llm: bool = False) -> List[str]:
+    """
+    Interview questions for the role: vetted questions from the question bank for its skills and
+    tasks, plus (with use_llm) generated questions for skills the bank doesn't cover.
+    :param job_details: JobProfile or dict of profile fields.
+    :param locale: Question language (e.g., "en", "de").
+    :param use_llm: Generate questions for uncovered skills.
+    """
+    return [q.text for q in build_question_set(job_details, locale, use_llm=use_llm).all()]
 
-def generate_interview_guide(job_details: dict, audience: str = "HR") -> str:
+def generate_interview_guide(
+    job_details, audience: str = "HR", locale: str = DEFAULT_LOCALE, fmt: str = "markdown", use_llm: bool = False
+) -> str:
     """
-    Generate a simplistic interview guide. 
-    Optionally feed job_details to an LLM for more advanced generation.
+    Render an interview preparation guide (focus areas and interview questions) for a role and audience.
+    Questions come from the question bank (see build_question_set); only skills the bank doesn't
+    cover are sent to the LLM, and only with use_llm.
+    :param job_details: JobProfile or dict of profile fields.
+    :param audience: Who conducts the interview (e.g., "HR", "Hiring Manager").
+    :param locale: Template language (e.g., "en", "de").
+    :param fmt: Output format ("markdown", "html").
+    :param use_llm: Generate questions for uncovered skills.
     """
-    title = job_details.get("job_title", "Unknown Role")
-    tasks = job_details.get("tasks", [])
-    responsibilities = job_details.get("responsibility_distribution", [])
-    guide = f"**Interview Guide for {title} (for {audience} Interviewers)**\n\n"
-    guide += "Recommended focus areas:\n"
-    if responsibilities:
-        guide += "- Ask about top responsibilities and how the candidate's experience aligns.\n"
-    if tasks:
-        guide += "- Discuss how they would handle key tasks:\n"
-        for t in tasks:
-            guide += f"  • {t}\n"
-    guide += "\nSample Questions:\n"
-    guide += f"1. What attracts you to the {title} role?\n"
-    guide += "2. Can you describe a recent challenge you faced and how you resolved it?\n"
-    guide += f"3. Which of your skills directly map to the responsibilities for {title}?\n"
-    return guide
+    questions = build_question_set(job_details, locale, use_llm=use_llm)
+    return render_template("interview_guide", job_details, locale, fmt, audience=audience, **_question_fields(questions))
@@ -0,0 +1,100 @@
+# services/llm_cache.py
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+DEFAULT_DB_PATH = Path(os.getenv("LLM_CACHE_PATH", Path.home() / ".cache" / "vacalyser" / "llm_cache.sqlite3"))
+
+class LLMCache:
+    def __init__(self, db_path: Path = DEFAULT_DB_PATH, ttl_days: float = 90.0):
+        """
+        On-disk cache of LLM completions, keyed by a hash of model, prompt and sampling parameters.
+        Shared by all threads and processes using the same file.
+        :param db_path: SQLite database file.
+        :param ttl_days: Entries older than this are purged on startup.
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False, isolation_level=None, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS completions (key TEXT PRIMARY KEY, value TEXT NOT NULL, created_at REAL NOT NULL)"
+        )
+        self._conn.execute("DELETE FROM completions WHERE created_at < ?", (time.time() - ttl_days * 86400,))
+        self._lock = threading.Lock()
+        # key -> Event of a completion currently being computed, so concurrent identical requests share it
+        self._inflight: Dict[str, threading.Event] = {}
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(*parts) -> str:
+        """Stable hash of the given JSON-serializable parts."""
+        raw = json.dumps(parts, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM completions WHERE key = ?", (key,)).fetchone()
+            if row:
+                self.hits += 1
+            else:
+                self.misses += 1
+        return row[0] if row else None
+
+    def put(self, key: str, value: str):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO completions (key, value, created_at) VALUES (?, ?, ?)", (key, value, time.time())
+            )
+
+    def complete(self, llm, prompt: str, system_message: Optional[str] = None, temperature: float = 0.7, max_tokens: int = 100) -> str:
+        """
+        llm.complete(...) through the cache. Cached answers are reused regardless of temperature
+        sampling, which is the point: the same input should not be paid for twice.
+        :param llm: An LLMService.
+        """
+        model = llm.openai_model if llm.provider == "openai" else llm.provider
+        key = self.make_key(model, system_message, prompt, temperature, max_tokens)
+        while True:
+            cached = self.get(key)
+            if cached is not None:
+                return cached
+            with self._lock:
+                pending = self._inflight.get(key)
+                if pending is None:
+                    pending = self._inflight[key] = threading.Event()
+                    break
+            # Another thread is asking the same question; wait for its answer (or its failure)
+            pending.wait()
+        try:
+            # It may have been stored between the lookup and taking over the key
+            cached = self.get(key)
+            if cached is not None:
+                return cached
+            result = llm.complete(prompt=prompt, system_message=system_message, temperature=temperature, max_tokens=max_tokens)
+            self.put(key, result)
+            return result
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            pending.set()
+
+_llm_cache: Optional[LLMCache] = None
+_llm_cache_lock = threading.Lock()
+
+def get_llm_cache() -> LLMCache:
+    """Return the process-wide LLMCache."""
+    global _llm_cache
+    if _llm_cache is None:
+        with _llm_cache_lock:
+            if _llm_cache is None:
+                _llm_cache = LLMCache()
+    return _llm_cache
@@ -2,10 +2,12 @@
 
 import os
 import re
-from typing import List, Optional
+import threading
+from typing import Dict, List, Optional
 import openai
 import requests
 import streamlit as st
+from utils.perf_utils import profiled
 
 class LLMService:
     def __init__(self, openai_api_key: Optional[str] = None, local_model: Optional[str] = None, default_openai_model: str = "gpt-3.5-turbo"):
@@ -17,6 +19,8 @@ class LLMService:
         self.provider = "openai"
         self.openai_model = default_openai_model
         self._pipeline = None
+        # The service is shared by all sessions (see get_llm_service); a local pipeline runs one generation at a time
+        self._pipeline_lock = threading.Lock()
 
         if local_model:
             # Use local HF model
@@ -45,7 +49,8 @@ class LLMService:
                     raise ValueError("No OpenAI API key provided or found in environment.")
             self.provider = "openai"
 
-def complete(self, prompt: str, system_message: Optional[str] = None, temperature: float = 0.7, max_tokens: int = 100) -> str:
+    @profiled(kind="service")
+    def complete(self, prompt: str, system_message: Optional[str] = None, temperature: float = 0.7, max_tokens: int = 100) -> str:
         """
         Generate text using either OpenAI ChatCompletion or a local HF pipeline.
         """
@@ -72,7 +77,8 @@ def complete(self, prompt: str, system_message: Optional[str] = None, temperatur
                 raise RuntimeError("Local pipeline not initialized.")
             full_prompt = (system_message + "\n" + prompt) if system_message else prompt
             try:
-                outputs = self._pipeline(full_prompt, max_new_tokens=max_tokens, do_sample=True, temperature=temperature, num_return_sequences=1)
+                with self._pipeline_lock:
+                    outputs = self._pipeline(full_prompt, max_new_tokens=max_tokens, do_sample=True, temperature=temperature, num_return_sequences=1)
                 generated_text = outputs[0]["generated_text"]
                 # Remove prompt from output if present
                 if generated_text.startswith(full_prompt):
@@ -81,16 +87,18 @@ def complete(self, prompt: str, system_message: Optional[str] = None, temperatur
             except Exception as e:
                 raise RuntimeError(f"Local model generation failed: {e}")
 
-def generate_suggestions(self, job_title: str, category: str, count: int = 15) -> List[str]:
+    def generate_suggestions(self, job_title: str, category: str, count: int = 15) -> List[str]:
         """
-        Provide a short list of suggestions for tasks, skills, or benefits, tailored to a job title.
+        Provide a short list of suggestions for tasks, responsibilities, skills, or benefits, tailored to a job title.
         """
         cat = category.lower()
-        if cat not in ["tasks", "skills", "benefits"]:
-            raise ValueError(f"Invalid category '{category}'. Must be 'tasks','skills','benefits'.")
+        if cat not in ["tasks", "responsibilities", "skills", "benefits"]:
+            raise ValueError(f"Invalid category '{category}'. Must be 'tasks','responsibilities','skills','benefits'.")
         user_prompt = ""
         if cat == "tasks":
             user_prompt = f"List {count} key tasks or responsibilities for a '{job_title}' role. No numbering, each on a new line."
+        elif cat == "responsibilities":
+            user_prompt = f"List {count} broad areas of responsibility (not individual tasks) for a '{job_title}' role. No numbering, each on a new line."
         elif cat == "skills":
             user_prompt = f"List {count} important skills needed for a '{job_title}' role. No numbering, each on a new line."
         else:  # benefits
@@ -102,7 +110,7 @@ def generate_suggestions(self, job_title: str, category: str, count: int = 15) -
         suggestions = self._parse_suggestions_from_text(raw, count)
         return suggestions
 
-def _parse_suggestions_from_text(self, raw_text: str, limit: int = 15) -> List[str]:
+    def _parse_suggestions_from_text(self, raw_text: str, limit: int = 15) -> List[str]:
         """
         Splits the raw LLM output into lines, cleans them up, returns up to `limit`.
         """
@@ -130,4 +138,22 @@ def create_llm_service(llm_choice: Optional[str] = None) -> LLMService:
         return LLMService(openai_api_key=None, local_model=local_model_path)
     else:
         # Default to OpenAI model (gpt-3.5-turbo)
-        return LLMService(openai_api_key=openai_api_key, local_model=None)
\ No newline at end of file
+        return LLMService(openai_api_key=openai_api_key, local_model=None)
+
+_llm_services: Dict[str, LLMService] = {}
+_llm_services_lock = threading.Lock()
+
+def get_llm_service(llm_choice: Optional[str] = None) -> LLMService:
+    """
+    Return the process-wide LLMService for a model choice (default: the configured LLM_CHOICE).
+    The client or local model is created once per process and shared by all sessions and pages.
+    """
+    if llm_choice is None:
+        llm_choice = st.secrets.get("LLM_CHOICE", "openai_3.5")
+    service = _llm_services.get(llm_choice)
+    if service is None:
+        with _llm_services_lock:
+            service = _llm_services.get(llm_choice)
+            if service is None:
+                service = _llm_services[llm_choice] = create_llm_service(llm_choice)
+    return service
@@ -0,0 +1,150 @@
+# services/ocr_service.py
+
+import hashlib
+import os
+import shutil
+import subprocess
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional
+
+TESSERACT_CMD = os.getenv("TESSERACT_CMD", "tesseract")
+OCR_LANGUAGES = os.getenv("OCR_LANGUAGES", "eng+deu")
+OCR_MAX_WORKERS = int(os.getenv("OCR_MAX_WORKERS", str(min(4, os.cpu_count() or 1))))
+
+class OCRService:
+    def __init__(
+        self,
+        tesseract_cmd: str = TESSERACT_CMD,
+        languages: str = OCR_LANGUAGES,
+        max_workers: int = OCR_MAX_WORKERS,
+        dpi: int = 300,
+        timeout: float = 120.0,
+        cache_size: int = 512,
+    ):
+        """
+        Local OCR fallback for PDF pages without a text layer.
+        Pages are rasterized with PyMuPDF and recognized by the Tesseract CLI in a bounded worker pool.
+        Results are cached by a hash of the rendered page, so identical pages are only OCR'd once.
+        :param tesseract_cmd: Name or path of the tesseract executable.
+        :param languages: Tesseract language string (e.g., "eng+deu").
+        :param max_workers: Maximum number of concurrent tesseract processes.
+        :param dpi: Rasterization resolution.
+        :param timeout: Per-page timeout for the tesseract subprocess in seconds.
+        :param cache_size: Number of page results kept in the in-process cache.
+        """
+        self.tesseract_cmd = tesseract_cmd
+        self.languages = languages
+        self.dpi = dpi
+        self.timeout = timeout
+        self.cache_size = cache_size
+        self._executor = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="ocr")
+        self._cache: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def available(self) -> bool:
+        """True if both PyMuPDF and the tesseract executable can be used."""
+        try:
+            import fitz  # noqa: F401
+        except ImportError:
+            return False
+        return shutil.which(self.tesseract_cmd) is not None
+
+    def ocr_pages(self, pdf_source, page_numbers: List[int]) -> Dict[int, str]:
+        """
+        OCR the given (0-based) pages of a PDF.
+        Rasterization runs in the calling thread (PyMuPDF is not thread-safe) and each page is handed
+        to the worker pool as soon as it is rendered, so rendering overlaps recognition.
+        :param pdf_source: File path, file-like object or bytes-like object containing the PDF.
+        :param page_numbers: Indices of the pages to recognize.
+        :return: Mapping of page index to recognized text (lower-cased like extract_text_from_pdf).
+        """
+        if not page_numbers:
+            return {}
+        try:
+            import fitz
+        except ImportError:
+            raise ImportError("Please install 'pymupdf' to use OCR.")
+
+        results: Dict[int, str] = {}
+        pending = {}
+        doc = _open_document(fitz, pdf_source)
+        try:
+            zoom = self.dpi / 72.0
+            matrix = fitz.Matrix(zoom, zoom)
+            for page_no in page_numbers:
+                if page_no < 0 or page_no >= doc.page_count:
+                    continue
+                pix = doc.load_page(page_no).get_pixmap(matrix=matrix, colorspace=fitz.csGRAY, alpha=False)
+                png = pix.tobytes("png")
+                key = self._cache_key(png)
+                cached = self._cache_get(key)
+                if cached is not None:
+                    results[page_no] = cached
+                else:
+                    pending[page_no] = (key, self._executor.submit(self._run_tesseract, png))
+        finally:
+            doc.close()
+
+        for page_no, (key, future) in pending.items():
+            text = future.result().lower()
+            self._cache_put(key, text)
+            results[page_no] = text
+        return results
+
+    def _run_tesseract(self, png: bytes) -> str:
+        """Run tesseract on a single PNG image passed through stdin."""
+        cmd = [self.tesseract_cmd, "stdin", "stdout", "-l", self.languages, "--dpi", str(self.dpi)]
+        try:
+            proc = subprocess.run(cmd, input=png, capture_output=True, timeout=self.timeout, check=True)
+        except (OSError, subprocess.SubprocessError):
+            # A failed page is treated like an empty one rather than failing the whole upload
+            return ""
+        return proc.stdout.decode("utf-8", errors="ignore")
+
+    def _cache_key(self, png: bytes) -> str:
+        return hashlib.sha256(png).hexdigest() + ":" + self.languages
+
+    def _cache_get(self, key: str) -> Optional[str]:
+        with self._lock:
+            text = self._cache.get(key)
+            if text is not None:
+                self._cache.move_to_end(key)
+            return text
+
+    def _cache_put(self, key: str, text: str):
+        with self._lock:
+            self._cache[key] = text
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+def _open_document(fitz, pdf_source):
+    """Open a PDF with PyMuPDF from a path, file-like object or buffer."""
+    if isinstance(pdf_source, (str, Path)):
+        return fitz.open(pdf_source)
+    if hasattr(pdf_source, "read"):
+        if hasattr(pdf_source, "seek"):
+            pdf_source.seek(0)
+        data = pdf_source.read()
+    elif isinstance(pdf_source, (bytes, bytearray)):
+        data = pdf_source
+    else:
+        # PyMuPDF needs bytes; this copy is only paid on the OCR path
+        data = bytes(pdf_source)
+    return fitz.open(stream=data, filetype="pdf")
+
+_ocr_service: Optional[OCRService] = None
+_ocr_service_lock = threading.Lock()
+
+def get_ocr_service() -> OCRService:
+    """Return the process-wide OCRService (one worker pool and cache per process)."""
+    global _ocr_service
+    if _ocr_service is None:
+        with _ocr_service_lock:
+            if _ocr_service is None:
+                _ocr_service = OCRService()
+    return _ocr_service
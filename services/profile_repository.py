@@ -0,0 +1,195 @@
+# services/profile_repository.py
+
+import os
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from models.job_profile import JobProfile
+
+DEFAULT_DB_PATH = Path(os.getenv("PROFILE_DB_PATH", Path.home() / ".local" / "share" / "vacalyser" / "profiles.sqlite3"))
+
+SKILL_FIELDS = ("skills", "must_have_hard", "must_have_soft", "nice_have_hard", "nice_have_soft")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS profiles (
+    id INTEGER PRIMARY KEY,
+    tenant_id TEXT NOT NULL,
+    job_title TEXT NOT NULL DEFAULT '',
+    company_name TEXT NOT NULL DEFAULT '',
+    industry TEXT NOT NULL DEFAULT '',
+    location TEXT NOT NULL DEFAULT '',
+    skills TEXT NOT NULL DEFAULT '',
+    payload TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_profiles_tenant_updated ON profiles (tenant_id, updated_at DESC);
+CREATE INDEX IF NOT EXISTS idx_profiles_tenant_title ON profiles (tenant_id, job_title COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS idx_profiles_tenant_company ON profiles (tenant_id, company_name COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS idx_profiles_tenant_industry ON profiles (tenant_id, industry COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS idx_profiles_tenant_location ON profiles (tenant_id, location COLLATE NOCASE);
+CREATE VIRTUAL TABLE IF NOT EXISTS profiles_fts USING fts5(
+    job_title, company_name, industry, location, skills,
+    content='profiles', content_rowid='id', tokenize='unicode61 remove_diacritics 2'
+);
+CREATE TRIGGER IF NOT EXISTS profiles_ai AFTER INSERT ON profiles BEGIN
+    INSERT INTO profiles_fts (rowid, job_title, company_name, industry, location, skills)
+    VALUES (new.id, new.job_title, new.company_name, new.industry, new.location, new.skills);
+END;
+CREATE TRIGGER IF NOT EXISTS profiles_ad AFTER DELETE ON profiles BEGIN
+    INSERT INTO profiles_fts (profiles_fts, rowid, job_title, company_name, industry, location, skills)
+    VALUES ('delete', old.id, old.job_title, old.company_name, old.industry, old.location, old.skills);
+END;
+CREATE TRIGGER IF NOT EXISTS profiles_au AFTER UPDATE ON profiles BEGIN
+    INSERT INTO profiles_fts (profiles_fts, rowid, job_title, company_name, industry, location, skills)
+    VALUES ('delete', old.id, old.job_title, old.company_name, old.industry, old.location, old.skills);
+    INSERT INTO profiles_fts (rowid, job_title, company_name, industry, location, skills)
+    VALUES (new.id, new.job_title, new.company_name, new.industry, new.location, new.skills);
+END;
+"""
+
+_SUMMARY_COLUMNS = "p.id, p.job_title, p.company_name, p.industry, p.location, p.updated_at"
+_QUERY_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+class ProfileRepository:
+    def __init__(self, db_path: Path = DEFAULT_DB_PATH):
+        """
+        Store completed job profiles per tenant with indexed, full-text searchable summary columns
+        (job title, company, industry, location, skills). The full profile is kept as JSON.
+        :param db_path: SQLite database file.
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(_SCHEMA)
+
+    def save(self, profile: JobProfile, tenant_id: str, profile_id: Optional[int] = None) -> int:
+        """
+        Insert a profile, or update it if profile_id is given.
+        :return: The id of the stored profile.
+        """
+        skills = "\n".join(dict.fromkeys(s for name in SKILL_FIELDS for s in getattr(profile, name)))
+        values = (
+            profile.job_title or "",
+            profile.company_name or "",
+            profile.industry or "",
+            profile.location or "",
+            skills,
+            profile.to_json(),
+        )
+        now = time.time()
+        with self._lock, self._conn:
+            if profile_id is not None:
+                cur = self._conn.execute(
+                    "UPDATE profiles SET job_title = ?, company_name = ?, industry = ?, location = ?, skills = ?,"
+                    " payload = ?, updated_at = ? WHERE id = ? AND tenant_id = ?",
+                    values + (now, profile_id, tenant_id),
+                )
+                if cur.rowcount:
+                    return profile_id
+            cur = self._conn.execute(
+                "INSERT INTO profiles (job_title, company_name, industry, location, skills, payload,"
+                " tenant_id, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                values + (tenant_id, now, now),
+            )
+            return cur.lastrowid
+
+    def get(self, profile_id: int, tenant_id: str) -> Optional[JobProfile]:
+        """Load a stored profile of the tenant, or None."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload FROM profiles WHERE id = ? AND tenant_id = ?", (profile_id, tenant_id)
+            ).fetchone()
+        return JobProfile.from_json(row["payload"]) if row else None
+
+    def delete(self, profile_id: int, tenant_id: str) -> bool:
+        with self._lock, self._conn:
+            cur = self._conn.execute("DELETE FROM profiles WHERE id = ? AND tenant_id = ?", (profile_id, tenant_id))
+        return cur.rowcount > 0
+
+    def search(
+        self,
+        tenant_id: str,
+        query: str = "",
+        industry: Optional[str] = None,
+        location: Optional[str] = None,
+        company: Optional[str] = None,
+        page: int = 1,
+        page_size: int = 20,
+        include_payload: bool = False,
+    ) -> Tuple[List[Dict], int]:
+        """
+        Search the tenant's profiles.
+        :param query: Free text matched (prefix, all terms) against title, company, industry, location and skills.
+        :param industry: Exact industry filter (case-insensitive).
+        :param location: Exact location filter (case-insensitive).
+        :param company: Exact company filter (case-insensitive).
+        :param page: 1-based page number.
+        :param page_size: Results per page.
+        :param include_payload: Also return each profile's JSON payload (for batch jobs reading every profile).
+        :return: (summaries of the requested page, total number of matches)
+        """
+        where = ["p.tenant_id = ?"]
+        params: List = [tenant_id]
+        for column, value in (("industry", industry), ("location", location), ("company_name", company)):
+            if value:
+                where.append(f"p.{column} = ? COLLATE NOCASE")
+                params.append(value)
+
+        match = _fts_query(query)
+        if match:
+            # Resolve the full-text match first, then join; otherwise SQLite may probe the FTS index per row
+            prefix = "WITH hits AS MATERIALIZED (SELECT rowid, rank FROM profiles_fts WHERE profiles_fts MATCH ?) "
+            source = "hits JOIN profiles p ON p.id = hits.rowid"
+            params.insert(0, match)
+            order = "hits.rank, p.updated_at DESC"
+        else:
+            prefix = ""
+            source = "profiles p"
+            order = "p.updated_at DESC"
+        where_sql = " AND ".join(where)
+        columns = f"{_SUMMARY_COLUMNS}, p.payload" if include_payload else _SUMMARY_COLUMNS
+        page = max(1, page)
+
+        with self._lock:
+            total = self._conn.execute(f"{prefix}SELECT COUNT(*) FROM {source} WHERE {where_sql}", params).fetchone()[0]
+            rows = self._conn.execute(
+                f"{prefix}SELECT {columns} FROM {source} WHERE {where_sql} ORDER BY {order} LIMIT ? OFFSET ?",
+                params + [page_size, (page - 1) * page_size],
+            ).fetchall()
+        return [dict(row) for row in rows], total
+
+    def facets(self, tenant_id: str, column: str) -> List[str]:
+        """Distinct non-empty values of an indexed column (industry, location, company_name) for filters."""
+        if column not in ("industry", "location", "company_name"):
+            raise ValueError(f"Invalid facet column '{column}'.")
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT DISTINCT {column} FROM profiles WHERE tenant_id = ? AND {column} != '' ORDER BY {column}",
+                (tenant_id,),
+            ).fetchall()
+        return [row[0] for row in rows]
+
+def _fts_query(text: str) -> str:
+    """Turn free text into an FTS5 query: every term must match as a prefix."""
+    return " ".join(f'"{token}"*' for token in _QUERY_TOKEN.findall(text or ""))
+
+_profile_repository: Optional[ProfileRepository] = None
+_profile_repository_lock = threading.Lock()
+
+def get_profile_repository() -> ProfileRepository:
+    """Return the process-wide ProfileRepository."""
+    global _profile_repository
+    if _profile_repository is None:
+        with _profile_repository_lock:
+            if _profile_repository is None:
+                _profile_repository = ProfileRepository()
+    return _profile_repository
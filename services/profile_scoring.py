@@ -0,0 +1,243 @@
+# services/profile_scoring.py
+
+import re
+from dataclasses import asdict, dataclass, field
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from models.job_profile import JobProfile
+from utils.misc_utils import parse_salary_range
+
+# Field -> weight in the completeness score
+KEY_FIELDS: Dict[str, float] = {
+    "job_title": 3.0,
+    "tasks": 3.0,
+    "must_have_hard": 3.0,
+    "company_name": 2.0,
+    "location": 2.0,
+    "responsibility_distribution": 2.0,
+    "salary_range": 2.0,
+    "benefits": 1.5,
+    "must_have_soft": 1.0,
+    "remote_policy": 1.0,
+    "industry": 0.5,
+    "department": 0.5,
+    "company_mission": 0.5,
+    "application_process": 0.5,
+}
+# Weights of the partial scores in the overall score
+SCORE_WEIGHTS: Dict[str, float] = {"completeness": 0.4, "specificity": 0.3, "consistency": 0.3}
+
+TASK_FIELDS = ("tasks", "responsibility_distribution", "responsibilities")
+# Skills that should be reflected in the tasks; soft skills rarely are
+COVERAGE_SKILL_FIELDS = ("must_have_hard", "nice_have_hard")
+
+MIN_TASK_WORDS = 3
+# Matched against lowercased tasks (much faster than re.IGNORECASE on this alternation)
+VAGUE_TASK = re.compile(
+    r"\b(?:various|etc|other duties|as needed|as required|and more|miscellaneous|misc|tbd|stuff|things|"
+    r"general support|support the team|different tasks|ad[- ]hoc|diverse|sonstige[s]?|usw|nach bedarf|"
+    r"allgemeine aufgaben)\b"
+)
+# Plausible annual salary bounds and the largest max/min ratio of a meaningful range
+SALARY_LIMITS = (10_000, 1_000_000)
+MAX_SALARY_SPREAD = 2.0
+# Cosine similarity from which a task counts as evidence for a skill
+COVERAGE_THRESHOLD = 0.45
+# Skill/task pairs compared per vectorized step (bounds the temporary arrays)
+PAIR_CHUNK = 65536
+
+@dataclass
+class ProfileScore:
+    """
+    Quality scores of a job profile, each between 0 and 1.
+    :param completeness: Weighted share of the KEY_FIELDS that are filled in.
+    :param specificity: Share of tasks that are concrete (not too short, no filler phrases).
+    :param consistency: Salary sanity and how well the hard skills are reflected in the tasks.
+    :param overall: SCORE_WEIGHTS-weighted mean of the three.
+    :param skill_coverage: Share of hard skills backed by a similar task; None without hard skills.
+    """
+    completeness: float
+    specificity: float
+    consistency: float
+    overall: float
+    skill_coverage: Optional[float] = None
+    missing_fields: List[str] = field(default_factory=list)
+    vague_tasks: List[str] = field(default_factory=list)
+    salary_issues: List[str] = field(default_factory=list)
+    uncovered_skills: List[str] = field(default_factory=list)
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+def _flatten(profiles: Sequence[JobProfile], names: Iterable[str]) -> Tuple[List[str], np.ndarray]:
+    """All items of the given list fields (de-duplicated per profile) and the index of the profile of each."""
+    items: List[str] = []
+    owners: List[int] = []
+    for index, profile in enumerate(profiles):
+        for item in dict.fromkeys(item for name in names for item in getattr(profile, name)):
+            items.append(item)
+            owners.append(index)
+    return items, np.asarray(owners, dtype=np.int64)
+
+def _salary_bounds(profile: JobProfile) -> Tuple[float, float]:
+    if profile.min_salary is not None and profile.max_salary is not None:
+        return float(profile.min_salary), float(profile.max_salary)
+    parsed = parse_salary_range(profile.salary_range or "")
+    return parsed if parsed else (np.nan, np.nan)
+
+def _lexical_coverage(skills: List[str], skill_owner: np.ndarray, tasks: List[str], task_owner: np.ndarray, n: int) -> np.ndarray:
+    """Fallback without an embedding model: a skill is covered if a task mentions it."""
+    task_text = [""] * n
+    for task, owner in zip(tasks, task_owner):
+        task_text[owner] += task.lower() + "\n"
+    return np.fromiter(
+        (skill.lower() in task_text[owner] for skill, owner in zip(skills, skill_owner)), dtype=bool, count=len(skills)
+    )
+
+def _embedding_coverage(skills: List[str], skill_owner: np.ndarray, tasks: List[str], task_owner: np.ndarray, n: int, rag) -> np.ndarray:
+    """
+    Best cosine similarity of every skill to the tasks of its own profile, for all profiles at once:
+    the (skill, task) pairs of all profiles are laid out flat, compared with one row-wise dot product
+    per chunk, and reduced to the maximum per skill with np.maximum.reduceat.
+    """
+    unique = list(dict.fromkeys(skills + tasks))
+    row = {text: i for i, text in enumerate(unique)}
+    vectors = rag.embed(unique)
+    skill_rows = np.fromiter((row[s] for s in skills), dtype=np.int64, count=len(skills))
+    task_rows = np.fromiter((row[t] for t in tasks), dtype=np.int64, count=len(tasks))
+
+    # Tasks of a profile are contiguous in the flattened list
+    task_count = np.bincount(task_owner, minlength=n)
+    task_start = np.cumsum(task_count) - task_count
+    pairs_per_skill = task_count[skill_owner]
+    with_tasks = np.flatnonzero(pairs_per_skill)
+    covered = np.zeros(len(skills), dtype=bool)
+    if not len(with_tasks):
+        return covered
+    counts = pairs_per_skill[with_tasks]
+    segment_start = np.cumsum(counts) - counts
+    pair_skill = np.repeat(with_tasks, counts)
+    pair_task = task_start[skill_owner[pair_skill]] + np.arange(counts.sum()) - np.repeat(segment_start, counts)
+
+    similarity = np.empty(len(pair_skill), dtype=np.float32)
+    for i in range(0, len(pair_skill), PAIR_CHUNK):
+        a = vectors[skill_rows[pair_skill[i:i + PAIR_CHUNK]]]
+        b = vectors[task_rows[pair_task[i:i + PAIR_CHUNK]]]
+        similarity[i:i + PAIR_CHUNK] = np.einsum("ij,ij->i", a, b)
+    covered[with_tasks] = np.maximum.reduceat(similarity, segment_start) >= COVERAGE_THRESHOLD
+    return covered
+
+def _default_rag():
+    try:
+        from services.rag_service import get_optional_rag_service
+    except ImportError:
+        return None
+    return get_optional_rag_service()
+
+def score_profiles(profiles: Sequence, rag=None, use_embeddings: bool = True) -> List[ProfileScore]:
+    """
+    Score many profiles at once. Every metric is computed as a NumPy array over the whole batch,
+    and all skills and tasks of the batch are embedded in one call through the embedding cache.
+    :param profiles: JobProfiles or dicts of profile fields.
+    :param rag: RAGService for skill/task similarity (default: the shared service if
+                the embedding model can be loaded, otherwise skills are matched by name).
+    :param use_embeddings: False always matches skills by name.
+    :return: One ProfileScore per profile, in order.
+    """
+    profiles = [p if isinstance(p, JobProfile) else JobProfile.from_dict(p) for p in profiles]
+    n = len(profiles)
+    if not n:
+        return []
+
+    names = list(KEY_FIELDS)
+    weights = np.array([KEY_FIELDS[name] for name in names])
+    present = np.array([[bool(getattr(p, name)) for name in names] for p in profiles], dtype=bool)
+    completeness = present @ weights / weights.sum()
+
+    tasks, task_owner = _flatten(profiles, TASK_FIELDS)
+    vague = np.fromiter(
+        (len(task.split()) < MIN_TASK_WORDS or VAGUE_TASK.search(task.lower()) is not None for task in tasks),
+        dtype=bool, count=len(tasks),
+    )
+    task_total = np.bincount(task_owner, minlength=n)
+    vague_total = np.bincount(task_owner, weights=vague, minlength=n)
+    specificity = np.where(task_total > 0, 1.0 - vague_total / np.maximum(task_total, 1), 0.0)
+
+    bounds = np.array([_salary_bounds(p) for p in profiles], dtype=float)
+    low, high = bounds[:, 0], bounds[:, 1]
+    known = ~np.isnan(low)
+    with np.errstate(invalid="ignore"):
+        inverted = known & (low > high)
+        too_wide = known & ~inverted & (high > low * MAX_SALARY_SPREAD)
+        implausible = known & ((low < SALARY_LIMITS[0]) | (high > SALARY_LIMITS[1]))
+    issue_count = inverted.astype(int) + too_wide + implausible
+    # An unknown salary can't be checked; it is already penalized by completeness
+    salary_score = np.where(known, 1.0 - np.minimum(issue_count, 2) / 2, 0.5)
+
+    skills, skill_owner = _flatten(profiles, COVERAGE_SKILL_FIELDS)
+    if use_embeddings and rag is None:
+        rag = _default_rag()
+    if not skills or not tasks:
+        covered = np.zeros(len(skills), dtype=bool)
+    elif use_embeddings and rag is not None:
+        covered = _embedding_coverage(skills, skill_owner, tasks, task_owner, n, rag)
+    else:
+        covered = _lexical_coverage(skills, skill_owner, tasks, task_owner, n)
+    skill_total = np.bincount(skill_owner, minlength=n)
+    coverage = np.bincount(skill_owner, weights=covered, minlength=n) / np.maximum(skill_total, 1)
+    consistency = np.where(skill_total > 0, (salary_score + coverage) / 2, salary_score)
+
+    overall = (
+        SCORE_WEIGHTS["completeness"] * completeness
+        + SCORE_WEIGHTS["specificity"] * specificity
+        + SCORE_WEIGHTS["consistency"] * consistency
+    ) / sum(SCORE_WEIGHTS.values())
+
+    scores = [
+        ProfileScore(
+            completeness=round(float(completeness[i]), 3),
+            specificity=round(float(specificity[i]), 3),
+            consistency=round(float(consistency[i]), 3),
+            overall=round(float(overall[i]), 3),
+            skill_coverage=round(float(coverage[i]), 3) if skill_total[i] else None,
+            missing_fields=[name for name, filled in zip(names, present[i]) if not filled],
+        )
+        for i in range(n)
+    ]
+    for i in np.flatnonzero(vague):
+        scores[task_owner[i]].vague_tasks.append(tasks[i])
+    for i in np.flatnonzero(~covered):
+        scores[skill_owner[i]].uncovered_skills.append(skills[i])
+    for i in np.flatnonzero(inverted):
+        scores[i].salary_issues.append("The minimum salary is above the maximum.")
+    for i in np.flatnonzero(too_wide):
+        scores[i].salary_issues.append(f"The range is very wide (maximum more than {MAX_SALARY_SPREAD:g}x the minimum).")
+    for i in np.flatnonzero(implausible):
+        scores[i].salary_issues.append(
+            f"Outside the plausible annual range {SALARY_LIMITS[0]:,}-{SALARY_LIMITS[1]:,}."
+        )
+    return scores
+
+def score_profile(profile, rag=None, use_embeddings: bool = True) -> ProfileScore:
+    """Score a single profile (see score_profiles)."""
+    return score_profiles([profile], rag=rag, use_embeddings=use_embeddings)[0]
+
+def score_in_batches(
+    profiles: Iterable[Tuple[str, Dict]], batch_size: int = 1000, rag=None, use_embeddings: bool = True
+) -> Iterator[Tuple[str, ProfileScore]]:
+    """
+    Score a stream of (id, profile fields), e.g. from iter_repository_profiles, batch by batch,
+    so thousands of saved profiles are scored with bounded memory.
+    """
+    if use_embeddings and rag is None:
+        rag = _default_rag()
+    batch: List[Tuple[str, Dict]] = []
+    for item in profiles:
+        batch.append(item)
+        if len(batch) >= batch_size:
+            yield from zip((pid for pid, _ in batch), score_profiles([d for _, d in batch], rag, use_embeddings))
+            batch = []
+    if batch:
+        yield from zip((pid for pid, _ in batch), score_profiles([d for _, d in batch], rag, use_embeddings))
@@ -0,0 +1,255 @@
+# services/question_bank.py
+
+import json
+import logging
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from models.job_profile import JobProfile
+from services.ad_writer import LANGUAGES
+from services.llm_cache import LLMCache, get_llm_cache
+from services.skill_taxonomy import get_skill_taxonomy
+from services.template_engine import DEFAULT_LOCALE
+
+DEFAULT_BANK_PATH = Path(
+    os.getenv("QUESTION_BANK_PATH", Path(__file__).resolve().parent.parent / "data" / "question_bank.json")
+)
+# Stands in for {job_title} in general questions, like the interview guide templates' default
+UNKNOWN_ROLE = {"en": "Unknown Role", "de": "unbekannte Rolle"}
+SKILL_FIELDS = ("must_have_hard", "must_have_soft", "nice_have_hard", "nice_have_soft")
+TASK_FIELDS = ("tasks", "responsibility_distribution")
+# Cosine similarity from which a bank question counts as relevant to a task
+TASK_MATCH_THRESHOLD = 0.45
+# Two selected questions at least this similar are duplicates; the first one is kept
+DUPLICATE_THRESHOLD = 0.9
+# Bump when the generation prompt changes, so cached LLM questions written with the old one aren't reused
+PROMPT_VERSION = 1
+SYSTEM_MESSAGE = (
+    "You are an experienced technical recruiter. You write concrete, open interview questions that "
+    "reveal real experience. Return the questions only, one per line."
+)
+
+_LIST_MARKER = re.compile(r"^\s*(?:[-*•]|\d+[.)])\s*")
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class InterviewQuestion:
+    """
+    :param topic: The skill or task the question was chosen for ("" for general questions).
+    :param source: "bank" for vetted questions, "llm" for generated ones.
+    :param question_id: Id in the question bank (bank questions only).
+    """
+    text: str
+    topic: str = ""
+    source: str = "bank"
+    question_id: Optional[str] = None
+
+@dataclass
+class QuestionSet:
+    """Interview questions for one profile, grouped as shown in the interview guide."""
+    general: List[InterviewQuestion] = field(default_factory=list)
+    skills: List[InterviewQuestion] = field(default_factory=list)
+    tasks: List[InterviewQuestion] = field(default_factory=list)
+    uncovered_skills: List[str] = field(default_factory=list)  # skills without any question
+
+    def all(self) -> List[InterviewQuestion]:
+        return self.general + self.skills + self.tasks
+
+class QuestionBank:
+    def __init__(self, path: Path = DEFAULT_BANK_PATH):
+        """
+        Vetted interview questions (data/question_bank.json), tagged with taxonomy skill ids and
+        task topics. Skill questions are found through an inverted index; task questions through
+        cosine similarity against the embedded bank, which is embedded once per process (and read
+        from the embedding cache after the first run).
+        """
+        with open(path, "r", encoding="utf-8") as file:
+            data = json.load(file)
+        self.questions: List[Dict] = data["questions"]
+        self.general = [i for i, q in enumerate(self.questions) if q["kind"] == "general"]
+        self.by_skill: Dict[str, List[int]] = {}
+        for i, question in enumerate(self.questions):
+            for skill_id in question.get("skills", []):
+                self.by_skill.setdefault(skill_id, []).append(i)
+        self._vectors: Optional[np.ndarray] = None
+        self._vectors_lock = threading.Lock()
+
+    def text(self, index: int, locale: str = DEFAULT_LOCALE) -> str:
+        texts = self.questions[index]["text"]
+        return texts.get(locale) or texts[DEFAULT_LOCALE]
+
+    def document(self, index: int) -> str:
+        """What is embedded for a question: its task tags and English text."""
+        question = self.questions[index]
+        return "; ".join(question.get("tags", []) + [question["text"][DEFAULT_LOCALE]])
+
+    def vectors(self, rag) -> np.ndarray:
+        """Unit-length embeddings of all questions (one row per question)."""
+        if self._vectors is None:
+            with self._vectors_lock:
+                if self._vectors is None:
+                    self._vectors = rag.embed([self.document(i) for i in range(len(self.questions))])
+        return self._vectors
+
+    def _task_matches(self, tasks: List[str], rag) -> List[Tuple[int, int, float]]:
+        """(task, question, similarity) of the best non-general question per task above the threshold."""
+        if rag is None:
+            matches = []
+            for t, task in enumerate(tasks):
+                task = task.lower()
+                index = next((i for i, q in enumerate(self.questions) if any(tag in task for tag in q.get("tags", []))), None)
+                if index is not None:
+                    matches.append((t, index, 1.0))
+            return matches
+        similarity = rag.embed(tasks) @ self.vectors(rag).T
+        similarity[:, self.general] = -1.0
+        best = similarity.argmax(axis=1)
+        score = similarity[np.arange(len(tasks)), best]
+        return [(t, int(best[t]), float(score[t])) for t in np.flatnonzero(score >= TASK_MATCH_THRESHOLD)]
+
+    def _is_duplicate(self, index: int, chosen: List[int], rag) -> bool:
+        if index in chosen:
+            return True
+        if rag is None or not chosen:
+            return False
+        vectors = self.vectors(rag)
+        return bool((vectors[chosen] @ vectors[index]).max() >= DUPLICATE_THRESHOLD)
+
+    def select(self, profile, locale: str = DEFAULT_LOCALE, rag=None, per_skill: int = 1, max_tasks: int = 5) -> QuestionSet:
+        """
+        Pick vetted questions for a profile: the general questions, up to per_skill questions for
+        each of its skills (resolved to the taxonomy) and the closest question for each task,
+        without duplicates.
+        :param profile: JobProfile or dict of profile fields.
+        :param locale: Language of the question texts.
+        :param rag: RAGService for task retrieval and near-duplicate detection (None: task
+                    questions are matched by tag and only identical questions are dropped).
+        :return: QuestionSet; skills without a vetted question are listed in uncovered_skills.
+        """
+        profile = profile if isinstance(profile, JobProfile) else JobProfile.from_dict(profile)
+        job_title = profile.job_title or ""
+        result = QuestionSet()
+        chosen: List[int] = []
+
+        def take(index: int, topic: str, target: List[InterviewQuestion]) -> bool:
+            if self._is_duplicate(index, chosen, rag):
+                return False
+            chosen.append(index)
+            text = self.text(index, locale).replace("{job_title}", job_title or UNKNOWN_ROLE.get(locale, UNKNOWN_ROLE[DEFAULT_LOCALE]))
+            target.append(InterviewQuestion(text, topic, "bank", self.questions[index]["id"]))
+            return True
+
+        for index in self.general:
+            take(index, "", result.general)
+
+        taxonomy = get_skill_taxonomy()
+        seen_skills = set()
+        for skill in dict.fromkeys(item for name in SKILL_FIELDS for item in getattr(profile, name)):
+            matches = taxonomy.lookup(skill)
+            if not matches:
+                result.uncovered_skills.append(skill)
+                continue
+            for match in matches:
+                if match.skill.id in seen_skills:
+                    continue
+                seen_skills.add(match.skill.id)
+                candidates = self.by_skill.get(match.skill.id, [])
+                if not candidates:
+                    result.uncovered_skills.append(match.skill.name)
+                # A question shared with an earlier skill (e.g. SQL dialects) still covers this one
+                taken = 0
+                for index in candidates:
+                    if taken >= per_skill:
+                        break
+                    taken += take(index, match.skill.name, result.skills)
+
+        tasks = list(dict.fromkeys(item for name in TASK_FIELDS for item in getattr(profile, name)))
+        if tasks:
+            for t, index, _ in sorted(self._task_matches(tasks, rag), key=lambda m: -m[2]):
+                if len(result.tasks) >= max_tasks:
+                    break
+                take(index, tasks[t], result.tasks)
+        return result
+
+def _generation_prompt(skill: str, job_title: str, count: int, locale: str) -> str:
+    return (
+        f"[v{PROMPT_VERSION}] Write {count} interview question(s) that assess a {job_title or 'candidate'}'s "
+        f"experience with {skill}. Write in {LANGUAGES.get(locale, 'English')}."
+    )
+
+def generate_skill_questions(
+    skills: List[str], job_title: str, locale: str = DEFAULT_LOCALE, count: int = 1,
+    llm=None, cache: Optional[LLMCache] = None,
+) -> List[InterviewQuestion]:
+    """
+    Let the LLM write questions for skills the bank doesn't cover. Answers go through the LLM
+    cache, so a skill is only ever generated once per title and language; uncached skills are
+    requested concurrently. A skill whose request fails is logged and skipped, so it stays
+    uncovered while the other skills keep their questions.
+    """
+    if not skills:
+        return []
+    if llm is None:
+        from services.llm_service import get_llm_service
+        llm = get_llm_service()
+    cache = cache or get_llm_cache()
+
+    def generate(skill: str) -> List[InterviewQuestion]:
+        try:
+            answer = cache.complete(llm, _generation_prompt(skill, job_title, count, locale), SYSTEM_MESSAGE, max_tokens=80 * count)
+        except Exception as e:
+            logger.warning(f"Interview question generation failed for '{skill}': {e}")
+            return []
+        lines = [_LIST_MARKER.sub("", line).strip() for line in answer.splitlines()]
+        return [InterviewQuestion(line, skill, "llm") for line in lines if line][:count]
+
+    with ThreadPoolExecutor(max_workers=min(4, len(skills))) as executor:
+        return [question for questions in executor.map(generate, skills) for question in questions]
+
+def _default_rag():
+    try:
+        from services.rag_service import get_optional_rag_service
+    except ImportError:
+        return None
+    return get_optional_rag_service()
+
+def build_question_set(
+    profile, locale: str = DEFAULT_LOCALE, rag=None, use_embeddings: bool = True, use_llm: bool = False,
+    llm=None, cache: Optional[LLMCache] = None,
+) -> QuestionSet:
+    """
+    Interview questions for a profile: vetted bank questions first (see QuestionBank.select),
+    then, with use_llm, generated questions for the skills the bank doesn't cover.
+    :param use_embeddings: False matches task questions by tag only.
+    :param use_llm: Generate questions for uncovered skills.
+    """
+    if use_embeddings and rag is None:
+        rag = _default_rag()
+    profile = profile if isinstance(profile, JobProfile) else JobProfile.from_dict(profile)
+    result = get_question_bank().select(profile, locale, rag if use_embeddings else None)
+    if use_llm and result.uncovered_skills:
+        generated = generate_skill_questions(result.uncovered_skills, profile.job_title or "", locale, llm=llm, cache=cache)
+        result.skills.extend(generated)
+        covered = {question.topic for question in generated}
+        result.uncovered_skills = [skill for skill in result.uncovered_skills if skill not in covered]
+    return result
+
+_question_bank: Optional[QuestionBank] = None
+_question_bank_lock = threading.Lock()
+
+def get_question_bank() -> QuestionBank:
+    """Return the process-wide QuestionBank."""
+    global _question_bank
+    if _question_bank is None:
+        with _question_bank_lock:
+            if _question_bank is None:
+                _question_bank = QuestionBank()
+    return _question_bank
@@ -1,7 +1,19 @@
 # services/rag_service.py
 
+import logging
+import threading
 import numpy as np
-from typing import List
+from typing import Dict, List, Optional, Sequence
+from services.embedding_cache import EmbeddingCache, get_embedding_cache
+from utils.perf_utils import profiled
+
+logger = logging.getLogger(__name__)
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    """Scale rows to unit length, so inner products are cosine similarities."""
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1e-9
+    return vectors / norms
 
 class RAGService:
     def __init__(self, embedding_model_name: str = 'sentence-transformers/all-MiniLM-L6-v2'):
@@ -15,22 +27,44 @@ class RAGService:
         except ImportError:
             raise ImportError("sentence-transformers library is required for RAGService.")
         self.embedder = SentenceTransformer(embedding_model_name)
+        self.model_name = embedding_model_name
         self.index = None
         self.documents: List[str] = []
 
-def build_index(self, texts: List[str]):
+    @profiled(kind="service")
+    def embed(self, texts: Sequence[str], cache: Optional[EmbeddingCache] = None, batch_size: int = 64) -> np.ndarray:
+        """
+        Embed texts as unit-length float32 vectors (one row per text, in order).
+        Duplicate texts are encoded once, and vectors are read from and written to the embedding
+        cache, so only texts never seen before reach the model.
+        :param texts: Texts to embed.
+        :param cache: EmbeddingCache (default: the shared on-disk cache).
+        :param batch_size: Texts per model forward pass.
+        """
+        texts = list(texts)
+        dim = self.embedder.get_sentence_embedding_dimension()
+        if not texts:
+            return np.zeros((0, dim), dtype=np.float32)
+        cache = cache or get_embedding_cache()
+        unique = list(dict.fromkeys(texts))
+        vectors: Dict[str, np.ndarray] = cache.get_many(self.model_name, unique)
+        missing = [text for text in unique if text not in vectors]
+        if missing:
+            encoded = self.embedder.encode(missing, batch_size=batch_size, show_progress_bar=False)
+            encoded = _normalize(np.asarray(encoded, dtype=np.float32))
+            cache.put_many(self.model_name, missing, encoded)
+            vectors.update(zip(missing, encoded))
+        return np.stack([vectors[text] for text in texts])
+
+    def build_index(self, texts: List[str]):
         """
         Build a FAISS index from a list of text documents or tokens.
         :param texts: List of text strings to index.
         """
         if not texts:
             raise ValueError("No texts provided to build the index.")
-        embeddings = self.embedder.encode(texts, show_progress_bar=False)
-        embeddings = np.array(embeddings, dtype='float32')
-        # Normalize embeddings for cosine similarity
-        norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
-        norms[norms == 0] = 1e-9
-        embeddings_norm = embeddings / norms
+        # Normalized embeddings for cosine similarity
+        embeddings_norm = self.embed(texts)
         dim = embeddings_norm.shape[1]
         try:
             import faiss
@@ -40,7 +74,8 @@ def build_index(self, texts: List[str]):
         self.index.add(embeddings_norm)
         self.documents = list(texts)
 
-def search(self, query: str, k: int = 5) -> List[str]:
+    @profiled(kind="service")
+    def search(self, query: str, k: int = 5) -> List[str]:
         """
         Search the index for texts similar to the query.
         :param query: Query string to search for.
@@ -52,12 +87,7 @@ def search(self, query: str, k: int = 5) -> List[str]:
         if k <= 0:
             return []
         # Embed and normalize the query
-        query_vec = self.embedder.encode([query], show_progress_bar=False)
-        query_vec = np.array(query_vec, dtype='float32')
-        norm = np.linalg.norm(query_vec)
-        if norm == 0:
-            norm = 1e-9
-        query_vec = query_vec / norm
+        query_vec = self.embed([query])
         try:
             import faiss
         except ImportError:
@@ -70,3 +100,38 @@ def search(self, query: str, k: int = 5) -> List[str]:
                 continue
             results.append(self.documents[idx])
         return results
+
+_rag_services: Dict[str, RAGService] = {}
+_rag_service_lock = threading.Lock()
+# Model name -> why it couldn't be loaded
+_rag_failures: Dict[str, str] = {}
+
+def get_rag_service(embedding_model_name: str = 'sentence-transformers/all-MiniLM-L6-v2') -> RAGService:
+    """
+    Return the process-wide RAGService for an embedding model, so the model is loaded only once.
+    :param embedding_model_name: Name of the embedding model for SentenceTransformer.
+    """
+    service = _rag_services.get(embedding_model_name)
+    if service is None:
+        with _rag_service_lock:
+            service = _rag_services.get(embedding_model_name)
+            if service is None:
+                service = _rag_services[embedding_model_name] = RAGService(embedding_model_name)
+    return service
+
+def get_optional_rag_service(embedding_model_name: str = 'sentence-transformers/all-MiniLM-L6-v2') -> Optional[RAGService]:
+    """
+    Like get_rag_service, but return None when the embedding model can't be loaded
+    (sentence-transformers missing, model download failed). The failure is remembered, so callers
+    falling back to lexical matching don't try to load the model again on every call.
+    """
+    if embedding_model_name in _rag_failures:
+        return None
+    try:
+        return get_rag_service(embedding_model_name)
+    except Exception as e:
+        with _rag_service_lock:
+            if embedding_model_name not in _rag_failures:
+                _rag_failures[embedding_model_name] = str(e)
+                logger.warning(f"Embedding model '{embedding_model_name}' unavailable, using lexical matching: {e}")
+        return None
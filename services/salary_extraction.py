@@ -0,0 +1,91 @@
+# services/salary_extraction.py
+
+import re
+from typing import Dict, Optional
+
+from utils.misc_utils import parse_amounts
+
+DEFAULT_CURRENCY = "EUR"
+# Pay period -> factor to an annual amount
+PERIODS: Dict[str, float] = {"year": 1.0, "month": 12.0, "hour": 2080.0}
+# Plausible annual amounts; anything else is a year, a team size, a phone number...
+ANNUAL_LIMITS = (8_000, 1_500_000)
+
+_CURRENCY = r"(?:€|\$|£|\beur(?:o|os)?\b|\busd\b|\bchf\b|\bgbp\b)"
+_NUMBER = r"\d{1,3}(?:[.,' \u00a0]\d{3})+|\d+(?:[.,]\d+)?"
+_THOUSANDS = r"(?:\s*(?:k\b|t(?=\s*€|\s*eur)|tsd\.?))?"
+_SALARY = re.compile(
+    rf"(?:{_CURRENCY}\s*)?(?:{_NUMBER}){_THOUSANDS}(?:\s*{_CURRENCY})?"
+    rf"(?:\s*(?:-|–|—|to|bis|and|und)\s*(?:{_CURRENCY}\s*)?(?:{_NUMBER}){_THOUSANDS}(?:\s*{_CURRENCY})?)?",
+    re.IGNORECASE,
+)
+_CURRENCY_IN = re.compile(_CURRENCY, re.IGNORECASE)
+_CURRENCY_CODES = {"€": "EUR", "eur": "EUR", "euro": "EUR", "euros": "EUR", "$": "USD", "usd": "USD", "£": "GBP", "gbp": "GBP", "chf": "CHF"}
+_KEYWORD = re.compile(
+    r"salary|compensation|pay\b|wage|remuneration|gehalt|vergütung|verdienst|lohn|brutto|gross|ote\b",
+    re.IGNORECASE,
+)
+_PERIOD = re.compile(
+    r"(?P<year>per year|a year|/\s*year|annual|annum|p\.\s?a\.?|yearly|jährlich|pro jahr|im jahr|/\s*jahr)"
+    r"|(?P<month>per month|a month|/\s*month|monthly|monatlich|pro monat|im monat|/\s*monat|/\s*mo\b)"
+    r"|(?P<hour>per hour|an hour|/\s*hour|hourly|/\s*h\b|stündlich|pro stunde|/\s*std)",
+    re.IGNORECASE,
+)
+# How far around an amount a salary keyword or a pay period may appear
+_CONTEXT_BEFORE = 80
+_CONTEXT_AFTER = 40
+
+def extract_salary(text: str) -> Optional[Dict]:
+    """
+    Find the advertised salary in a job-ad text.
+    Amounts count only with a currency or a salary keyword nearby; monthly and hourly pay is
+    converted to an annual amount.
+    :param text: Parsed job-ad text.
+    :return: {"min", "max" (annual), "currency", "period", "text"} of the most credible mention, or None.
+    """
+    best = None
+    best_rank = 0
+    for match in _SALARY.finditer(text or ""):
+        span = match.group(0)
+        if not any(ch.isdigit() for ch in span):
+            continue
+        before = text[max(0, match.start() - _CONTEXT_BEFORE):match.start()]
+        after = text[match.end():match.end() + _CONTEXT_AFTER]
+        currency = _CURRENCY_IN.search(span)
+        keyword = _KEYWORD.search(before)
+        if not currency and not keyword:
+            continue
+        amounts = parse_amounts(span)[:2]
+        if not amounts:
+            continue
+        low, high = amounts[0], amounts[-1]
+        if high >= 1000 and low < high / 100:
+            low *= 1000  # "50-70k"
+        if low > high:
+            low, high = high, low
+        period_match = _PERIOD.search(after)
+        if period_match:
+            period = period_match.lastgroup
+        elif high < 1000:
+            period = "hour"
+        elif high < 20_000:
+            period = "month"
+        else:
+            period = "year"
+        factor = PERIODS[period]
+        annual_low, annual_high = low * factor, high * factor
+        if not (ANNUAL_LIMITS[0] <= annual_low and annual_high <= ANNUAL_LIMITS[1]):
+            continue
+        # Prefer mentions with both a currency and a keyword, then ranges over single amounts
+        rank = bool(currency) + bool(keyword) + (len(amounts) > 1)
+        if rank > best_rank:
+            code = _CURRENCY_CODES.get(currency.group(0).lower(), DEFAULT_CURRENCY) if currency else DEFAULT_CURRENCY
+            best = {
+                "min": round(annual_low, 2),
+                "max": round(annual_high, 2),
+                "currency": code,
+                "period": period,
+                "text": span.strip(),
+            }
+            best_rank = rank
+    return best
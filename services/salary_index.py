@@ -0,0 +1,236 @@
+# services/salary_index.py
+
+import json
+import os
+import re
+import tempfile
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, Optional, Set, Tuple
+
+import numpy as np
+
+from services.salary_extraction import DEFAULT_CURRENCY
+
+DEFAULT_INDEX_PATH = Path(os.getenv("SALARY_INDEX_PATH", Path.home() / ".local" / "share" / "vacalyser" / "salary_index.npz"))
+# Fewer matching ads than this and a query widens its scope (location -> title -> similar titles)
+MIN_SAMPLES = 5
+PERCENTILES = (10, 25, 50, 75, 90)
+
+_GENDER_MARKER = re.compile(r"\(\s*(?:[mwfdx]|all genders?|div)(?:\s*/\s*(?:[mwfdx]|div))*\s*\)|\b[mwfd]/[mwfd](?:/[mwfdx])?\b", re.IGNORECASE)
+_NON_WORD = re.compile(r"[\W_]+")
+
+def normalize_title(title: str) -> str:
+    """Title cluster key: lowercase words without gender markers or punctuation ("Data Engineer (m/w/d)" -> "data engineer")."""
+    return " ".join(_NON_WORD.sub(" ", _GENDER_MARKER.sub(" ", title or "").lower()).split())
+
+def normalize_location(location: str) -> str:
+    """Location key: the city part, lowercase ("Berlin, Germany" -> "berlin")."""
+    return re.split(r"[,/(|]", location or "", maxsplit=1)[0].strip().lower()
+
+@dataclass
+class SalaryBenchmark:
+    """
+    Salary statistics of the ads matching a query (annual amounts).
+    :param scope: What matched: "title+location", "title" or "similar titles".
+    :param count: Number of ads.
+    :param percentiles: Percentile -> midpoint salary.
+    :param suggested_min: Median of the advertised minimums.
+    :param suggested_max: Median of the advertised maximums.
+    """
+    scope: str
+    count: int
+    currency: str
+    percentiles: Dict[int, float]
+    suggested_min: float
+    suggested_max: float
+
+class SalaryIndex:
+    def __init__(self, arrays: Dict[str, np.ndarray]):
+        """
+        Columnar salary index: one row per ad with title cluster, location and currency codes and the
+        annual minimum/maximum, sorted by title cluster so a title's ads are one contiguous slice.
+        Build it with SalaryIndex.build and persist it with save/load (a single .npz file).
+        """
+        self.titles: np.ndarray = arrays["titles"]
+        self.locations: np.ndarray = arrays["locations"]
+        self.currencies: np.ndarray = arrays["currencies"]
+        self.title_code: np.ndarray = arrays["title_code"]
+        self.location_code: np.ndarray = arrays["location_code"]
+        self.currency_code: np.ndarray = arrays["currency_code"]
+        self.low: np.ndarray = arrays["low"]
+        self.high: np.ndarray = arrays["high"]
+        self.title_offsets: np.ndarray = arrays["title_offsets"]
+        self._title_lookup = {str(title): code for code, title in enumerate(self.titles)}
+        self._location_lookup = {str(location): code for code, location in enumerate(self.locations)}
+        self._currency_lookup = {str(currency): code for code, currency in enumerate(self.currencies)}
+        # word -> title clusters containing it, for "similar titles" queries
+        self._title_words: Dict[str, Set[int]] = {}
+        for code, title in enumerate(self.titles):
+            for word in str(title).split():
+                self._title_words.setdefault(word, set()).add(code)
+
+    def __len__(self) -> int:
+        return len(self.low)
+
+    @classmethod
+    def build(cls, rows: Iterable[Tuple[str, str, str, float, float]]) -> "SalaryIndex":
+        """
+        Build an index from (job title, location, currency, annual min, annual max) rows.
+        Rows without a title are skipped.
+        """
+        title_ids: Dict[str, int] = {}
+        location_ids: Dict[str, int] = {"": 0}
+        currency_ids: Dict[str, int] = {}
+        titles, locations, currencies, lows, highs = [], [], [], [], []
+        for title, location, currency, low, high in rows:
+            title = normalize_title(title)
+            if not title:
+                continue
+            titles.append(title_ids.setdefault(title, len(title_ids)))
+            locations.append(location_ids.setdefault(normalize_location(location), len(location_ids)))
+            currencies.append(currency_ids.setdefault(currency or DEFAULT_CURRENCY, len(currency_ids)))
+            lows.append(low)
+            highs.append(high)
+
+        title_code = np.asarray(titles, dtype=np.int32)
+        order = np.argsort(title_code, kind="stable")
+        title_code = title_code[order]
+        arrays = {
+            "titles": np.array(list(title_ids), dtype=str),
+            "locations": np.array(list(location_ids), dtype=str),
+            "currencies": np.array(list(currency_ids) or [DEFAULT_CURRENCY], dtype=str),
+            "title_code": title_code,
+            "location_code": np.asarray(locations, dtype=np.int32)[order],
+            "currency_code": np.asarray(currencies, dtype=np.int16)[order],
+            "low": np.asarray(lows, dtype=np.float32)[order],
+            "high": np.asarray(highs, dtype=np.float32)[order],
+            "title_offsets": np.searchsorted(title_code, np.arange(len(title_ids) + 1)).astype(np.int64),
+        }
+        return cls(arrays)
+
+    def save(self, path: Path = DEFAULT_INDEX_PATH):
+        """Write the index atomically as one uncompressed .npz file."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as file:
+                np.savez(
+                    file, titles=self.titles, locations=self.locations, currencies=self.currencies,
+                    title_code=self.title_code, location_code=self.location_code, currency_code=self.currency_code,
+                    low=self.low, high=self.high, title_offsets=self.title_offsets,
+                )
+            os.replace(tmp_path, path)
+        except Exception:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+
+    @classmethod
+    def load(cls, path: Path = DEFAULT_INDEX_PATH) -> "SalaryIndex":
+        with np.load(Path(path), allow_pickle=False) as data:
+            return cls({name: data[name] for name in data.files})
+
+    def _rows_of(self, codes: Iterable[int]) -> np.ndarray:
+        slices = [np.arange(self.title_offsets[c], self.title_offsets[c + 1]) for c in codes]
+        return np.concatenate(slices) if slices else np.zeros(0, dtype=np.int64)
+
+    def _similar_titles(self, title: str) -> Set[int]:
+        """Title clusters containing every word of the title, e.g. "senior data engineer" for "data engineer"."""
+        sets = [self._title_words.get(word, set()) for word in title.split()]
+        return set.intersection(*sets) if sets else set()
+
+    def benchmark(self, title: str, location: str = "", currency: str = DEFAULT_CURRENCY) -> Optional[SalaryBenchmark]:
+        """
+        Salary percentiles for a job title, narrowed to the location when it has enough ads.
+        :param title: Job title (normalized like the indexed titles).
+        :param location: Optional location.
+        :param currency: Only ads in this currency are counted.
+        :return: The benchmark, or None if no ads match.
+        """
+        currency_code = self._currency_lookup.get(currency)
+        title_key = normalize_title(title)
+        if currency_code is None or not title_key:
+            return None
+        exact = self._title_lookup.get(title_key)
+        candidates = []
+        if exact is not None:
+            rows = self._rows_of([exact])
+            rows = rows[self.currency_code[rows] == currency_code]
+            location_code = self._location_lookup.get(normalize_location(location))
+            if location_code:
+                local = rows[self.location_code[rows] == location_code]
+                candidates.append(("title+location", local))
+            candidates.append(("title", rows))
+        similar = self._rows_of(sorted(self._similar_titles(title_key)))
+        candidates.append(("similar titles", similar[self.currency_code[similar] == currency_code]))
+
+        # The narrowest scope with enough ads, otherwise the widest one that has any
+        scope, rows = next(((s, r) for s, r in candidates if len(r) >= MIN_SAMPLES), candidates[-1])
+        if not len(rows):
+            scope, rows = next(((s, r) for s, r in candidates if len(r)), (None, rows))
+        if not len(rows):
+            return None
+        low, high = self.low[rows], self.high[rows]
+        values = np.percentile((low + high) / 2, PERCENTILES)
+        return SalaryBenchmark(
+            scope=scope,
+            count=int(len(rows)),
+            currency=currency,
+            percentiles={p: round(float(v), 2) for p, v in zip(PERCENTILES, values)},
+            suggested_min=round(float(np.median(low)), 2),
+            suggested_max=round(float(np.median(high)), 2),
+        )
+
+def iter_salary_rows(paths: Iterable[Path]) -> Iterator[Tuple[str, str, str, float, float]]:
+    """
+    Yield index rows from batch analysis results ('cli.py analyze' output, JSONL or Parquet).
+    Results without an extracted salary or job title are skipped.
+    """
+    for path in paths:
+        if Path(path).suffix.lower() == ".parquet":
+            yield from _iter_parquet_rows(path)
+            continue
+        with open(path, "r", encoding="utf-8") as file:
+            for line in file:
+                line = line.strip()
+                if not line:
+                    continue
+                result = json.loads(line)
+                salary = result.get("salary")
+                fields = result.get("fields") or {}
+                if salary and fields.get("job_title"):
+                    yield fields["job_title"], fields.get("location") or "", salary["currency"], salary["min"], salary["max"]
+
+def _iter_parquet_rows(path: Path) -> Iterator[Tuple[str, str, str, float, float]]:
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ImportError("Please install 'pyarrow' to read Parquet results.")
+    columns = ["job_title", "location", "salary_currency", "salary_min", "salary_max"]
+    for batch in pq.ParquetFile(str(path)).iter_batches(columns=columns):
+        for title, location, currency, low, high in zip(*(batch.column(c).to_pylist() for c in columns)):
+            if title and low is not None:
+                yield title, location or "", currency, low, high
+
+_salary_index: Optional[SalaryIndex] = None
+_salary_index_mtime: Optional[float] = None
+_salary_index_lock = threading.Lock()
+
+def get_salary_index(path: Path = DEFAULT_INDEX_PATH) -> Optional[SalaryIndex]:
+    """Return the process-wide SalaryIndex (reloaded when the file changes), or None if none was built."""
+    global _salary_index, _salary_index_mtime
+    try:
+        mtime = Path(path).stat().st_mtime
+    except OSError:
+        return None
+    if _salary_index is None or _salary_index_mtime != mtime:
+        with _salary_index_lock:
+            if _salary_index is None or _salary_index_mtime != mtime:
+                _salary_index = SalaryIndex.load(path)
+                _salary_index_mtime = mtime
+    return _salary_index
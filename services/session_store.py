@@ -0,0 +1,174 @@
+# services/session_store.py
+
+import atexit
+import logging
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+DEFAULT_DB_PATH = Path(os.getenv("SESSION_STORE_PATH", Path.home() / ".cache" / "vacalyser" / "sessions.sqlite3"))
+# A failed batch write is retried after RETRY_DELAY seconds, doubling up to MAX_RETRY_DELAY
+RETRY_DELAY = 1.0
+MAX_RETRY_DELAY = 60.0
+
+logger = logging.getLogger(__name__)
+
+class SessionStore:
+    def __init__(self, db_path: Path = DEFAULT_DB_PATH, debounce: float = 2.0, max_delay: float = 10.0, ttl_days: float = 30.0):
+        """
+        Persist wizard snapshots in SQLite with write-behind batching.
+        save() only records the latest snapshot per session in memory; a background thread writes
+        snapshots once a session has been quiet for `debounce` seconds (or at most `max_delay`
+        seconds after its first unsaved change), batching all due sessions into one transaction.
+        A failed write is logged and its snapshots are queued again, retried with exponential backoff.
+        The store is local to one host: SQLite's WAL mode needs shared memory, so the database must
+        not sit on a network file system, and several replicas need sticky sessions.
+        :param db_path: SQLite database file on a local disk.
+        :param debounce: Quiet period before a session snapshot is written.
+        :param max_delay: Upper bound on how long a changed session may stay unsaved.
+        :param ttl_days: Sessions not updated for this long are purged on startup.
+        """
+        self.db_path = Path(db_path)
+        self.debounce = debounce
+        self.max_delay = max_delay
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS sessions ("
+            " session_id TEXT PRIMARY KEY, payload BLOB NOT NULL, updated_at REAL NOT NULL)"
+        )
+        self._conn.execute("DELETE FROM sessions WHERE updated_at < ?", (time.time() - ttl_days * 86400,))
+        self._db_lock = threading.Lock()
+
+        # session_id -> (payload, first_change, last_change)
+        self._pending: Dict[str, Tuple[bytes, float, float]] = {}
+        self._cond = threading.Condition()
+        self._closed = False
+        self._retry_at = 0.0
+        self._writer = threading.Thread(target=self._write_loop, name="session-store-writer", daemon=True)
+        self._writer.start()
+        atexit.register(self.close)
+
+    def save(self, session_id: str, payload: bytes):
+        """Schedule a snapshot for writing; later saves of the same session replace it."""
+        now = time.monotonic()
+        with self._cond:
+            previous = self._pending.get(session_id)
+            first_change = previous[1] if previous else now
+            self._pending[session_id] = (payload, first_change, now)
+            self._cond.notify()
+
+    def load(self, session_id: str) -> Optional[bytes]:
+        """
+        Return the latest snapshot of a session, or None. Unsaved snapshots of this process are
+        served first; another process only sees a snapshot once it is written (up to max_delay
+        seconds later).
+        """
+        with self._cond:
+            pending = self._pending.get(session_id)
+        if pending:
+            return pending[0]
+        with self._db_lock:
+            row = self._conn.execute("SELECT payload FROM sessions WHERE session_id = ?", (session_id,)).fetchone()
+        return row[0] if row else None
+
+    def delete(self, session_id: str):
+        with self._cond:
+            self._pending.pop(session_id, None)
+        with self._db_lock:
+            self._conn.execute("DELETE FROM sessions WHERE session_id = ?", (session_id,))
+
+    def flush(self):
+        """Write all pending snapshots immediately."""
+        with self._cond:
+            batch = self._take_due(force=True)
+        self._write_batch(batch)
+
+    def close(self):
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify()
+        self._writer.join(timeout=5)
+        try:
+            self.flush()
+        except Exception as e:
+            logger.error(f"Session store flush failed on close: {e}")
+
+    def _due_at(self, entry: Tuple[bytes, float, float]) -> float:
+        _, first_change, last_change = entry
+        return min(last_change + self.debounce, first_change + self.max_delay)
+
+    def _take_due(self, force: bool = False) -> Dict[str, bytes]:
+        now = time.monotonic()
+        due = [sid for sid, entry in self._pending.items() if force or self._due_at(entry) <= now]
+        return {sid: self._pending.pop(sid)[0] for sid in due}
+
+    def _requeue(self, batch: Dict[str, bytes]):
+        """Put back the snapshots of a failed write, unless a session was saved again meanwhile."""
+        now = time.monotonic()
+        with self._cond:
+            for sid, payload in batch.items():
+                self._pending.setdefault(sid, (payload, now - self.max_delay, now))
+
+    def _write_loop(self):
+        backoff = 0.0
+        while True:
+            with self._cond:
+                while not self._closed:
+                    if self._pending:
+                        due = min(self._due_at(e) for e in self._pending.values())
+                        wait = max(due, self._retry_at) - time.monotonic()
+                        if wait <= 0:
+                            break
+                        self._cond.wait(wait)
+                    else:
+                        self._cond.wait()
+                if self._closed:
+                    return
+                batch = self._take_due()
+            try:
+                self._write_batch(batch)
+                backoff = 0.0
+            except Exception as e:
+                backoff = min(backoff * 2 or RETRY_DELAY, MAX_RETRY_DELAY)
+                logger.error(f"Session store write failed, retrying {len(batch)} session(s) in {backoff:g}s: {e}")
+                self._requeue(batch)
+                with self._cond:
+                    self._retry_at = time.monotonic() + backoff
+
+    def _write_batch(self, batch: Dict[str, bytes]):
+        if not batch:
+            return
+        now = time.time()
+        rows = [(sid, sqlite3.Binary(payload), now) for sid, payload in batch.items()]
+        with self._db_lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.executemany(
+                    "INSERT INTO sessions (session_id, payload, updated_at) VALUES (?, ?, ?) "
+                    "ON CONFLICT(session_id) DO UPDATE SET payload = excluded.payload, updated_at = excluded.updated_at",
+                    rows,
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+_session_store: Optional[SessionStore] = None
+_session_store_lock = threading.Lock()
+
+def get_session_store() -> SessionStore:
+    """Return the process-wide SessionStore."""
+    global _session_store
+    if _session_store is None:
+        with _session_store_lock:
+            if _session_store is None:
+                _session_store = SessionStore()
+    return _session_store
@@ -0,0 +1,264 @@
+# services/skill_taxonomy.py
+
+import difflib
+import functools
+import json
+import os
+import re
+import threading
+from collections import deque
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+DEFAULT_TAXONOMY_PATH = Path(
+    os.getenv("SKILL_TAXONOMY_PATH", Path(__file__).resolve().parent.parent / "data" / "skills_taxonomy.json")
+)
+# difflib ratio from which a typo is suggested as the skill ("pyhton" -> "python"); shorter terms get no suggestion.
+# Suggestions are never applied automatically: ordinary words are this close to skills too ("trust" -> "rust").
+FUZZY_CUTOFF = 0.8
+FUZZY_MIN_LENGTH = 4
+# Cosine similarity from which the embedding fallback accepts a skill
+EMBEDDING_THRESHOLD = 0.7
+
+_VERSION_SUFFIX = re.compile(r"\s*v?\d+(?:\.\d+)*\+?$")
+_SPLIT_TERMS = re.compile(r"[,;\n]")
+
+def _key(term: str) -> str:
+    """Lookup key of a term: lowercase, single spaces, no surrounding punctuation (but keep "c++", "c#", ".net")."""
+    return " ".join(term.lower().split()).strip(" \t-–•*:;,()[]\"'")
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch == "_"
+
+@dataclass(frozen=True)
+class Skill:
+    id: str
+    name: str
+    category: str
+
+@dataclass(frozen=True)
+class SkillMatch:
+    """
+    A raw skill term resolved to the taxonomy.
+    :param skill: The canonical skill.
+    :param term: The raw term (or the matched text span).
+    :param method: "exact", "contains", "fuzzy" or "embedding".
+    :param score: 1.0 for exact matches, otherwise the similarity.
+    """
+    skill: Skill
+    term: str
+    method: str
+    score: float = 1.0
+
+class AhoCorasick:
+    def __init__(self, patterns: Dict[str, int]):
+        """
+        Aho-Corasick automaton: finds all occurrences of many patterns in one pass over a text,
+        in time linear in the text length (plus the number of matches).
+        :param patterns: Pattern -> payload (e.g. a skill number).
+        """
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[Tuple[int, int]]] = [[]]  # (pattern length, payload) ending at a node
+        for pattern, payload in patterns.items():
+            node = 0
+            for ch in pattern:
+                nxt = self._goto[node].get(ch)
+                if nxt is None:
+                    nxt = self._goto[node][ch] = len(self._goto)
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                node = nxt
+            self._out[node].append((len(pattern), payload))
+        # Breadth-first: failure links point to the longest proper suffix that is also a trie path
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, nxt in self._goto[node].items():
+                queue.append(nxt)
+                fail = self._fail[node]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[nxt] = self._goto[fail].get(ch, 0)
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, int, int]]:
+        """Yield (start, end, payload) of every pattern occurrence, overlapping ones included."""
+        goto, fail, out = self._goto, self._fail, self._out
+        node = 0
+        for i, ch in enumerate(text):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            for length, payload in out[node]:
+                yield i + 1 - length, i + 1, payload
+
+class SkillTaxonomy:
+    def __init__(self, path: Path = DEFAULT_TAXONOMY_PATH):
+        """
+        Canonical skill taxonomy (data/skills_taxonomy.json): skills with ids, names, categories and
+        aliases. Raw terms resolve through exact alias lookup, then skills contained in the term,
+        then (optionally) embedding similarity. Fuzzy matches of likely typos are only offered
+        through suggest().
+        Aliases listed as "ambiguous" (like "go", "r" or "excel") only match a whole term, never
+        inside free text.
+        """
+        with open(path, "r", encoding="utf-8") as file:
+            data = json.load(file)
+        self.skills: List[Skill] = []
+        self._by_key: Dict[str, int] = {}
+        text_patterns: Dict[str, int] = {}
+        for number, entry in enumerate(data["skills"]):
+            self.skills.append(Skill(entry["id"], entry["name"], entry.get("category", "")))
+            ambiguous = {_key(term) for term in entry.get("ambiguous", [])}
+            for term in [entry["name"], entry["id"].replace("_", " "), *entry.get("aliases", [])]:
+                key = _key(term)
+                if not key:
+                    continue
+                self._by_key.setdefault(key, number)
+                if key not in ambiguous:
+                    text_patterns.setdefault(key, number)
+        self.by_id: Dict[str, Skill] = {skill.id: skill for skill in self.skills}
+        self._keys = list(self._by_key)
+        self._automaton = AhoCorasick(text_patterns)
+        self._skill_vectors = None
+        self._lookup = functools.lru_cache(maxsize=65536)(self._lookup_uncached)
+
+    def _scan(self, text: str) -> List[Tuple[int, int, int]]:
+        """Whole-word, leftmost-longest, non-overlapping skill mentions in lowercase text."""
+        matches = sorted(
+            (
+                (start, end, number)
+                for start, end, number in self._automaton.iter_matches(text)
+                if (start == 0 or not _is_word_char(text[start - 1])) and (end == len(text) or not _is_word_char(text[end]))
+            ),
+            key=lambda m: (m[0], m[0] - m[1]),
+        )
+        selected = []
+        last_end = 0
+        for start, end, number in matches:
+            if start >= last_end:
+                selected.append((start, end, number))
+                last_end = end
+        return selected
+
+    def _lookup_uncached(self, term: str, fuzzy: bool = False) -> Tuple[SkillMatch, ...]:
+        key = _key(term)
+        if not key:
+            return ()
+        number = self._by_key.get(key)
+        if number is None:
+            number = self._by_key.get(_VERSION_SUFFIX.sub("", key))  # "Python 3.11", "Java 17"
+        if number is not None:
+            return (SkillMatch(self.skills[number], term, "exact"),)
+        found = list(dict.fromkeys(number for _, _, number in self._scan(key)))
+        if found:
+            return tuple(SkillMatch(self.skills[number], term, "contains") for number in found)
+        if fuzzy and len(key) >= FUZZY_MIN_LENGTH:
+            close = difflib.get_close_matches(key, self._keys, n=1, cutoff=FUZZY_CUTOFF)
+            if close:
+                score = difflib.SequenceMatcher(None, key, close[0]).ratio()
+                return (SkillMatch(self.skills[self._by_key[close[0]]], term, "fuzzy", round(score, 3)),)
+        return ()
+
+    def lookup(self, term: str) -> List[SkillMatch]:
+        """
+        Resolve one raw term without embeddings. A term naming several skills ("Python/SQL")
+        resolves to all of them. Misspellings don't resolve (see suggest).
+        """
+        return list(self._lookup(term))
+
+    def suggest(self, term: str) -> Optional[SkillMatch]:
+        """
+        Closest skill for a term the taxonomy doesn't resolve, e.g. "Pyhton" -> Python, to offer
+        to the user. It is only a guess ("Trust" is as close to Rust), so callers must not apply
+        it without confirmation.
+        :return: A "fuzzy" SkillMatch, or None if the term resolves or nothing is close.
+        """
+        if self._lookup(term):
+            return None
+        matches = self._lookup(term, True)
+        return matches[0] if matches else None
+
+    def _embedding_matches(self, terms: List[str], rag) -> List[Optional[SkillMatch]]:
+        if self._skill_vectors is None:
+            self._skill_vectors = rag.embed([skill.name for skill in self.skills])
+        similarity = rag.embed(terms) @ self._skill_vectors.T
+        best = similarity.argmax(axis=1)
+        return [
+            SkillMatch(self.skills[b], term, "embedding", round(float(similarity[i, b]), 3))
+            if similarity[i, b] >= EMBEDDING_THRESHOLD else None
+            for i, (term, b) in enumerate(zip(terms, best))
+        ]
+
+    def normalize_many(self, terms: Iterable[str], rag=None, use_embeddings: bool = True) -> List[List[SkillMatch]]:
+        """
+        Resolve many raw terms; terms the taxonomy doesn't know are embedded in one batch and
+        matched to the closest skill name.
+        :param terms: Raw skill terms.
+        :param rag: RAGService (default: the shared service if the embedding model can be loaded).
+        :param use_embeddings: False skips the embedding fallback.
+        :return: Matches per term (empty if unknown).
+        """
+        terms = list(terms)
+        results = [self.lookup(term) for term in terms]
+        unknown = list(dict.fromkeys(term for term, found in zip(terms, results) if not found and _key(term)))
+        if unknown and use_embeddings:
+            if rag is None:
+                try:
+                    from services.rag_service import get_optional_rag_service
+                    rag = get_optional_rag_service()
+                except ImportError:
+                    rag = None
+            if rag is not None:
+                resolved = dict(zip(unknown, self._embedding_matches(unknown, rag)))
+                results = [found or ([resolved[term]] if resolved.get(term) else []) for term, found in zip(terms, results)]
+        return results
+
+    def canonicalize(self, items: Iterable[str], use_embeddings: bool = True) -> List[str]:
+        """
+        Map a skill list (items may be comma-separated strings) to canonical skill names.
+        Unknown terms, misspellings included, are kept as typed; duplicates are dropped.
+        """
+        terms = [term.strip() for item in items for term in _SPLIT_TERMS.split(item or "") if term.strip()]
+        names = []
+        for term, matches in zip(terms, self.normalize_many(terms, use_embeddings=use_embeddings)):
+            if matches:
+                names.extend(match.skill.name for match in matches)
+            else:
+                names.append(term)
+        return list(dict.fromkeys(names))
+
+    def extract(self, text: str) -> List[SkillMatch]:
+        """
+        Find the taxonomy skills mentioned in a text (e.g. an imported job ad) in a single linear
+        pass; each skill is reported once, at its first mention.
+        """
+        text = " ".join((text or "").lower().split())
+        seen = {}
+        for start, end, number in self._scan(text):
+            if number not in seen:
+                seen[number] = SkillMatch(self.skills[number], text[start:end], "exact")
+        return list(seen.values())
+
+_skill_taxonomy: Optional[SkillTaxonomy] = None
+_skill_taxonomy_lock = threading.Lock()
+
+def get_skill_taxonomy() -> SkillTaxonomy:
+    """Return the process-wide SkillTaxonomy."""
+    global _skill_taxonomy
+    if _skill_taxonomy is None:
+        with _skill_taxonomy_lock:
+            if _skill_taxonomy is None:
+                _skill_taxonomy = SkillTaxonomy()
+    return _skill_taxonomy
+
+def canonicalize_skills(items: Iterable[str], use_embeddings: bool = False) -> List[str]:
+    """
+    Canonical names for a skill list (see SkillTaxonomy.canonicalize).
+    Embeddings are off by default: this runs in wizard callbacks, where loading the model would
+    block the click and a merely similar skill would silently replace what the user typed.
+    """
+    return get_skill_taxonomy().canonicalize(items, use_embeddings=use_embeddings)
@@ -0,0 +1,156 @@
+# services/template_engine.py
+
+import functools
+import html
+import re
+from pathlib import Path
+from typing import Callable, Dict, FrozenSet, List
+
+TEMPLATE_DIR = Path(__file__).resolve().parent.parent / "templates"
+DEFAULT_LOCALE = "en"
+# Output format -> (file extension, escape function for substituted values)
+FORMATS: Dict[str, tuple] = {
+    "markdown": (".md", str),
+    "html": (".html", functools.partial(html.escape, quote=True)),
+    "text": (".txt", str),
+}
+
+# {{ name }}, {{ name | default }}, {{ . }}, {{#name}}, {{?name}}, {{^name}}, {{/name}}
+_TAG = re.compile(r"\{\{\s*([#?^/]?)\s*([\w.]+)\s*(?:\|\s*(.*?)\s*)?\}\}")
+# A section tag alone on its line produces no output, not even the line break
+_STANDALONE = re.compile(r"^[ \t]*(\{\{\s*[#?^/][^}]*\}\})[ \t]*\r?\n", re.MULTILINE)
+
+def _text(value, default: str = "") -> str:
+    """Value as output text: None/empty -> default, lists are comma-joined."""
+    if value is None or value == "" or value == []:
+        return default
+    if isinstance(value, (list, tuple)):
+        return ", ".join(str(v) for v in value)
+    return str(value)
+
+def _iterate(value):
+    """Items a section repeats over: every list item, or the value once if truthy."""
+    if isinstance(value, (list, tuple)):
+        return value
+    return (value,) if value else ()
+
+class TemplateSyntaxError(ValueError):
+    pass
+
+class Template:
+    def __init__(self, source: str, fmt: str = "markdown", name: str = "<string>"):
+        """
+        Logic-less template, compiled once into a Python function.
+        Syntax: {{ field }} (with {{ field | default }}), {{#field}}...{{/field}} repeats for each
+        list item (or renders once if the field is truthy) with the item as {{ . }},
+        {{?field}}...{{/field}} renders once if the field is non-empty (e.g. a list heading)
+        and {{^field}}...{{/field}} renders if it is empty.
+        :param source: Template text.
+        :param fmt: Output format (key of FORMATS); selects how substituted values are escaped.
+        :param name: Name used in error messages.
+        """
+        if fmt not in FORMATS:
+            raise ValueError(f"Unsupported template format: {fmt}")
+        self.name = name
+        self.fmt = fmt
+        self._escape = FORMATS[fmt][1]
+        code, fields = self._compile(_STANDALONE.sub(r"\1", source))
+        namespace = {"_text": _text, "_iterate": _iterate}
+        exec(compile(code, f"<template {name}>", "exec"), namespace)
+        self._render: Callable = namespace["render"]
+        self.fields: FrozenSet[str] = frozenset(fields)
+
+    def _compile(self, source: str):
+        lines = ["def render(ctx, esc):", "    out = []", "    a = out.append"]
+        fields = set()
+        stack: List[tuple] = []  # (field name, loop variable)
+        pos = 0
+
+        def emit(line: str):
+            lines.append("    " * (len(stack) + 1) + line)
+
+        def current_item() -> str:
+            if not stack:
+                raise TemplateSyntaxError(f"{self.name}: '{{{{ . }}}}' outside of a section")
+            return stack[-1][1]
+
+        for match in _TAG.finditer(source):
+            if match.start() > pos:
+                emit(f"a({source[pos:match.start()]!r})")
+            pos = match.end()
+            kind, field, default = match.groups()
+            if kind == "/":
+                if not stack or stack[-1][0] != field:
+                    raise TemplateSyntaxError(f"{self.name}: unexpected {{{{/{field}}}}}")
+                stack.pop()
+                continue
+            value = current_item() if field == "." else f"ctx.get({field!r})"
+            if field != ".":
+                fields.add(field)
+            if kind == "#":
+                loop_var = f"item{len(lines)}"
+                emit(f"for {loop_var} in _iterate({value}):")
+                stack.append((field, loop_var))
+            elif kind == "?":
+                emit(f"if {value}:")
+                stack.append((field, stack[-1][1] if stack else "None"))
+            elif kind == "^":
+                emit(f"if not {value}:")
+                # Inside conditional sections "." still refers to the enclosing item
+                stack.append((field, stack[-1][1] if stack else "None"))
+            else:
+                emit(f"a(esc(_text({value}, {(default or '')!r})))")
+        if stack:
+            raise TemplateSyntaxError(f"{self.name}: unclosed section {{{{#{stack[-1][0]}}}}}")
+        if pos < len(source):
+            emit(f"a({source[pos:]!r})")
+        lines.append("    return ''.join(out)")
+        return "\n".join(lines), fields
+
+    def render(self, data=None, **extra) -> str:
+        """
+        Render with the template's fields taken from data (a dict or an object such as JobProfile);
+        keyword arguments add or override fields.
+        """
+        ctx = {}
+        if data is not None:
+            get = data.get if isinstance(data, dict) else functools.partial(getattr, data)
+            for name in self.fields:
+                ctx[name] = get(name, None)
+        ctx.update(extra)
+        return self._render(ctx, self._escape)
+
+def template_path(name: str, locale: str = DEFAULT_LOCALE, fmt: str = "markdown") -> Path:
+    """Path of templates/<name>.<locale><ext>, falling back to the default locale."""
+    ext = FORMATS[fmt][0] if fmt in FORMATS else ""
+    path = TEMPLATE_DIR / f"{name}.{locale}{ext}"
+    if not path.exists() and locale != DEFAULT_LOCALE:
+        path = TEMPLATE_DIR / f"{name}.{DEFAULT_LOCALE}{ext}"
+    return path
+
+@functools.lru_cache(maxsize=64)
+def _load_template(path: Path, fmt: str, mtime: float) -> Template:
+    return Template(path.read_text(encoding="utf-8"), fmt=fmt, name=path.name)
+
+def get_template(name: str, locale: str = DEFAULT_LOCALE, fmt: str = "markdown") -> Template:
+    """
+    Return the compiled template for name/locale/format. Templates are compiled once and
+    recompiled only when the file changes.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Unsupported template format: {fmt}")
+    path = template_path(name, locale, fmt)
+    try:
+        mtime = path.stat().st_mtime
+    except OSError:
+        raise FileNotFoundError(f"No template '{name}' for locale '{locale}' and format '{fmt}'.")
+    return _load_template(path, fmt, mtime)
+
+def available_locales(name: str, fmt: str = "markdown") -> List[str]:
+    """Locales with a template file for name/format, e.g. ["de", "en"]."""
+    ext = FORMATS[fmt][0]
+    return sorted(p.name[len(name) + 1:-len(ext)] for p in TEMPLATE_DIR.glob(f"{name}.*{ext}"))
+
+def render_template(name: str, data=None, locale: str = DEFAULT_LOCALE, fmt: str = "markdown", **extra) -> str:
+    """Render a named template (see get_template and Template.render)."""
+    return get_template(name, locale, fmt).render(data, **extra)
@@ -0,0 +1,318 @@
+# services/web_fetcher.py
+
+import hashlib
+import ipaddress
+import json
+import os
+import re
+import socket
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from html.parser import HTMLParser
+from pathlib import Path
+from typing import Dict, Optional
+from urllib.parse import urljoin, urlsplit
+
+DEFAULT_CACHE_DIR = Path(os.getenv("FETCH_CACHE_DIR", Path.home() / ".cache" / "vacalyser" / "http"))
+USER_AGENT = "Vacalyser/1.0 (+job-ad analysis)"
+MAX_REDIRECTS = 5
+
+def check_url(url: str, allow_private: bool = False) -> str:
+    """
+    Validate a user-supplied URL before fetching it: http(s) only, with a host that resolves, and
+    (unless allow_private) only to public addresses, so the app can't be pointed at loopback,
+    private networks or link-local services such as cloud metadata (169.254.169.254).
+    :return: The URL, stripped.
+    :raises ValueError: If the URL is not acceptable.
+    """
+    url = (url or "").strip()
+    parts = urlsplit(url)
+    if parts.scheme not in ("http", "https") or not parts.hostname:
+        raise ValueError(f"Unsupported URL: {url}")
+    try:
+        port = parts.port or (443 if parts.scheme == "https" else 80)
+        infos = socket.getaddrinfo(parts.hostname, port, proto=socket.IPPROTO_TCP)
+    except (OSError, ValueError) as e:
+        raise ValueError(f"Cannot resolve host '{parts.hostname}': {e}")
+    if not allow_private:
+        for info in infos:
+            address = ipaddress.ip_address(info[4][0].split("%", 1)[0])
+            if address.version == 6 and address.ipv4_mapped:
+                address = address.ipv4_mapped
+            if not address.is_global or address.is_multicast:
+                raise ValueError(f"Refusing to fetch {url}: '{parts.hostname}' resolves to non-public address {address}")
+    return url
+
+def _response_socket(resp) -> Optional[socket.socket]:
+    """The socket under a streamed requests response (urllib3 internals), or None."""
+    sock = getattr(getattr(resp.raw, "_connection", None), "sock", None)
+    if sock is None:
+        try:
+            sock = resp.raw._fp.fp.raw._sock
+        except AttributeError:
+            return None
+    return sock
+
+@dataclass
+class FetchResult:
+    url: str
+    text: str
+    content_type: str = ""
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    fetched_at: float = 0.0
+    from_cache: bool = False
+
+class WebFetcher:
+    def __init__(
+        self,
+        cache_dir: Path = DEFAULT_CACHE_DIR,
+        cache_ttl: float = 3600.0,
+        max_bytes: int = 2 * 1024 * 1024,
+        connect_timeout: float = 5.0,
+        read_timeout: float = 10.0,
+        total_timeout: float = 20.0,
+        max_per_host: int = 2,
+        pool_maxsize: int = 10,
+        allow_private: bool = False,
+    ):
+        """
+        Fetch job-ad and company pages over a pooled keep-alive session.
+        Responses are reduced to plain text and cached on disk; stale entries are revalidated
+        with a conditional GET (ETag / Last-Modified) instead of being downloaded again.
+        :param cache_dir: Directory for the on-disk response cache.
+        :param cache_ttl: Seconds a cached response is served without revalidation.
+        :param max_bytes: Maximum response body size; larger responses are aborted.
+        :param connect_timeout: Socket connect timeout in seconds.
+        :param read_timeout: Socket read timeout in seconds.
+        :param total_timeout: Wall-clock limit for downloading a single response.
+        :param max_per_host: Maximum concurrent requests per host.
+        :param pool_maxsize: Connections kept alive per host in the pool.
+        :param allow_private: Also fetch hosts on loopback/private/link-local addresses (see check_url).
+        """
+        try:
+            import requests
+            from requests.adapters import HTTPAdapter
+        except ImportError:
+            raise ImportError("Please install 'requests' to fetch URLs.")
+        self.cache_dir = Path(cache_dir)
+        self.cache_ttl = cache_ttl
+        self.max_bytes = max_bytes
+        self.timeout = (connect_timeout, read_timeout)
+        self.total_timeout = total_timeout
+        self.max_per_host = max_per_host
+        self.allow_private = allow_private
+
+        self._session = requests.Session()
+        self._session.headers.update({"User-Agent": USER_AGENT, "Accept": "text/html,text/plain;q=0.9,*/*;q=0.5"})
+        adapter = HTTPAdapter(pool_connections=pool_maxsize, pool_maxsize=pool_maxsize, max_retries=1)
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+        self._host_slots: Dict[str, threading.BoundedSemaphore] = {}
+        self._host_lock = threading.Lock()
+
+    def fetch(self, url: str) -> FetchResult:
+        """
+        Fetch a URL and return its text content, using and refreshing the on-disk cache.
+        :param url: http(s) URL to fetch.
+        :return: FetchResult with the extracted text.
+        :raises ValueError: If the URL is rejected by check_url.
+        """
+        url = check_url(url, self.allow_private)
+        parts = urlsplit(url)
+
+        cached = self._load_cached(url)
+        if cached and time.time() - cached.fetched_at < self.cache_ttl:
+            cached.from_cache = True
+            return cached
+
+        headers = {}
+        if cached:
+            if cached.etag:
+                headers["If-None-Match"] = cached.etag
+            if cached.last_modified:
+                headers["If-Modified-Since"] = cached.last_modified
+
+        try:
+            with self._host_slot(parts.netloc.lower()):
+                with self._open(url, headers) as resp:
+                    if resp.status_code == 304 and cached:
+                        cached.fetched_at = time.time()
+                        self._store_cached(cached)
+                        cached.from_cache = True
+                        return cached
+                    resp.raise_for_status()
+                    body = self._read_limited(resp)
+                    content_type = resp.headers.get("Content-Type", "")
+                    etag = resp.headers.get("ETag")
+                    last_modified = resp.headers.get("Last-Modified")
+                    encoding = resp.encoding if "charset" in content_type.lower() else None
+        except Exception as e:
+            raise RuntimeError(f"Failed to fetch {url}: {e}")
+
+        raw = body.decode(encoding or "utf-8", errors="ignore")
+        text = html_to_text(raw) if "html" in content_type.lower() or raw.lstrip()[:1] == "<" else raw
+        result = FetchResult(
+            url=url,
+            text=text,
+            content_type=content_type,
+            etag=etag,
+            last_modified=last_modified,
+            fetched_at=time.time(),
+        )
+        self._store_cached(result)
+        return result
+
+    def fetch_text(self, url: str) -> str:
+        """Convenience wrapper returning only the extracted text."""
+        return self.fetch(url).text
+
+    def _open(self, url: str, headers: Dict[str, str]):
+        """GET a URL as a stream, following redirects by hand so every hop passes check_url."""
+        for _ in range(MAX_REDIRECTS + 1):
+            resp = self._session.get(url, headers=headers, timeout=self.timeout, stream=True, allow_redirects=False)
+            if not resp.is_redirect:
+                return resp
+            location = urljoin(url, resp.headers["Location"])
+            resp.close()
+            url = check_url(location, self.allow_private)
+        raise RuntimeError(f"More than {MAX_REDIRECTS} redirects")
+
+    def _read_limited(self, resp) -> bytes:
+        """
+        Read a streamed response body, enforcing the size and wall-clock limits.
+        The socket read timeout only bounds each read, so a timer shuts the socket down at the
+        deadline; a stalled or trickling download can't outlive total_timeout.
+        """
+        declared = resp.headers.get("Content-Length")
+        if declared and declared.isdigit() and int(declared) > self.max_bytes:
+            raise RuntimeError(f"Response too large ({declared} bytes, limit {self.max_bytes})")
+        expired = threading.Event()
+
+        def abort():
+            expired.set()
+            sock = _response_socket(resp)
+            if sock is not None:
+                try:
+                    sock.shutdown(socket.SHUT_RDWR)
+                except OSError:
+                    pass
+
+        timer = threading.Timer(self.total_timeout, abort)
+        timer.daemon = True
+        timer.start()
+        chunks = []
+        size = 0
+        try:
+            for chunk in resp.iter_content(chunk_size=64 * 1024):
+                size += len(chunk)
+                if size > self.max_bytes:
+                    raise RuntimeError(f"Response exceeded {self.max_bytes} bytes")
+                if expired.is_set():
+                    break
+                chunks.append(chunk)
+        except Exception:
+            if not expired.is_set():
+                raise
+        finally:
+            timer.cancel()
+        if expired.is_set():
+            raise RuntimeError(f"Download exceeded {self.total_timeout}s")
+        return b"".join(chunks)
+
+    @contextmanager
+    def _host_slot(self, host: str):
+        """Limit the number of in-flight requests per host."""
+        with self._host_lock:
+            slot = self._host_slots.get(host)
+            if slot is None:
+                slot = self._host_slots[host] = threading.BoundedSemaphore(self.max_per_host)
+        with slot:
+            yield
+
+    def _cache_path(self, url: str) -> Path:
+        return self.cache_dir / (hashlib.sha256(url.encode("utf-8")).hexdigest() + ".json")
+
+    def _load_cached(self, url: str) -> Optional[FetchResult]:
+        try:
+            with open(self._cache_path(url), "r", encoding="utf-8") as f:
+                return FetchResult(**json.load(f))
+        except (OSError, ValueError, TypeError):
+            return None
+
+    def _store_cached(self, result: FetchResult):
+        data = asdict(result)
+        data["from_cache"] = False
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            # Write to a temp file and rename so concurrent readers never see a partial entry
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self._cache_path(result.url))
+        except OSError:
+            pass  # the cache is an optimization only
+
+class _TextExtractor(HTMLParser):
+    """Collects visible text from HTML, one block element per line; list items become '- ' bullets."""
+
+    SKIP_TAGS = {"script", "style", "noscript", "template", "svg", "head", "iframe"}
+    BLOCK_TAGS = {
+        "p", "div", "section", "article", "header", "footer", "main", "aside", "nav", "br",
+        "h1", "h2", "h3", "h4", "h5", "h6", "ul", "ol", "table", "tr", "blockquote", "pre",
+    }
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts = []
+        self._skip_depth = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in self.SKIP_TAGS:
+            self._skip_depth += 1
+        elif tag == "li":
+            self.parts.append("\n- ")
+        elif tag in ("td", "th"):
+            self.parts.append(" ")
+        elif tag in self.BLOCK_TAGS:
+            self.parts.append("\n")
+
+    def handle_endtag(self, tag):
+        if tag in self.SKIP_TAGS:
+            self._skip_depth = max(0, self._skip_depth - 1)
+        elif tag in self.BLOCK_TAGS or tag == "li":
+            self.parts.append("\n")
+
+    def handle_data(self, data):
+        if not self._skip_depth:
+            # Source line breaks are insignificant in HTML; structure comes from block tags
+            self.parts.append(data.replace("\n", " "))
+
+_SPACES = re.compile(r"[ \t\r\f\v ]+")
+
+def html_to_text(html: str) -> str:
+    """
+    Convert an HTML document to readable plain text (scripts, styles and <head> removed).
+    :param html: HTML source.
+    :return: Text with one block per line and blank lines collapsed.
+    """
+    parser = _TextExtractor()
+    parser.feed(html)
+    parser.close()
+    lines = (_SPACES.sub(" ", line).strip() for line in "".join(parser.parts).split("\n"))
+    return "\n".join(line for line in lines if line and line != "-")
+
+_web_fetcher: Optional[WebFetcher] = None
+_web_fetcher_lock = threading.Lock()
+
+def get_web_fetcher() -> WebFetcher:
+    """Return the process-wide WebFetcher, so all sessions share one connection pool and cache."""
+    global _web_fetcher
+    if _web_fetcher is None:
+        with _web_fetcher_lock:
+            if _web_fetcher is None:
+                _web_fetcher = WebFetcher()
+    return _web_fetcher
@@ -0,0 +1,49 @@
+# tests/test_export_service.py
+
+import json
+import zipfile
+
+import pytest
+
+pytest.importorskip("numpy")
+fitz = pytest.importorskip("fitz")
+docx = pytest.importorskip("docx")
+
+from models.job_profile import JobProfile
+from services.export_service import EXPORT_FORMATS, export_profile, export_zip
+
+PROFILE = JobProfile(
+    job_title="Data Engineer",
+    company_name="Acme",
+    tasks=["Build Python pipelines", "Own the SQL models"],
+    must_have_hard=["Python", "SQL"],
+)
+
+@pytest.mark.parametrize("fmt", list(EXPORT_FORMATS))
+def test_export_each_format(fmt, tmp_path):
+    path = export_profile(PROFILE, fmt, cache_dir=tmp_path)
+    assert path.suffix == EXPORT_FORMATS[fmt][0]
+    if fmt == "pdf":
+        with fitz.open(path) as document:
+            assert document.page_count >= 1
+            assert "Data Engineer" in document[0].get_text()
+    elif fmt == "docx":
+        text = "\n".join(paragraph.text for paragraph in docx.Document(str(path)).paragraphs)
+        assert "Data Engineer" in text
+    elif fmt == "html":
+        assert "Data Engineer" in path.read_text(encoding="utf-8")
+    else:
+        assert json.loads(path.read_text(encoding="utf-8"))["job_title"] == "Data Engineer"
+    # No temporary files are left behind, and an unchanged profile is served from the cache
+    assert [p.name for p in tmp_path.iterdir()] == [path.name]
+    assert export_profile(PROFILE, fmt, cache_dir=tmp_path) == path
+
+def test_export_zip_has_no_errors(tmp_path):
+    archive_path = tmp_path / "exports.zip"
+    with open(archive_path, "wb") as out:
+        counts = export_zip([("1", PROFILE)], out, cache_dir=tmp_path / "cache")
+    assert counts == {"files": len(EXPORT_FORMATS), "errors": 0}
+    with zipfile.ZipFile(archive_path) as archive:
+        assert "errors.txt" not in archive.namelist()
+        with fitz.open(stream=archive.read("1/data-engineer.pdf"), filetype="pdf") as document:
+            assert document.page_count >= 1
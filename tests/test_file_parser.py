@@ -0,0 +1,27 @@
+# tests/test_file_parser.py
+
+import pytest
+
+pytest.importorskip("PyPDF2")
+
+from services.file_parser import parse_file
+
+def test_path_without_suffix_is_read_as_text(tmp_path):
+    path = tmp_path / "job_ad"
+    path.write_text("Data Engineer\n- Build pipelines", encoding="utf-8")
+    assert parse_file(path) == "Data Engineer\n- Build pipelines"
+    assert parse_file(str(path)) == "Data Engineer\n- Build pipelines"
+
+def test_path_without_suffix_is_sniffed_as_pdf(tmp_path, monkeypatch):
+    path = tmp_path / "cv"
+    path.write_bytes(b"%PDF-1.4\n")
+    seen = []
+    monkeypatch.setattr("services.file_parser.extract_text_from_pdf", lambda source: seen.append(source) or "pdf text")
+    assert parse_file(path) == "pdf text"
+    assert seen == [path]
+
+def test_unknown_suffix_is_still_rejected(tmp_path):
+    path = tmp_path / "image.png"
+    path.write_bytes(b"\x89PNG")
+    with pytest.raises(ValueError, match="Unsupported file type"):
+        parse_file(path)
@@ -0,0 +1,23 @@
+# tests/test_skill_taxonomy.py
+
+import pytest
+
+from services.skill_taxonomy import canonicalize_skills, get_skill_taxonomy
+
+# Ordinary words within difflib's cutoff of a skill name; they must stay as typed
+LOOKALIKES = ["Trust", "Shift", "Table", "Reach", "Scale", "Locker", "Fragile", "Rugby", "Porch"]
+
+@pytest.mark.parametrize("term", LOOKALIKES)
+def test_lookalike_words_are_not_rewritten(term):
+    assert get_skill_taxonomy().lookup(term) == []
+    assert canonicalize_skills([term]) == [term]
+
+def test_aliases_and_contained_skills_still_resolve():
+    assert canonicalize_skills(["py", "Python 3.11", "SQL, Docker"]) == ["Python", "SQL", "Docker"]
+
+def test_misspellings_are_only_suggested():
+    taxonomy = get_skill_taxonomy()
+    assert canonicalize_skills(["Pyhton"]) == ["Pyhton"]
+    suggestion = taxonomy.suggest("Pyhton")
+    assert suggestion is not None and suggestion.skill.name == "Python" and suggestion.method == "fuzzy"
+    assert taxonomy.suggest("Python") is None
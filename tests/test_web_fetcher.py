@@ -0,0 +1,134 @@
+# tests/test_web_fetcher.py
+
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+pytest.importorskip("requests")
+
+from services import web_fetcher
+from services.web_fetcher import WebFetcher, check_url
+
+PAGE = b"<html><head><title>x</title></head><body><h1>Data Engineer</h1><ul><li>Python</li></ul></body></html>"
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Local stand-in for job-ad sites; records the conditional headers it receives."""
+
+    requests_seen = []
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        StubHandler.requests_seen.append((self.path, self.headers.get("If-None-Match")))
+        if self.path == "/page":
+            if self.headers.get("If-None-Match") == '"v1"':
+                self.send_response(304)
+                self.send_header("ETag", '"v1"')
+                self.end_headers()
+                return
+            self._send(PAGE, etag='"v1"')
+        elif self.path == "/declared-large":
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain")
+            self.send_header("Content-Length", str(10 * 1024 * 1024))
+            self.end_headers()
+        elif self.path == "/undeclared-large":
+            # No Content-Length: the size limit has to be enforced while reading
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain")
+            self.send_header("Connection", "close")
+            self.end_headers()
+            for _ in range(8):
+                self.wfile.write(b"x" * 64 * 1024)
+        elif self.path == "/stall":
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain")
+            self.send_header("Content-Length", "1000")
+            self.end_headers()
+            self.wfile.write(b"partial")
+            self.wfile.flush()
+            time.sleep(3)
+        elif self.path == "/to-metadata":
+            self.send_response(302)
+            self.send_header("Location", "http://169.254.169.254/latest/meta-data/")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+        else:
+            self.send_error(404)
+
+    def _send(self, body: bytes, etag: str = None):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        if etag:
+            self.send_header("ETag", etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+@pytest.fixture(scope="module")
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    httpd.daemon_threads = True
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+@pytest.fixture
+def fetcher(tmp_path):
+    return WebFetcher(cache_dir=tmp_path, cache_ttl=0, max_bytes=256 * 1024, read_timeout=5, total_timeout=1, allow_private=True)
+
+def test_fetch_extracts_text(server, fetcher):
+    result = fetcher.fetch(f"{server}/page")
+    assert result.text == "Data Engineer\n- Python"
+    assert result.etag == '"v1"'
+    assert not result.from_cache
+
+def test_stale_entry_is_revalidated_with_etag(server, fetcher):
+    fetcher.fetch(f"{server}/page")
+    StubHandler.requests_seen.clear()
+    result = fetcher.fetch(f"{server}/page")
+    assert StubHandler.requests_seen == [("/page", '"v1"')]
+    assert result.from_cache
+    assert result.text == "Data Engineer\n- Python"
+
+def test_fresh_entry_is_served_without_request(server, tmp_path):
+    fetcher = WebFetcher(cache_dir=tmp_path, cache_ttl=3600, allow_private=True)
+    fetcher.fetch(f"{server}/page")
+    StubHandler.requests_seen.clear()
+    assert fetcher.fetch(f"{server}/page").from_cache
+    assert StubHandler.requests_seen == []
+
+def test_declared_size_limit(server, fetcher):
+    with pytest.raises(RuntimeError, match="too large"):
+        fetcher.fetch(f"{server}/declared-large")
+
+def test_streamed_size_limit(server, fetcher):
+    with pytest.raises(RuntimeError, match="exceeded"):
+        fetcher.fetch(f"{server}/undeclared-large")
+
+def test_stalled_download_stops_at_total_timeout(server, fetcher):
+    started = time.monotonic()
+    with pytest.raises(RuntimeError, match="Download exceeded"):
+        fetcher.fetch(f"{server}/stall")
+    # read_timeout is 5s; the deadline must cut the stalled read off after total_timeout (1s)
+    assert time.monotonic() - started < 2.5
+
+def test_private_addresses_are_rejected(server, tmp_path):
+    fetcher = WebFetcher(cache_dir=tmp_path)
+    with pytest.raises(ValueError, match="non-public"):
+        fetcher.fetch(f"{server}/page")
+    for url in ("http://169.254.169.254/latest/meta-data/", "http://10.0.0.1/", "http://[::1]/", "ftp://example.com/"):
+        with pytest.raises(ValueError):
+            check_url(url)
+
+def test_redirect_to_private_address_is_rejected(server, fetcher, monkeypatch):
+    # Allow only the stub server itself, so the redirect target gets the regular check
+    strict = web_fetcher.check_url
+    monkeypatch.setattr(web_fetcher, "check_url", lambda url, allow_private=False: strict(url, url.startswith(server)))
+    with pytest.raises(RuntimeError, match="non-public"):
+        fetcher.fetch(f"{server}/to-metadata")
@@ -1,6 +1,8 @@
 # utils/misc_utils.py
 
-from typing import List
+import re
+from dataclasses import dataclass
+from typing import Iterator, List, Optional, Tuple
 
 def format_list_as_bullets(items: List[str]) -> str:
     """
@@ -10,6 +12,102 @@ def format_list_as_bullets(items: List[str]) -> str:
     """
     return "\n".join(f"- {item}" for item in items)
 
+# A bullet or numbered list item on its own line: "- x", "• x", "1. x", "1.2 x", "2) x", "(3) x", "a) x", "iv) x".
+# Dashes and asterisks need a following space so "**bold**" or "-5%" lines are not taken as bullets;
+# bullet glyphs from PDF text extraction often come without one.
+# The pattern starts with a literal newline instead of ^ in MULTILINE mode, which lets the regex engine
+# jump from line start to line start; texts are searched with a "\n" prepended. The lookahead is a
+# pre-filter on the first character of the line (indentation or a possible marker), so most prose
+# lines are rejected by one character-class test instead of trying every marker alternative.
+_BULLET = re.compile(
+    r"\n(?=[^\S\n]|[-*–—•▪◦‣○●■□➢►✓✔·\d(a-z])"
+    r"(?P<indent>[^\S\n]*)"
+    r"(?P<marker>[-*–—][^\S\n]+|[•▪◦‣○●■□➢►✓✔·][^\S\n]*"
+    r"|(?:\d{1,3}(?:\.\d{1,3})+\.?|\d{1,3}[.)]|\(\d{1,3}\)|\(?[a-z]\)|\(?[ivx]{1,4}\))[^\S\n]+)"
+    r"(?P<text>[^\n]*\S)"
+)
+# Only the item text, for the plain extraction (findall then returns strings directly)
+_BULLET_TEXT = re.compile(
+    _BULLET.pattern.replace("(?P<indent>", "(?:").replace("(?P<marker>", "(?:").replace("(?P<text>", "(")
+)
+
+@dataclass(frozen=True)
+class BulletPoint:
+    """
+    A list item found in a text.
+    :param text: Item text without marker.
+    :param start: Offset of the item text in the source text.
+    :param end: Offset just past the item text.
+    :param marker: The bullet or number, e.g. "-", "•", "2.", "1.3", "b)".
+    :param level: Nesting depth (0 for top-level items), from indentation and dotted numbering.
+    """
+    text: str
+    start: int
+    end: int
+    marker: str
+    level: int = 0
+
+def iter_bullet_points(text: str) -> Iterator[BulletPoint]:
+    """
+    Yield the bullet and numbered items of a text in order, with offsets and nesting level.
+    The whole text is scanned with one compiled regex instead of line by line.
+    :param text: Input text, e.g. a parsed job ad.
+    """
+    indents: List[int] = []  # indentation of the open nesting levels
+    for match in _BULLET.finditer("\n" + text):
+        indent = len(match.group("indent").expandtabs(4))
+        while indents and indents[-1] > indent:
+            indents.pop()
+        if not indents or indents[-1] < indent:
+            indents.append(indent)
+        marker = match.group("marker").strip()
+        dotted = marker.rstrip(".").count(".") if marker[:1].isdigit() else 0
+        yield BulletPoint(
+            text=match.group("text"),
+            start=match.start("text") - 1,
+            end=match.end("text") - 1,
+            marker=marker,
+            level=max(len(indents) - 1, dotted),
+        )
+
+def extract_bullet_points(text: str) -> List[str]:
+    """
+    Extract bullet or numbered lines (potential tasks) from a text.
+    Use iter_bullet_points for offsets and nesting levels.
+    :param text: Input text, e.g. a parsed job ad.
+    :return: Cleaned bullet texts, duplicates removed while preserving order.
+    """
+    return list(dict.fromkeys(_BULLET_TEXT.findall("\n" + text)))
+
+# Amounts like "50000", "50,000", "50.000", "50 000", "55.5k", "60 T€"
+_AMOUNT = re.compile(r"(?<![\d.,])(\d{1,3}(?:[.,' \u00a0]\d{3})+|\d+(?:[.,]\d+)?)\s*([kK]|T(?=\s*€|\s*EUR|\b))?")
+_THOUSANDS = re.compile(r"^\d{1,3}(?:[.,' \u00a0]\d{3})+$")
+
+def parse_amounts(text: str) -> List[float]:
+    """
+    Parse the money amounts in a text, understanding thousands separators and "k" suffixes.
+    :param text: E.g. "50.000 - 70.000 €" or "$55k-65k".
+    :return: Amounts in order of appearance, e.g. [50000.0, 70000.0].
+    """
+    amounts = []
+    for number, suffix in _AMOUNT.findall(text or ""):
+        if _THOUSANDS.match(number):
+            value = float(re.sub(r"\D", "", number))
+        else:
+            value = float(number.replace(",", "."))
+        amounts.append(value * 1000 if suffix else value)
+    return amounts
+
+def parse_salary_range(text: str) -> Optional[Tuple[float, float]]:
+    """
+    Parse a salary range like "50,000-70,000" or "60k"; a single amount gives (amount, amount).
+    :return: (minimum, maximum), or None if the text contains no amount.
+    """
+    amounts = parse_amounts(text)
+    if not amounts:
+        return None
+    return amounts[0], amounts[1] if len(amounts) > 1 else amounts[0]
+
 def sanitize_text(text: str) -> str:
     """
     Basic text sanitization: trims and normalizes whitespace.
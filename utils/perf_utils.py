@@ -0,0 +1,233 @@
+# utils/perf_utils.py
+
+import functools
+import os
+import threading
+import time
+import tracemalloc
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional
+
+BUFFER_SIZE = int(os.getenv("PERF_BUFFER_SIZE", "2000"))
+# Upper bounds (seconds) of the wall-time histogram buckets in the Prometheus export
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+@dataclass
+class PerfSample:
+    name: str
+    kind: str
+    started: float  # unix time
+    wall: float  # seconds
+    cpu: float  # seconds of CPU time of the measuring thread
+    alloc: Optional[int]  # net bytes allocated (only while tracemalloc is tracing)
+    error: bool
+
+class _Aggregate:
+    __slots__ = ("count", "errors", "wall", "cpu", "alloc", "buckets")
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.wall = 0.0
+        self.cpu = 0.0
+        self.alloc = 0
+        self.buckets = [0] * len(LATENCY_BUCKETS)
+
+class PerfRecorder:
+    def __init__(self, buffer_size: int = BUFFER_SIZE):
+        """
+        Collects timing samples: the latest buffer_size samples in a ring buffer (for the debug
+        panel), plus cumulative per-(kind, name) counters that never drop data (for the export).
+        :param buffer_size: Number of recent samples kept.
+        """
+        self._samples = deque(maxlen=buffer_size)
+        self._totals: Dict[tuple, _Aggregate] = {}
+        self._lock = threading.Lock()
+
+    def record(self, sample: PerfSample):
+        with self._lock:
+            self._samples.append(sample)
+            agg = self._totals.get((sample.kind, sample.name))
+            if agg is None:
+                agg = self._totals[(sample.kind, sample.name)] = _Aggregate()
+            agg.count += 1
+            agg.errors += sample.error
+            agg.wall += sample.wall
+            agg.cpu += sample.cpu
+            agg.alloc += sample.alloc or 0
+            for i, bound in enumerate(LATENCY_BUCKETS):
+                if sample.wall <= bound:
+                    agg.buckets[i] += 1
+
+    def samples(self) -> List[PerfSample]:
+        """Recent samples, oldest first."""
+        with self._lock:
+            return list(self._samples)
+
+    def clear(self):
+        with self._lock:
+            self._samples.clear()
+            self._totals.clear()
+
+    def summary(self) -> List[Dict]:
+        """
+        Per-(kind, name) statistics over the samples in the ring buffer, slowest mean first.
+        :return: Dicts with kind, name, count, errors, mean/p95/max wall ms, mean CPU ms and mean allocated KB.
+        """
+        groups: Dict[tuple, List[PerfSample]] = {}
+        for sample in self.samples():
+            groups.setdefault((sample.kind, sample.name), []).append(sample)
+        rows = []
+        for (kind, name), group in groups.items():
+            walls = sorted(s.wall for s in group)
+            allocs = [s.alloc for s in group if s.alloc is not None]
+            rows.append({
+                "kind": kind,
+                "name": name,
+                "count": len(group),
+                "errors": sum(s.error for s in group),
+                "mean_ms": round(sum(walls) / len(walls) * 1000, 2),
+                "p95_ms": round(walls[min(len(walls) - 1, int(len(walls) * 0.95))] * 1000, 2),
+                "max_ms": round(walls[-1] * 1000, 2),
+                "cpu_ms": round(sum(s.cpu for s in group) / len(group) * 1000, 2),
+                "alloc_kb": round(sum(allocs) / len(allocs) / 1024, 1) if allocs else None,
+            })
+        rows.sort(key=lambda row: row["mean_ms"], reverse=True)
+        return rows
+
+    def prometheus_text(self) -> str:
+        """Render the cumulative counters in the Prometheus text exposition format."""
+        with self._lock:
+            totals = sorted(self._totals.items())
+            totals = [(key, (agg.count, agg.errors, agg.wall, agg.cpu, agg.alloc, list(agg.buckets))) for key, agg in totals]
+        lines = [
+            "# HELP vacalyser_calls_total Instrumented calls.",
+            "# TYPE vacalyser_calls_total counter",
+        ]
+        lines += [f"vacalyser_calls_total{_labels(k, n)} {v[0]}" for (k, n), v in totals]
+        lines += ["# HELP vacalyser_call_errors_total Instrumented calls that raised.", "# TYPE vacalyser_call_errors_total counter"]
+        lines += [f"vacalyser_call_errors_total{_labels(k, n)} {v[1]}" for (k, n), v in totals]
+        lines += ["# HELP vacalyser_call_cpu_seconds_total CPU time of instrumented calls.", "# TYPE vacalyser_call_cpu_seconds_total counter"]
+        lines += [f"vacalyser_call_cpu_seconds_total{_labels(k, n)} {v[3]:.6f}" for (k, n), v in totals]
+        lines += ["# HELP vacalyser_call_alloc_bytes_total Net bytes allocated by instrumented calls (while tracing).", "# TYPE vacalyser_call_alloc_bytes_total counter"]
+        lines += [f"vacalyser_call_alloc_bytes_total{_labels(k, n)} {v[4]}" for (k, n), v in totals]
+        lines += ["# HELP vacalyser_call_seconds Wall time of instrumented calls.", "# TYPE vacalyser_call_seconds histogram"]
+        for (kind, name), (count, _, wall, _, _, buckets) in totals:
+            for bound, bucket in zip(LATENCY_BUCKETS, buckets):
+                lines.append(f"vacalyser_call_seconds_bucket{_labels(kind, name, le=str(bound))} {bucket}")
+            lines.append(f"vacalyser_call_seconds_bucket{_labels(kind, name, le='+Inf')} {count}")
+            lines.append(f"vacalyser_call_seconds_sum{_labels(kind, name)} {wall:.6f}")
+            lines.append(f"vacalyser_call_seconds_count{_labels(kind, name)} {count}")
+        return "\n".join(lines) + "\n"
+
+def _labels(kind: str, name: str, **extra) -> str:
+    pairs = {"kind": kind, "name": name, **extra}
+    body = ",".join(f'{k}="{_escape_label(v)}"' for k, v in pairs.items())
+    return "{" + body + "}"
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+_perf_recorder: Optional[PerfRecorder] = None
+_perf_recorder_lock = threading.Lock()
+
+def get_perf_recorder() -> PerfRecorder:
+    """Return the process-wide PerfRecorder."""
+    global _perf_recorder
+    if _perf_recorder is None:
+        with _perf_recorder_lock:
+            if _perf_recorder is None:
+                _perf_recorder = PerfRecorder()
+    return _perf_recorder
+
+def set_alloc_tracing(enabled: bool):
+    """Start or stop tracemalloc. Allocation tracking slows Python down noticeably; enable it for debugging only."""
+    if enabled and not tracemalloc.is_tracing():
+        tracemalloc.start()
+    elif not enabled and tracemalloc.is_tracing():
+        tracemalloc.stop()
+
+if os.getenv("PERF_TRACEMALLOC") == "1":
+    set_alloc_tracing(True)
+
+@contextmanager
+def measure(name: str, kind: str = "call"):
+    """
+    Record wall time, CPU time (of the current thread) and, while tracemalloc is tracing,
+    net allocated bytes of the enclosed block.
+    Control-flow exceptions that aren't Exceptions (e.g. Streamlit's rerun/stop) are not counted as errors.
+    :param name: What is measured (e.g., "LLMService.complete").
+    :param kind: Category such as "page", "service" or "rerun".
+    """
+    tracing = tracemalloc.is_tracing()
+    alloc_before = tracemalloc.get_traced_memory()[0] if tracing else 0
+    started = time.time()
+    wall_start = time.perf_counter()
+    cpu_start = time.thread_time()
+    error = False
+    try:
+        yield
+    except Exception:
+        error = True
+        raise
+    finally:
+        wall = time.perf_counter() - wall_start
+        cpu = time.thread_time() - cpu_start
+        alloc = tracemalloc.get_traced_memory()[0] - alloc_before if tracing and tracemalloc.is_tracing() else None
+        get_perf_recorder().record(PerfSample(name, kind, started, wall, cpu, alloc, error))
+
+def profiled(name: Optional[str] = None, kind: str = "call") -> Callable:
+    """
+    Decorator version of measure().
+    :param name: Sample name (default: the function's qualified name).
+    :param kind: Category such as "page" or "service".
+    """
+    def decorator(func):
+        label = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with measure(label, kind):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = get_perf_recorder().prometheus_text().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+_metrics_server: Optional[ThreadingHTTPServer] = None
+
+def start_metrics_server(port: Optional[int] = None, host: str = "127.0.0.1") -> Optional[ThreadingHTTPServer]:
+    """
+    Serve the Prometheus export at http://host:port/metrics from a daemon thread, once per process.
+    :param port: Port to listen on (default: PERF_METRICS_PORT; nothing is started if unset).
+    :param host: Interface to bind; localhost by default so only a local scraper can read it.
+    """
+    global _metrics_server
+    port = port or int(os.getenv("PERF_METRICS_PORT", "0"))
+    if not port:
+        return None
+    with _perf_recorder_lock:
+        if _metrics_server is None:
+            try:
+                _metrics_server = ThreadingHTTPServer((host, port), _MetricsHandler)
+            except OSError as e:
+                print(f"Warning: Could not start metrics server on {host}:{port}: {e}")
+                return None
+            threading.Thread(target=_metrics_server.serve_forever, name="perf-metrics", daemon=True).start()
+    return _metrics_server
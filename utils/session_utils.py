@@ -1,5 +1,17 @@
 # utils/session_utils.py
+import json
+import logging
+import os
+import uuid
 import streamlit as st
+from models.job_profile import JobProfile, PROFILE_FIELDS
+from services.session_store import get_session_store
+
+logger = logging.getLogger(__name__)
+
+PROFILE_KEY = "job_profile"
+SESSION_ID_PARAM = "sid"
+_PROFILE_FIELDS = frozenset(PROFILE_FIELDS)
 
 def init_main_state():
     """
@@ -9,10 +21,91 @@ def init_main_state():
     if "current_section" not in st.session_state:
         st.session_state["current_section"] = 1
 
+def current_tenant_id() -> str:
+    """Tenant whose saved profiles this deployment reads and writes (TENANT_ID env var or secret)."""
+    tenant = os.getenv("TENANT_ID")
+    if not tenant:
+        try:
+            tenant = st.secrets.get("TENANT_ID", "default")
+        except Exception:
+            tenant = "default"
+    return tenant
+
+def get_profile() -> JobProfile:
+    """Return the session's JobProfile, creating an empty one on first access."""
+    profile = st.session_state.get(PROFILE_KEY)
+    if profile is None:
+        profile = JobProfile()
+        st.session_state[PROFILE_KEY] = profile
+    return profile
+
 def store_in_state(key: str, value):
-    """Set st.session_state[key] = value safely."""
-    st.session_state[key] = value
+    """Set a job-profile field, or st.session_state[key] for UI-only keys."""
+    if key in _PROFILE_FIELDS:
+        setattr(get_profile(), key, value)
+    else:
+        st.session_state[key] = value
 
 def get_from_session_state(key: str, default=None):
-    """Get st.session_state[key], or default if missing."""
+    """Get a job-profile field (or st.session_state[key]), or default if not provided yet."""
+    if key in _PROFILE_FIELDS:
+        value = getattr(get_profile(), key)
+        return default if value is None else value
     return st.session_state.get(key, default)
+
+def _get_query_param(name: str):
+    return st.query_params.get(name)
+
+def _set_query_param(name: str, value: str):
+    st.query_params[name] = value
+
+def get_session_id() -> str:
+    """
+    Return the wizard session id. It is kept in the URL (?sid=...), so a reconnect or a page
+    reload finds the same persisted session.
+    """
+    session_id = st.session_state.get("session_id")
+    if session_id is None:
+        session_id = _get_query_param(SESSION_ID_PARAM)
+        if not session_id or len(session_id) != 32 or not session_id.isalnum():
+            session_id = uuid.uuid4().hex
+            _set_query_param(SESSION_ID_PARAM, session_id)
+        st.session_state["session_id"] = session_id
+    return session_id
+
+def restore_session():
+    """
+    Restore the job profile and wizard step from the session store when a new Streamlit
+    session starts. Call once per run in app.py, before rendering.
+    """
+    if PROFILE_KEY in st.session_state:
+        return
+    try:
+        payload = get_session_store().load(get_session_id())
+    except Exception as e:
+        logger.warning(f"Could not restore session: {e}")
+        payload = None
+    if not payload:
+        return
+    data = json.loads(payload)
+    st.session_state[PROFILE_KEY] = JobProfile.from_dict(data.get("profile", {}))
+    st.session_state["current_section"] = data.get("current_section", 1)
+    st.session_state["persisted_section"] = st.session_state["current_section"]
+
+def persist_session():
+    """
+    Hand a snapshot of the profile and wizard step to the session store if anything changed.
+    The store debounces and batches the actual writes. Call at the end of every run.
+    """
+    profile = st.session_state.get(PROFILE_KEY)
+    section = st.session_state.get("current_section")
+    if profile is None or (not profile.is_dirty and section == st.session_state.get("persisted_section")):
+        return
+    payload = json.dumps({"current_section": section, "profile": profile.to_dict()}, separators=(",", ":"))
+    try:
+        get_session_store().save(get_session_id(), payload.encode("utf-8"))
+    except Exception as e:
+        logger.warning(f"Could not persist session: {e}")
+        return
+    profile.mark_clean()
+    st.session_state["persisted_section"] = section
@@ -1,46 +1,113 @@
 # utils/ui_utils.py
 
 import base64
+import functools
+import os
+import tempfile
+import tracemalloc
 import streamlit as st
 from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+from utils.perf_utils import get_perf_recorder, profiled, set_alloc_tracing
+from utils.session_utils import get_from_session_state, store_in_state
 
-def apply_base_styling():
-    """
-    Insert custom CSS or apply a general theme, including
-    a conditional background image based on the wizard section.
-    """
+# Backgrounds are downsized/recompressed once into STATIC_DIR (served by Streamlit's static file serving,
+# which serves the static/ folder next to the app script). Relative asset paths are resolved against
+# the app directory, not the working directory.
+APP_DIR = Path(__file__).resolve().parent.parent
+STATIC_DIR = APP_DIR / "static"
+BACKGROUND_DIR = STATIC_DIR / "backgrounds"
+# One derived background per width (phone, laptop, desktop viewports); the browser picks one by media query
+BACKGROUND_WIDTHS = (640, 1280, 1920)
+BACKGROUND_MAX_WIDTH = BACKGROUND_WIDTHS[-1]
+DEFAULT_BACKGROUND = "images/AdobeStock_258774440.jpeg"
+SECTION_BACKGROUNDS: Dict[int, str] = {}  # wizard step -> background, for steps with their own image
 
-    # 1) Determine which image to use. If st.session_state["current_section"] == 1, pick image1, else image2.
-    current_section = st.session_state.get("current_section", 1)
+def app_path(path: str) -> Path:
+    """Resolve a repository-relative asset path (e.g. "images/lama.png") against the app directory."""
+    path = Path(path)
+    return path if path.is_absolute() else APP_DIR / path
 
-    if current_section == 1:
-        image_path = Path("images/AdobeStock_258774440.jpeg")
-    else:
-        image_path = Path("images/AdobeStock_567681994.jpeg")
+@functools.lru_cache(maxsize=16)
+def prepare_background(image_path: str, max_width: int = BACKGROUND_MAX_WIDTH) -> Optional[Path]:
+    """
+    Downsize and recompress a background image to WebP once per source version and width.
+    :param image_path: Path of the original image.
+    :param max_width: Maximum width of the derived asset (one of BACKGROUND_WIDTHS).
+    :return: Path of the derived asset, or None if it can't be produced (missing file or Pillow).
+    """
+    source = app_path(image_path)
+    target = BACKGROUND_DIR / f"{source.stem}_{max_width}.webp"
+    try:
+        if target.exists() and target.stat().st_mtime >= source.stat().st_mtime:
+            return target
+        from PIL import Image
+        with Image.open(source) as img:
+            img = img.convert("RGB")
+            img.thumbnail((max_width, max_width * 4))
+            BACKGROUND_DIR.mkdir(parents=True, exist_ok=True)
+            # Write to a temp file and rename so concurrent sessions never serve a partial image
+            fd, tmp_path = tempfile.mkstemp(dir=BACKGROUND_DIR, suffix=".webp")
+            with os.fdopen(fd, "wb") as out:
+                img.save(out, format="WEBP", quality=70, method=6)
+            os.replace(tmp_path, target)
+        return target
+    except Exception as e:
+        print(f"Warning: Could not prepare background {source}: {e}")
+        return None
 
-    # 2) Encode the selected image in base64 to embed in CSS
+@functools.lru_cache(maxsize=16)
+def background_urls(image_path: str) -> Tuple[Tuple[int, str], ...]:
+    """
+    Resolve the CSS urls of a background image, computed once per process.
+    Prefers static file URLs (cached by the browser), one per BACKGROUND_WIDTHS entry;
+    falls back to one cached data URI of the largest size.
+    :return: (width, url) pairs, largest first; a single pair when only one size is available.
+    """
+    if st.get_option("server.enableStaticServing"):
+        urls = []
+        for width in reversed(BACKGROUND_WIDTHS):
+            derived = prepare_background(image_path, width)
+            if derived is not None:
+                urls.append((width, f"app/static/{derived.relative_to(STATIC_DIR).as_posix()}"))
+        if urls:
+            return tuple(urls)
+    source = prepare_background(image_path) or app_path(image_path)
+    mime = "image/webp" if source.suffix == ".webp" else "image/jpeg"
     try:
-        with open(image_path, "rb") as file:
+        with open(source, "rb") as file:
             encoded_image = base64.b64encode(file.read()).decode()
     except Exception as e:
         # Fallback if something goes wrong (e.g., file not found):
-        print(f"Warning: Could not read {image_path}: {e}")
-        encoded_image = ""
+        print(f"Warning: Could not read {source}: {e}")
+        return ()
+    return ((BACKGROUND_MAX_WIDTH, f"data:{mime};base64,{encoded_image}"),)
+
+def _background_rule(url: str) -> str:
+    return (
+        ".stApp { background: linear-gradient(rgba(255,255,255,0.45), rgba(255,255,255,0.45)), "
+        f'url("{url}") no-repeat center center fixed; background-size: cover; }}'
+    )
 
-    # 3) Define our CSS: 
+@functools.lru_cache(maxsize=16)
+def _base_css(backgrounds: Tuple[Tuple[int, str], ...]) -> str:
     # - Add an overlay so text is readable (optional)
     # - Use the .stApp selector to cover the entire Streamlit main area
     # - Use background-size: cover to scale or crop the image for a full-page background
-    css_style = f"""
+    # - Smaller viewports get a smaller image; later media rules win, so they go from large to small
+    rules = []
+    for i, (width, url) in enumerate(backgrounds):
+        if i == 0:
+            rules.append(_background_rule(url))
+        else:
+            rules.append(f"@media (max-width: {width}px) {{ {_background_rule(url)} }}")
+    background_css = "\n    ".join(rules)
+    return f"""
     <style>
     body {{
         font-family: 'Arial', sans-serif;
     }}
-    .stApp {{
-        background: linear-gradient(rgba(255,255,255,0.45), rgba(255,255,255,0.45)),
-                    url("data:image/jpeg;base64,{encoded_image}") no-repeat center center fixed;
-        background-size: cover;
-    }}
+    {background_css}
     .stButton>button {{
         background-color: #4CAF50;
         color: white;
@@ -49,47 +116,251 @@ def apply_base_styling():
     </style>
     """
 
-    # 4) Inject the final style block
-    st.markdown(css_style, unsafe_allow_html=True)
+@profiled(kind="service")
+def apply_base_styling():
+    """
+    Insert custom CSS or apply a general theme, including
+    a conditional background image based on the wizard section.
+    The image is referenced by URL, so each rerun only sends a few hundred bytes of CSS.
+    """
+    current_section = st.session_state.get("current_section", 1)
+    image_path = SECTION_BACKGROUNDS.get(current_section, DEFAULT_BACKGROUND)
+    st.markdown(_base_css(background_urls(image_path)), unsafe_allow_html=True)
 
 def show_sidebar_links():
     """Placeholder for any global nav or links in the sidebar."""
     st.sidebar.markdown("[Home](#)")
     st.sidebar.markdown("[Contact Us](#)")
 
-def display_suggestions(session_key: str, existing_set: set = None, store_key: str = None):
+def perf_panel_enabled() -> bool:
+    """The timing panel is shown with PERF_DEBUG=1 or ?debug=1 in the URL."""
+    if os.getenv("PERF_DEBUG") == "1":
+        return True
+    return st.query_params.get("debug") == "1"
+
+def show_perf_panel():
+    """Debug sidebar panel with recent page, service and rerun timings and the Prometheus export."""
+    recorder = get_perf_recorder()
+    with st.sidebar.expander("⏱ Performance", expanded=False):
+        samples = recorder.samples()
+        reruns = [s for s in samples if s.kind == "rerun"]
+        if reruns:
+            last = reruns[-1]
+            st.caption(f"Last rerun: {last.wall * 1000:.0f} ms wall, {last.cpu * 1000:.0f} ms CPU")
+        rows = recorder.summary()
+        if rows:
+            st.dataframe(rows, use_container_width=True)
+        else:
+            st.caption("No samples yet.")
+        tracing = st.checkbox("Track allocations (tracemalloc)", value=tracemalloc.is_tracing(), key="perf_tracemalloc")
+        set_alloc_tracing(tracing)
+        c1, c2 = st.columns(2)
+        c1.download_button("Metrics", recorder.prometheus_text(), file_name="metrics.txt", mime="text/plain")
+        c2.button("Reset", key="perf_reset", on_click=recorder.clear)
+
+def fragment(func):
+    """
+    Run a page section as an independently re-executable fragment (st.fragment), so a widget
+    inside it reruns only that section.
     """
-    Display AI suggestions as clickable buttons. 
-    If a user clicks one, it's added to 'existing_set' (if provided) 
-    and removed from the suggestion list in session.
+    return st.fragment(func)
+
+def rerun():
+    """Trigger a full app rerun, also from inside a fragment."""
+    st.rerun()
+
+@functools.lru_cache(maxsize=16)
+def load_static_bytes(path: str) -> bytes:
+    """Read a static asset (logo, icon) once per process; relative paths are resolved against the app directory."""
+    with open(app_path(path), "rb") as file:
+        return file.read()
+
+def show_flash_message(session_key: str):
+    """Show (and clear) a (level, text) message left in session by a callback."""
+    message = st.session_state.pop(session_key, None)
+    if message:
+        level, text = message
+        getattr(st, level, st.info)(text)
+
+def go_to_section(delta: int):
+    """on_click callback: move the wizard by delta steps before the next run starts."""
+    st.session_state["current_section"] = st.session_state.get("current_section", 1) + delta
+
+def nav_buttons(back_label: str = "⬅ Back", next_label: str = "Next ➡", show_back: bool = True, show_next: bool = True):
+    """
+    Render the wizard's Back/Next row. Navigation happens in on_click callbacks,
+    so a click costs one rerun instead of a rerun plus st.rerun().
+    """
+    cA, cB = st.columns([1, 1])
+    with cA:
+        if show_back:
+            st.button(back_label, key="nav_back", on_click=go_to_section, args=(-1,))
+    with cB:
+        if show_next:
+            st.button(next_label, key="nav_next", on_click=go_to_section, args=(1,))
+
+def _add_from_input(store_key: str, input_key: str, normalizer: Optional[Callable[[List[str]], List[str]]] = None):
+    """on_click callback: add the text input's value to a list field and clear the input."""
+    value = st.session_state.get(input_key, "").strip()
+    if value:
+        items = [*get_from_session_state(store_key, []), value]
+        store_in_state(store_key, normalizer(items) if normalizer else items)
+    st.session_state[input_key] = ""
+
+def _remove_items(store_key: str, items: List[str]):
+    """Bulk action: remove items from a list field."""
+    drop = set(items)
+    store_in_state(store_key, [i for i in get_from_session_state(store_key, []) if i not in drop])
+
+LIST_PAGE_SIZE = 10
+
+def _selection_key(widget_key: str) -> str:
+    return f"{widget_key}_selected"
+
+def _checkbox_key(widget_key: str, item: str) -> str:
+    return f"{widget_key}_chk_{item}"
+
+def _toggle_selected(widget_key: str, item: str):
+    """on_change callback of an item checkbox: keep the selection across pages."""
+    selected = st.session_state.setdefault(_selection_key(widget_key), set())
+    if st.session_state.get(_checkbox_key(widget_key, item)):
+        selected.add(item)
+    else:
+        selected.discard(item)
+
+def _select_items(widget_key: str, items: List[str], value: bool):
+    """on_click callback: select or deselect a group of items (e.g., the visible page)."""
+    selected = st.session_state.setdefault(_selection_key(widget_key), set())
+    for item in items:
+        if value:
+            selected.add(item)
+        else:
+            selected.discard(item)
+        st.session_state[_checkbox_key(widget_key, item)] = value
+
+def _run_list_action(widget_key: str, action: Callable[[List[str]], None], items: Optional[List[str]]):
+    """on_click callback: apply a bulk action to the given items, or to the current selection."""
+    selected = st.session_state.get(_selection_key(widget_key), set())
+    if items is None:
+        items = [item for item in st.session_state.get(f"{widget_key}_items", []) if item in selected]
+    if items:
+        action(items)
+    for item in items:
+        selected.discard(item)
+        st.session_state.pop(_checkbox_key(widget_key, item), None)
+
+def _set_list_page(widget_key: str, page: int):
+    st.session_state[f"{widget_key}_page"] = page
+
+def paged_list(
+    widget_key: str,
+    items: List[str],
+    actions: Optional[Dict[str, Callable[[List[str]], None]]] = None,
+    page_size: int = LIST_PAGE_SIZE,
+):
+    """
+    Render a long list one page at a time, so the number of widgets per rerun stays constant
+    however many items there are. With actions, each visible item gets a checkbox and every
+    action is offered for the selection and for all items; selections survive paging.
+    :param widget_key: Unique key prefix for the widgets and state of this list.
+    :param items: Items to show (unique strings).
+    :param actions: Bulk actions as {label: callback(items)}; callbacks run before the next rerun.
+    :param page_size: Items rendered per page.
+    """
+    if not items:
+        return
+    actions = actions or {}
+    pages = -(-len(items) // page_size)
+    page = min(max(st.session_state.get(f"{widget_key}_page", 1), 1), pages)
+    window = items[(page - 1) * page_size:page * page_size]
+    st.session_state[f"{widget_key}_items"] = list(items)
+
+    if actions:
+        selected = st.session_state.setdefault(_selection_key(widget_key), set())
+        selected.intersection_update(items)
+        for item in window:
+            checkbox_key = _checkbox_key(widget_key, item)
+            if checkbox_key not in st.session_state:
+                st.session_state[checkbox_key] = item in selected
+            st.checkbox(item, key=checkbox_key, on_change=_toggle_selected, args=(widget_key, item))
+    else:
+        selected = set()
+        st.markdown("\n".join(f"- {item}" for item in window))
+
+    if pages > 1:
+        p1, p2, p3 = st.columns([1, 2, 1])
+        p1.button("◀", key=f"{widget_key}_prev", disabled=page <= 1, on_click=_set_list_page, args=(widget_key, page - 1))
+        p2.caption(f"Page {page} of {pages} ({len(items)} items)")
+        p3.button("▶", key=f"{widget_key}_next", disabled=page >= pages, on_click=_set_list_page, args=(widget_key, page + 1))
+
+    if actions:
+        cols = st.columns(2 + 2 * len(actions))
+        cols[0].button("Select page", key=f"{widget_key}_select_page", on_click=_select_items, args=(widget_key, window, True))
+        cols[1].button("Clear selection", key=f"{widget_key}_clear", disabled=not selected,
+                       on_click=_select_items, args=(widget_key, list(selected), False))
+        for idx, (label, action) in enumerate(actions.items()):
+            cols[2 + 2 * idx].button(
+                f"{label} selected ({len(selected)})",
+                key=f"{widget_key}_action_{idx}_selected",
+                disabled=not selected,
+                on_click=_run_list_action,
+                args=(widget_key, action, None),
+            )
+            cols[3 + 2 * idx].button(
+                f"{label} all ({len(items)})",
+                key=f"{widget_key}_action_{idx}_all",
+                on_click=_run_list_action,
+                args=(widget_key, action, list(items)),
+            )
+
+def list_field_editor(
+    store_key: str, input_label: str, add_label: str, current_label: str, removable: bool = False,
+    normalizer: Optional[Callable[[List[str]], List[str]]] = None,
+):
+    """
+    Text input + add button + current items for a list field of the job profile.
+    :param store_key: Profile list field (e.g., "tasks").
+    :param input_label: Label of the text input for new items.
+    :param add_label: Label of the add button.
+    :param current_label: Heading shown above the current items.
+    :param removable: Offer (bulk) removal of items.
+    :param normalizer: Applied to the whole list when an item is added (e.g., canonicalize_skills).
+    """
+    input_key = f"new_{store_key}"
+    st.text_input(input_label, key=input_key)
+    st.button(add_label, key=f"add_{store_key}", on_click=_add_from_input, args=(store_key, input_key, normalizer))
+
+    items = get_from_session_state(store_key, [])
+    if items:
+        st.write(current_label)
+        actions = {"Remove": functools.partial(_remove_items, store_key)} if removable else None
+        paged_list(f"list_{store_key}", items, actions)
+
+def _accept_suggestions(session_key: str, existing_set: Optional[set], store_key: Optional[str], accepted: List[str]):
+    """Bulk action: move suggestions into the target list and drop them from the suggestions."""
+    taken = set(accepted)
+    st.session_state[session_key] = [s for s in st.session_state.get(session_key, []) if s not in taken]
+    if existing_set is not None:
+        existing_set.update(accepted)
+    if store_key is not None:
+        store_in_state(store_key, [*get_from_session_state(store_key, []), *accepted])
+
+def display_suggestions(session_key: str, existing_set: set = None, store_key: str = None, page_size: int = LIST_PAGE_SIZE):
+    """
+    Display AI suggestions as a paged, selectable list.
+    Accepted suggestions are added to 'existing_set' (if provided) and to the list
+    stored under 'store_key', and removed from the suggestion list in session.
     :param session_key: The session state key where suggestions are stored as a list of strings.
     :param existing_set: A set of existing items in the category (to add new suggestions to).
-    :param store_key: The session state key (string) under which the final set is stored.
+    :param store_key: The session state key (string) under which the final list is stored.
+    :param page_size: Suggestions rendered per page.
     """
-    if session_key not in st.session_state or not st.session_state[session_key]:
-        return
-    suggestions = st.session_state[session_key]
+    suggestions = st.session_state.get(session_key)
     if not suggestions:
         return
 
     st.write("**AI Suggestions:**")
-    cols = st.columns(3)
-    for idx, suggestion in enumerate(list(suggestions)):
-        col = cols[idx % 3]
-        if col.button(f"➕ {suggestion}", key=f"{session_key}_sugg_btn_{idx}"):
-            # Add suggestion to the existing set
-            if existing_set is not None:
-                existing_set.add(suggestion)
-            # Remove from the suggestion list
-            updated_sugg = list(suggestions)
-            updated_sugg.pop(idx)
-            st.session_state[session_key] = updated_sugg
-            # Update the session store key if provided
-            if store_key is not None and existing_set is not None:
-                from utils.session_utils import store_in_state
-                # Convert set back to list or string
-                if isinstance(existing_set, set):
-                    store_in_state(store_key, list(existing_set))
-                else:
-                    store_in_state(store_key, existing_set)
-            st.experimental_rerun()
+    # Suggestions may repeat; the list widget needs unique items
+    suggestions = list(dict.fromkeys(suggestions))
+    accept = functools.partial(_accept_suggestions, session_key, existing_set, store_key)
+    paged_list(f"{session_key}_sugg", suggestions, {"➕ Accept": accept}, page_size=page_size)